@@ -0,0 +1,102 @@
+"""
+Compares the original dict + indent=2 JSON motion state path with the typed
+Motion records and compact encoder: save time, load time, file size and the
+memory held by the loaded state.
+
+    python benchmarks/bench_motion_state.py --motions 10000
+"""
+import argparse
+import copy
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+from common import build_legacy_motion_payload, load_bot_module
+
+bot_module = load_bot_module()
+
+
+def legacy_save(state: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def legacy_load(path: str) -> dict:
+    # Mirrors the pre-typed load_motion_state walk.
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    state.setdefault("next_motion_number", 1)
+    state.setdefault("motions", {})
+    for motion_id, motion in state["motions"].items():
+        int(motion.get("motion_number", int(motion_id)))
+        motion.setdefault("audit_log", [])
+    return state
+
+
+def typed_save(state: dict, path: str):
+    with open(path, "wb") as f:
+        f.write(bot_module.encode_motion_state(state))
+
+
+def typed_load(path: str) -> dict:
+    with open(path, "rb") as f:
+        return bot_module.decode_motion_state(f.read())
+
+
+def _best_of(repeats: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _resident_kib(loader, path: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = loader(path)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del state
+    return round((after - before) / 1024, 1)
+
+
+def run(motion_count: int, repeats: int) -> list[dict]:
+    legacy_state = build_legacy_motion_payload(motion_count)
+    typed_state = bot_module.decode_motion_state(copy.deepcopy(legacy_state))
+
+    results = []
+    for name, state, saver, loader in (
+        ("legacy dict/json", legacy_state, legacy_save, legacy_load),
+        ("typed Motion/compact", typed_state, typed_save, typed_load),
+    ):
+        path = os.path.abspath(f"bench-{name.split()[0]}.json")
+        saver(state, path)
+        results.append({
+            "path": name,
+            "motions": motion_count,
+            "encoder": "orjson" if bot_module.orjson is not None and "typed" in name else "json",
+            "save_ms": round(_best_of(repeats, saver, state, path) * 1000, 1),
+            "load_ms": round(_best_of(repeats, loader, path) * 1000, 1),
+            "file_kib": round(os.path.getsize(path) / 1024, 1),
+            "resident_kib": _resident_kib(loader, path),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--motions", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.motions, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
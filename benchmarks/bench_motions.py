@@ -0,0 +1,196 @@
+"""
+Micro-benchmarks for the motion subsystem at realistic and extreme scale,
+run entirely offline against the fakes in benchmarks/fakes.py.
+
+Each case reports ops/sec, the net memory blocks one call leaves allocated
+and its peak traced memory. Results are compared with the stored baseline;
+a throughput drop or peak-memory growth beyond --tolerance exits non-zero.
+
+    python benchmarks/bench_motions.py
+    python benchmarks/bench_motions.py --sizes 100,1000 --voters 200
+    python benchmarks/bench_motions.py --save-baseline
+
+Baselines are machine specific; regenerate them on the machine that runs the
+comparison.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from common import build_legacy_motion_payload, load_bot_module
+import fakes
+
+bot_module = load_bot_module()
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "motions.json")
+BOARD_CHANNEL_ID = bot_module.BOARD_MOTIONS_CHANNEL_ID
+O5_CHANNEL_ID = bot_module.O5_MOTIONS_CHANNEL_ID
+GUILD_ID = fakes.FakeGuild().id
+
+
+def build_state(motion_count: int, voters_per_option: int) -> dict:
+    state = bot_module.decode_motion_state(build_legacy_motion_payload(motion_count, voters_per_option=voters_per_option))
+    # The vote target is always open so process_vote does the full write path.
+    target = state["motions"]["1"]
+    target.status = "board_voting"
+    target.board_channel_id = BOARD_CHANNEL_ID
+    target.o5_channel_id = O5_CHANNEL_ID
+    return state
+
+
+def _measure_throughput(run_once, min_seconds: float, min_runs: int = 3) -> tuple[float, int]:
+    # One untimed call absorbs the deferred full collection left by the previous
+    # case (a 10k load leaves millions of fresh objects for the next gen-2 pass).
+    run_once()
+    gc.collect()
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        run_once()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if runs >= min_runs and elapsed >= min_seconds:
+            return runs / elapsed, runs
+
+
+def _measure_memory(run_once) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    baseline_bytes = tracemalloc.get_traced_memory()[0]
+    run_once()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    net_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return net_blocks, round((peak_bytes - baseline_bytes) / 1024, 1)
+
+
+def build_cases(loop: asyncio.AbstractEventLoop, state: dict) -> dict:
+    motion = state["motions"]["1"]
+    board_voters = motion.board_votes["approve"]
+    contents = [m.content for m in list(state["motions"].values())[:200]]
+
+    channels = {
+        BOARD_CHANNEL_ID: fakes.FakeChannel(BOARD_CHANNEL_ID, "board-motions"),
+        O5_CHANNEL_ID: fakes.FakeChannel(O5_CHANNEL_ID, "o5-motions"),
+    }
+    fakes.install_fake_channels(bot_module, channels)
+    guild = fakes.FakeGuild(GUILD_ID)
+    voters = [fakes.FakeMember(10**18 + i, [bot_module.BOARD_VOTER_ROLES[0]], guild) for i in range(64)]
+    vote_cycle = {"n": 0}
+
+    def process_vote():
+        n = vote_cycle["n"] = vote_cycle["n"] + 1
+        interaction = fakes.FakeInteraction(voters[n % len(voters)])
+        vote_type = bot_module.MOTION_VOTE_OPTIONS[n % len(bot_module.MOTION_VOTE_OPTIONS)]
+        loop.run_until_complete(bot_module.process_vote(interaction, "1", "board", vote_type))
+
+    def restore_motion_timers():
+        async def run():
+            bot_module.restore_motion_timers()
+            tasks = list(bot_module.motion_timer_tasks.values())
+            bot_module.motion_timer_tasks.clear()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        loop.run_until_complete(run())
+
+    def register_motion_views():
+        async def run():
+            bot_module.register_motion_views()
+        loop.run_until_complete(run())
+
+    return {
+        "save_motion_state": lambda: bot_module.save_motion_state(GUILD_ID),
+        "load_motion_state": lambda: bot_module.load_motion_state(GUILD_ID),
+        "build_motion_embed": lambda: bot_module.build_motion_embed(motion),
+        "normalize_motion_content": lambda: [bot_module.normalize_motion_content(c) for c in contents],
+        "format_vote_block": lambda: bot_module.format_vote_block("Approve", "✅", board_voters),
+        "process_vote": process_vote,
+        "restore_motion_timers": restore_motion_timers,
+        "register_motion_views": register_motion_views,
+    }
+
+
+def run(sizes: list[int], voters_per_option: int, min_seconds: float) -> dict:
+    results = {}
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        for size in sizes:
+            bot_module.motion_states[GUILD_ID] = build_state(size, voters_per_option)
+            bot_module.save_motion_state(GUILD_ID)
+            for case, run_once in build_cases(loop, bot_module.motion_states[GUILD_ID]).items():
+                ops_per_sec, runs = _measure_throughput(run_once, min_seconds)
+                net_blocks, peak_kib = _measure_memory(run_once)
+                key = f"{size}/{case}"
+                results[key] = {
+                    "ops_per_sec": round(ops_per_sec, 2),
+                    "runs": runs,
+                    "net_alloc_blocks": net_blocks,
+                    "peak_kib": peak_kib,
+                }
+                print(f"{key:<32} {ops_per_sec:>12.1f} ops/s {net_blocks:>9} blocks {peak_kib:>11.1f} KiB peak", file=sys.stderr)
+    finally:
+        loop.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{key}: {previous['ops_per_sec']} -> {current['ops_per_sec']} ops/s")
+        # Tiny peaks are dominated by noise; only flag growth past 64 KiB.
+        if current["peak_kib"] > max(previous["peak_kib"] * (1 + tolerance), previous["peak_kib"] + 64):
+            regressions.append(f"{key}: peak {previous['peak_kib']} -> {current['peak_kib']} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma separated motion counts")
+    parser.add_argument("--voters", type=int, default=100, help="voters per option per stage")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum timing window per case")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run(sizes, args.voters, args.min_seconds)
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one.", file=sys.stderr)
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
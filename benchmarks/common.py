@@ -0,0 +1,70 @@
+"""
+Shared setup for the offline benchmarks: imports bot.py without a token,
+database or Discord connection, and keeps its state files in a scratch dir.
+"""
+import importlib
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_ENV_DEFAULTS = {
+    "ANNOUNCEMENT_CHANNEL_ID": "1407908574490787952",
+    "SSU_CHANNEL_ID": "1407908654082162749",
+    "RANK_LOG_CHANNEL_ID": "1284867929623494769",
+    "ROBLOX_GROUP_ID": "1",
+    "DATABASE_URL": "",
+}
+
+
+def load_bot_module(**env_overrides):
+    for key, value in {**BENCH_ENV_DEFAULTS, **env_overrides}.items():
+        if key in env_overrides or not os.environ.get(key) or os.environ.get(key, "").startswith("YOUR_"):
+            os.environ[key] = value
+
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    # bot.py writes motions_state.json relative to the working directory.
+    os.chdir(tempfile.mkdtemp(prefix="scpfbot-bench-"))
+    return importlib.import_module("bot")
+
+
+def build_legacy_motion_payload(count: int, voters_per_option: int = 5, audit_entries: int = 6, seed: int = 11) -> dict:
+    """Synthetic motion state in the original dict/ISO-string JSON layout."""
+    import random
+    from datetime import UTC, datetime, timedelta
+
+    rng = random.Random(seed)
+    statuses = ["board_voting", "o5_voting", "passed", "failed_board", "failed_o5", "vetoed"]
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    motions = {}
+    for number in range(1, count + 1):
+        created_at = started + timedelta(hours=number)
+        voters = iter(rng.sample(range(10**17, 10**17 + 10**6), voters_per_option * 6))
+        board_votes = {option: [next(voters) for _ in range(voters_per_option)] for option in ("approve", "reject", "abstain")}
+        o5_votes = {option: [next(voters) for _ in range(voters_per_option)] for option in ("approve", "reject", "abstain")}
+        motions[str(number)] = {
+            "motion_number": number,
+            "title": f"Motion {number} on facility procedure revision",
+            "content": ("Section text for the proposed amendment.\n" * rng.randint(3, 20)).strip(),
+            "proposer_id": rng.randrange(10**17, 10**18),
+            "status": rng.choice(statuses),
+            "created_at": created_at.isoformat(),
+            "board_deadline": (created_at + timedelta(hours=24)).isoformat(),
+            "board_channel_id": 1471329253093150885,
+            "board_message_id": rng.randrange(10**17, 10**18),
+            "o5_started_at": (created_at + timedelta(hours=24)).isoformat(),
+            "o5_deadline": (created_at + timedelta(hours=48)).isoformat(),
+            "o5_channel_id": 1471329476003627038,
+            "o5_message_id": rng.randrange(10**17, 10**18),
+            "board_votes": board_votes,
+            "o5_votes": o5_votes,
+            "audit_log": [
+                {"timestamp": (created_at + timedelta(minutes=i)).isoformat(), "action": "vote_cast",
+                 "actor_id": rng.randrange(10**17, 10**18), "stage": "board", "vote": "approve"}
+                for i in range(audit_entries)
+            ],
+        }
+    return {"next_motion_number": count + 1, "motions": motions}
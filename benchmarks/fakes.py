@@ -0,0 +1,384 @@
+"""
+In-process stand-ins for the Discord objects bot.py touches, so handlers can
+run without a gateway connection or REST calls.
+"""
+import asyncio
+import contextvars
+import itertools
+import random
+import re
+import time
+from dataclasses import dataclass
+
+import discord
+
+_snowflakes = itertools.count(1_300_000_000_000_000_000)
+
+
+def next_snowflake() -> int:
+    return next(_snowflakes)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int = 900_000_000_000_000_000):
+        self.id = guild_id
+        self.members: dict[int, "FakeMember"] = {}
+        self.roles: dict[int, "FakeRole"] = {}
+
+    def get_role(self, role_id: int):
+        return self.roles.get(role_id)
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id: int):
+        member = self.members.get(user_id)
+        if member is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), "Unknown Member")
+        return member
+
+
+class _FakeHTTPResponse:
+    def __init__(self, status: int, reason: str = ""):
+        self.status = status
+        self.reason = reason
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+    def is_default(self) -> bool:
+        return False
+
+
+class FakeMember(discord.Member):
+    """A discord.Member subclass so isinstance checks in bot.py hold."""
+
+    def __init__(self, user_id: int, role_ids=(), guild: FakeGuild | None = None, name: str | None = None,
+                 rest=None, dms_closed: bool = False):
+        self._fake_id = user_id
+        self.rest = rest or NullRest()
+        self.dms_closed = dms_closed
+        self._fake_roles = [FakeRole(role_id) for role_id in role_ids]
+        self._fake_guild = guild or FakeGuild()
+        self._fake_name = name or f"member{user_id}"
+        self.dm_messages: list[dict] = []
+        self._fake_guild.members[user_id] = self
+
+    id = property(lambda self: self._fake_id)
+    roles = property(lambda self: self._fake_roles)
+    guild = property(lambda self: self._fake_guild)
+    mention = property(lambda self: f"<@{self._fake_id}>")
+    display_name = property(lambda self: self._fake_name)
+    name = property(lambda self: self._fake_name)
+    bot = property(lambda self: False)
+
+    def __repr__(self):
+        return f"<FakeMember id={self._fake_id}>"
+
+    def __hash__(self):
+        return hash(self._fake_id)
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self._fake_id
+
+    async def send(self, *args, **kwargs):
+        await self.rest.call("POST /users/@me/channels")
+        await self.rest.call("POST /channels/{channel_id}/messages", self._fake_id)
+        if self.dms_closed:
+            raise discord.Forbidden(_FakeHTTPResponse(403), "Cannot send messages to this user")
+        self.dm_messages.append(kwargs)
+        return FakeMessage(channel=None, author=None, **kwargs)
+
+    async def edit(self, *, roles=None, reason=None, **_):
+        await self.rest.call("PATCH /guilds/{guild_id}/members/{user_id}", self._fake_guild.id)
+        if roles is not None:
+            self._fake_roles = list(roles)
+
+
+class FakeMessage:
+    def __init__(self, channel, author=None, content=None, embed=None, embeds=None, view=None, message_id=None, **_):
+        self.id = message_id or next_snowflake()
+        self.channel = channel
+        self.author = author
+        self.mentions = []
+        self.content = content
+        self.embeds = embeds or ([embed] if embed else [])
+        self.components = []
+        self.reactions: list[str] = []
+        self.view = view
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+        if self.channel is not None:
+            await self.channel.rest.call("PATCH /channels/{channel_id}/messages/{message_id}", self.channel.id)
+        if "embed" in kwargs:
+            self.embeds = [kwargs["embed"]] if kwargs["embed"] else []
+        return self
+
+    async def add_reaction(self, emoji):
+        if self.channel is not None:
+            await self.channel.rest.call("PUT /channels/{channel_id}/messages/{message_id}/reactions", self.channel.id)
+        self.reactions.append(str(emoji))
+
+
+class NullRest:
+    """REST layer with no latency; the load generator swaps in a simulated one."""
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+
+    async def call(self, route: str, bucket_id: int | None = None):
+        self.calls[route] = self.calls.get(route, 0) + 1
+
+
+# The operation currently being driven, so REST calls can be attributed to it.
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar("current_operation", default="other")
+
+
+@dataclass
+class RestBucket:
+    limit: int
+    per_seconds: float
+
+
+DEFAULT_REST_BUCKETS = {
+    "POST /channels/{channel_id}/messages": RestBucket(5, 5.0),
+    "PATCH /channels/{channel_id}/messages/{message_id}": RestBucket(5, 5.0),
+    "PUT /channels/{channel_id}/messages/{message_id}/reactions": RestBucket(1, 0.25),
+    "POST /webhooks/{application_id}/{token}": RestBucket(5, 2.0),
+    "PATCH /webhooks/{application_id}/{token}/messages/{message_id}": RestBucket(5, 2.0),
+}
+
+
+class SimulatedDiscordRest:
+    """
+    Fake REST layer with per-call latency and Discord-style rate-limit buckets.
+    A call over its bucket (or picked by the random 429 rate) gets a 429, waits
+    the retry-after and tries again, the way discord.py's HTTP client does.
+    """
+
+    def __init__(self, latency_ms: float = 80.0, jitter_ms: float = 40.0, error_429_rate: float = 0.0,
+                 buckets: dict[str, RestBucket] | None = None, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429_rate = error_429_rate
+        self.buckets = DEFAULT_REST_BUCKETS if buckets is None else buckets
+        self._rng = random.Random(seed)
+        self._bucket_hits: dict[tuple, list[float]] = {}
+        self.calls: dict[str, dict[str, int]] = {}
+        self.rate_limited: dict[str, int] = {}
+
+    def _retry_after(self, route: str, bucket_id) -> float:
+        bucket = self.buckets.get(route.split(" (")[0])
+        if bucket is None:
+            return 0.0
+        now = time.monotonic()
+        hits = self._bucket_hits.setdefault((route, bucket_id), [])
+        while hits and now - hits[0] >= bucket.per_seconds:
+            hits.pop(0)
+        if len(hits) >= bucket.limit:
+            return bucket.per_seconds - (now - hits[0])
+        hits.append(now)
+        return 0.0
+
+    async def _latency(self):
+        await asyncio.sleep(max(self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000)
+
+    async def call(self, route: str, bucket_id: int | None = None):
+        operation = current_operation.get()
+        per_route = self.calls.setdefault(operation, {})
+        while True:
+            per_route[route] = per_route.get(route, 0) + 1
+            retry_after = self._retry_after(route, bucket_id)
+            if not retry_after and self.error_429_rate and self._rng.random() < self.error_429_rate:
+                retry_after = 0.5
+            await self._latency()
+            if not retry_after:
+                return
+            self.rate_limited[operation] = self.rate_limited.get(operation, 0) + 1
+            await asyncio.sleep(retry_after)
+
+
+class FakeHttpResponse:
+    def __init__(self, status_code: int, payload=None, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload if payload is not None else {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeRobloxApi:
+    """
+    Answers the Roblox endpoints bot.py calls. Latency is a blocking sleep,
+    because bot.py calls Roblox through requests on the event loop thread.
+    """
+
+    def __init__(self, group_id: int, role_values: dict[str, int], latency_ms: float = 120.0, current_role: str = "Class D"):
+        self.group_id = group_id
+        self.latency_ms = latency_ms
+        self.current_role = current_role
+        self.roles = [{"id": 1000 + value, "name": name, "rank": value} for name, value in role_values.items()]
+        self.descriptions: dict[int, str] = {}
+        self.calls = 0
+
+    def request(self, method: str, url: str, **kwargs) -> FakeHttpResponse:
+        self.calls += 1
+        time.sleep(self.latency_ms / 1000)
+        if match := re.search(r"/v1/users/(\d+)$", url):
+            user_id = int(match.group(1))
+            return FakeHttpResponse(200, {"id": user_id, "name": f"roblox{user_id}", "description": self.descriptions.get(user_id, "")})
+        if url.endswith("/v1/usernames/users"):
+            username = kwargs.get("json", {}).get("usernames", ["player"])[0]
+            return FakeHttpResponse(200, {"data": [{"id": abs(hash(username)) % 10**9, "name": username}]})
+        if url.endswith("/groups/roles"):
+            return FakeHttpResponse(200, {"data": [{"group": {"id": self.group_id}, "role": {"name": self.current_role}}]})
+        if url.endswith(f"/groups/{self.group_id}/roles"):
+            return FakeHttpResponse(200, {"roles": self.roles})
+        if method == "PATCH":
+            return FakeHttpResponse(200, {})
+        return FakeHttpResponse(404, {"errors": [{"message": "Not found"}]})
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, name: str = "channel", rest=None, guild: FakeGuild | None = None):
+        self.id = channel_id
+        self.name = name
+        self.rest = rest or NullRest()
+        self.guild = guild
+        self.mention = f"<#{channel_id}>"
+        self.messages: dict[int, FakeMessage] = {}
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.call("POST /channels/{channel_id}/messages", self.id)
+        message = FakeMessage(channel=self, content=content, **kwargs)
+        self.messages[message.id] = message
+        return message
+
+    async def history(self, limit: int = 100):
+        newest_first = sorted(self.messages.values(), key=lambda message: message.id, reverse=True)[:limit]
+        for index, message in enumerate(newest_first):
+            if index % 100 == 0:
+                await self.rest.call("GET /channels/{channel_id}/messages", self.id)
+            yield message
+
+    async def fetch_message(self, message_id: int):
+        await self.rest.call("GET /channels/{channel_id}/messages/{message_id}", self.id)
+        message = self.messages.get(message_id)
+        if message is None:
+            message = self.messages[message_id] = FakeMessage(channel=self, message_id=message_id)
+        return message
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+        self.messages: list[dict] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, kind: str, **kwargs):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        await self._interaction.rest.call(f"POST /interactions/{{id}}/callback ({kind})")
+        self._done = True
+        self._interaction.acknowledged_at = time.perf_counter()
+        self.messages.append({"kind": kind, **kwargs})
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond("message", content=content, **kwargs)
+
+    async def send_modal(self, modal):
+        await self._respond("modal", modal=modal)
+
+    async def defer(self, **kwargs):
+        await self._respond("defer", **kwargs)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self.messages: list[FakeMessage] = []
+
+    async def send(self, content=None, wait: bool = False, **kwargs):
+        await self._interaction.rest.call("POST /webhooks/{application_id}/{token}")
+        message = FakeWebhookMessage(self._interaction, content=content, **kwargs)
+        self.messages.append(message)
+        return message
+
+
+class FakeWebhookMessage(FakeMessage):
+    def __init__(self, interaction: "FakeInteraction", **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self._interaction = interaction
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+        await self._interaction.rest.call("PATCH /webhooks/{application_id}/{token}/messages/{message_id}")
+        if "content" in kwargs:
+            self.content = kwargs["content"]
+        return self
+
+
+class FakeInteraction(discord.Interaction):
+    """A discord.Interaction subclass, so bot.py's isinstance checks and tracing apply."""
+
+    def __init__(self, user: FakeMember, rest=None, command=None, message=None, channel=None):
+        self.id = next_snowflake()
+        self.user = user
+        self.guild_id = user.guild.id
+        self.channel = channel
+        self.message = message
+        self.data = {}
+        self.extras = {}
+        self.command_failed = False
+        self.rest = rest or NullRest()
+        self._fake_guild = user.guild
+        self._fake_command = command
+        self._fake_response = FakeInteractionResponse(self)
+        self._fake_followup = FakeFollowup(self)
+        self._fake_created_at = discord.utils.utcnow()
+        self.received_at = time.perf_counter()
+        self.acknowledged_at: float | None = None
+
+    guild = property(lambda self: self._fake_guild)
+    command = property(lambda self: self._fake_command)
+    response = property(lambda self: self._fake_response)
+    followup = property(lambda self: self._fake_followup)
+    created_at = property(lambda self: self._fake_created_at)
+
+    def __repr__(self):
+        return f"<FakeInteraction id={self.id} user={self.user.id}>"
+
+
+def install_fake_channels(bot_module, channels: dict[int, FakeChannel]):
+    """Routes bot.get_channel and bot.fetch_channel to the given fake channels."""
+    client = bot_module.bot
+
+    async def fetch_channel(channel_id: int):
+        channel = channels.get(channel_id)
+        if channel is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), "Unknown Channel")
+        return channel
+
+    client.get_channel = channels.get
+    client.fetch_channel = fetch_channel
+
+
+def install_fake_roblox(bot_module, api: FakeRobloxApi):
+    """Points bot.py's Roblox HTTP calls at the fake API."""
+
+    class _FakeRequestsModule:
+        request = staticmethod(api.request)
+        Response = FakeHttpResponse
+
+    bot_module.requests = _FakeRequestsModule
@@ -0,0 +1,199 @@
+"""
+Replays a gateway recording through discord.py's ConnectionState once per
+gateway profile and reports how many events reach the bot, how fast they are
+parsed and how much memory the caches hold afterwards.
+
+    python benchmarks/gateway_replay.py                       # synthetic recording
+    python benchmarks/gateway_replay.py --recording events.jsonl
+    python benchmarks/gateway_replay.py --write-recording events.jsonl
+
+A recording is JSON lines of {"t": "<DISPATCH EVENT>", "d": {...}} in the raw
+gateway payload shape. Discord only delivers an event when the session has the
+matching intent, so events are filtered per profile before parsing.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from common import load_bot_module
+
+bot_module = load_bot_module()
+discord = bot_module.discord
+commands = bot_module.commands
+
+EVENT_INTENTS = {
+    "GUILD_CREATE": "guilds",
+    "GUILD_MEMBER_UPDATE": "members",
+    "MESSAGE_CREATE": "guild_messages",
+    "MESSAGE_DELETE": "guild_messages",
+    "MESSAGE_REACTION_ADD": "guild_reactions",
+    "TYPING_START": "guild_typing",
+}
+
+GUILD_ID = "900000000000000000"
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+
+
+def _user(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"member{user_id}", "discriminator": "0", "avatar": None}
+
+
+def _member(user_id: int, role_ids: list[str]) -> dict:
+    return {"user": _user(user_id), "roles": role_ids, "joined_at": TIMESTAMP, "deaf": False, "mute": False, "flags": 0}
+
+
+def build_synthetic_recording(members: int, channels: int, events: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    role_ids = [str(1000 + i) for i in range(20)]
+    channel_ids = [str(2000 + i) for i in range(channels)]
+    member_ids = [10_000 + i for i in range(members)]
+
+    recording = [{
+        "t": "GUILD_CREATE",
+        "d": {
+            "id": GUILD_ID,
+            "name": "Replay Guild",
+            "owner_id": str(member_ids[0]),
+            "member_count": members,
+            "large": members > 250,
+            "roles": [
+                {"id": role_id, "name": f"role-{role_id}", "permissions": "0", "position": i,
+                 "color": 0, "hoist": False, "managed": False, "mentionable": False}
+                for i, role_id in enumerate([GUILD_ID, *role_ids])
+            ],
+            "channels": [
+                {"id": channel_id, "type": 0, "name": f"channel-{channel_id}", "position": i, "permission_overwrites": []}
+                for i, channel_id in enumerate(channel_ids)
+            ],
+            "members": [_member(member_id, rng.sample(role_ids, 3)) for member_id in member_ids],
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+            "threads": [],
+            "voice_states": [],
+            "presences": [],
+        },
+    }]
+
+    next_message_id = 5_000_000
+    sent_messages = []
+    for _ in range(events):
+        author_id = rng.choice(member_ids)
+        channel_id = rng.choice(channel_ids)
+        roll = rng.random()
+        if roll < 0.6:
+            next_message_id += 1
+            sent_messages.append((str(next_message_id), channel_id))
+            recording.append({"t": "MESSAGE_CREATE", "d": {
+                "id": str(next_message_id), "channel_id": channel_id, "guild_id": GUILD_ID,
+                "author": _user(author_id), "member": {"roles": [], "joined_at": TIMESTAMP, "deaf": False, "mute": False, "flags": 0},
+                "content": "lorem ipsum " * rng.randint(1, 30), "timestamp": TIMESTAMP, "edited_timestamp": None,
+                "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+                "embeds": [], "pinned": False, "type": 0,
+            }})
+        elif roll < 0.75:
+            recording.append({"t": "TYPING_START", "d": {
+                "channel_id": channel_id, "guild_id": GUILD_ID, "user_id": str(author_id), "timestamp": 1704067200,
+                "member": _member(author_id, []),
+            }})
+        elif roll < 0.9 and sent_messages:
+            message_id, message_channel_id = rng.choice(sent_messages)
+            recording.append({"t": "MESSAGE_REACTION_ADD", "d": {
+                "user_id": str(author_id), "channel_id": message_channel_id, "message_id": message_id,
+                "guild_id": GUILD_ID, "emoji": {"id": None, "name": "\N{THUMBS UP SIGN}"}, "member": _member(author_id, []),
+            }})
+        elif roll < 0.95 and sent_messages:
+            message_id, message_channel_id = sent_messages.pop(rng.randrange(len(sent_messages)))
+            recording.append({"t": "MESSAGE_DELETE", "d": {"id": message_id, "channel_id": message_channel_id, "guild_id": GUILD_ID}})
+        else:
+            recording.append({"t": "GUILD_MEMBER_UPDATE", "d": {"guild_id": GUILD_ID, **_member(author_id, rng.sample(role_ids, 3))}})
+    return recording
+
+
+async def _replay_once(profile: str, recording: list[dict], trace_memory: bool) -> dict:
+    client = commands.Bot(command_prefix="!", **bot_module.build_gateway_options(profile))
+    # Normally set during login; dispatched events are scheduled on it.
+    client.loop = asyncio.get_running_loop()
+    state = client._connection
+    # There is no websocket to request member chunks over.
+    state._chunk_guilds = False
+
+    delivered = [event for event in recording if getattr(state._intents, EVENT_INTENTS.get(event["t"], "guilds"))]
+
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    started = time.perf_counter()
+    for event in delivered:
+        state.parsers[event["t"]](event["d"])
+    pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    await asyncio.gather(*pending, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    result = {"delivered_events": len(delivered), "elapsed": elapsed}
+    if trace_memory:
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        guild = client.get_guild(int(GUILD_ID))
+        result.update({
+            "retained_kib": round((current - baseline) / 1024, 1),
+            "peak_kib": round((peak - baseline) / 1024, 1),
+            "cached_users": len(state._users),
+            "cached_members": len(guild.members) if guild else 0,
+            "cached_messages": len(state._messages or []),
+        })
+    return result
+
+
+async def replay(profile: str, recording: list[dict]) -> dict:
+    # Timing and memory are measured in separate passes; tracemalloc skews timings.
+    timing = await _replay_once(profile, recording, trace_memory=False)
+    memory = await _replay_once(profile, recording, trace_memory=True)
+    return {
+        "profile": profile,
+        "recorded_events": len(recording),
+        "delivered_events": timing["delivered_events"],
+        "process_seconds": round(timing["elapsed"], 4),
+        "events_per_second": round(timing["delivered_events"] / timing["elapsed"]) if timing["elapsed"] else None,
+        **{key: value for key, value in memory.items() if key not in {"delivered_events", "elapsed"}},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", help="JSONL gateway recording to replay")
+    parser.add_argument("--write-recording", help="write the synthetic recording to this path and exit")
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--recording-seconds", type=float, default=600.0,
+                        help="wall-clock span the recording represents, for events/sec delivered")
+    args = parser.parse_args()
+
+    if args.recording:
+        with open(args.recording, "r", encoding="utf-8") as f:
+            recording = [json.loads(line) for line in f if line.strip()]
+    else:
+        recording = build_synthetic_recording(args.members, args.channels, args.events)
+
+    if args.write_recording:
+        with open(args.write_recording, "w", encoding="utf-8") as f:
+            for event in recording:
+                f.write(json.dumps(event) + "\n")
+        print(f"Wrote {len(recording)} events to {args.write_recording}")
+        return
+
+    results = [asyncio.run(replay(profile, recording)) for profile in ("default", "lean")]
+    for result in results:
+        result["delivered_per_recorded_second"] = round(result["delivered_events"] / args.recording_seconds, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
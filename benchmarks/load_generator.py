@@ -0,0 +1,280 @@
+"""
+End-to-end interaction load generator. Replays a timed trace of operations
+through the real command callbacks, checks and vote buttons in bot.py, with
+Discord REST and Roblox replaced by in-process fakes that add latency and
+Discord-style 429s.
+
+Reports, per operation: acknowledgement latency, missed 3-second deadlines,
+REST calls (and 429s) per operation and unhandled errors.
+
+    python benchmarks/load_generator.py
+    python benchmarks/load_generator.py --rest-latency-ms 150 --inject-429 0.05
+    python benchmarks/load_generator.py --trace my_trace.jsonl --speed 4
+
+A trace file holds one JSON object per line:
+
+    {"at": 1.25, "op": "vote", "user": "board-7", "args": {"motion": 2, "vote": "approve"}}
+
+Operations: rank, notify, ssu, application_accept, application_reject,
+motion_create, motion_pass, motion_status, vote.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from common import load_bot_module
+import fakes
+
+bot_module = load_bot_module()
+
+ACK_DEADLINE_SECONDS = 3.0
+APPLICATION_CHANNEL_ID = 1_400_000_000_000_000_001
+
+
+def build_vote_burst_trace(votes: int = 50, seconds: float = 10.0, motions: int = 3, seed: int = 3) -> list[dict]:
+    """Three motions opened, then a burst of votes with a little staff traffic mixed in."""
+    rng = random.Random(seed)
+    trace = [{"at": 0.1 * i, "op": "motion_create", "user": "staff", "args": {"title": f"Load motion {i + 1}"}}
+             for i in range(motions)]
+    start = 1.0
+    for _ in range(votes):
+        trace.append({
+            "at": round(start + rng.uniform(0, seconds), 3),
+            "op": "vote",
+            "user": f"board-{rng.randrange(24)}",
+            "args": {"motion": rng.randint(1, motions), "vote": rng.choice(bot_module.MOTION_VOTE_OPTIONS)},
+        })
+    for i, op in enumerate(("rank", "notify", "ssu", "application_accept", "application_reject", "motion_status", "rank")):
+        trace.append({"at": round(start + (i + 1) * seconds / 8, 3), "op": op, "user": "staff", "args": {"motion": 1}})
+    trace.append({"at": start + seconds + 0.5, "op": "motion_pass", "user": "staff", "args": {"motion": 1}})
+    return sorted(trace, key=lambda event: event["at"])
+
+
+def load_trace(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return sorted((json.loads(line) for line in f if line.strip()), key=lambda event: event["at"])
+
+
+class LoadWorld:
+    """Fake guild, members and channels wired into bot.py."""
+
+    def __init__(self, rest: fakes.SimulatedDiscordRest):
+        self.rest = rest
+        self.guild = fakes.FakeGuild()
+        self.members: dict[str, fakes.FakeMember] = {}
+        self.applicant = fakes.FakeMember(5_000, guild=self.guild, rest=rest, name="applicant")
+        self.notify_target = fakes.FakeMember(5_001, guild=self.guild, rest=rest, name="notified")
+        channel_names = {
+            bot_module.SSU_CHANNEL_ID: "ssu",
+            bot_module.RANK_LOG_CHANNEL_ID: "rank-log",
+            bot_module.APPLICATION_RESULTS_CHANNEL_ID: "application-results",
+            bot_module.BOARD_MOTIONS_CHANNEL_ID: "board-motions",
+            bot_module.O5_MOTIONS_CHANNEL_ID: "o5-motions",
+            bot_module.MOTION_UPDATES_CHANNEL_ID: "motion-updates",
+            APPLICATION_CHANNEL_ID: "level-2-applications",
+        }
+        self.channels = {
+            channel_id: fakes.FakeChannel(channel_id, name, rest=rest, guild=self.guild)
+            for channel_id, name in channel_names.items()
+        }
+        fakes.install_fake_channels(bot_module, self.channels)
+
+    def member(self, key: str) -> fakes.FakeMember:
+        member = self.members.get(key)
+        if member is None:
+            if key.startswith("board-"):
+                role_ids = [bot_module.BOARD_ROLE_ID]
+            else:
+                role_ids = [bot_module.ADMINISTRATOR_ROLE_ID, *bot_module.DD_AND_ABOVE_ROLES]
+            member = self.members[key] = fakes.FakeMember(
+                10_000 + len(self.members), role_ids, self.guild, name=key, rest=self.rest
+            )
+        return member
+
+    def application_link(self) -> str:
+        return f"https://discord.com/channels/{self.guild.id}/{APPLICATION_CHANNEL_ID}/{fakes.next_snowflake()}"
+
+
+async def run_command(command, interaction: fakes.FakeInteraction, **kwargs):
+    """Tree check, command checks, callback, then the tree's error handler on failure."""
+    try:
+        if not await bot_module.bot.tree.interaction_check(interaction):
+            return
+        if not await _all_checks_pass(pred(interaction) for pred in command.checks):
+            raise bot_module.app_commands.CheckFailure(f"The check functions for {command.qualified_name} failed.")
+        await command.callback(interaction, **kwargs)
+        await bot_module.record_command_completion(interaction, command)
+    except bot_module.app_commands.AppCommandError as error:
+        await bot_module.on_app_command_error(interaction, error)
+
+
+async def _all_checks_pass(results) -> bool:
+    for result in results:
+        if asyncio.iscoroutine(result):
+            result = await result
+        if not result:
+            return False
+    return True
+
+
+async def run_vote(interaction: fakes.FakeInteraction, motion_number: int, vote: str):
+    motion = bot_module.get_motion_state(interaction.guild_id)["motions"].get(str(motion_number))
+    stage = "o5" if motion and motion.status == "o5_voting" else "board"
+    view = bot_module.MotionVoteView(str(motion_number), stage)
+    button = next(child for child in view.children if child.label.lower() == vote)
+    if await view.interaction_check(interaction):
+        await button.callback(interaction)
+
+
+def choice(value: str) -> bot_module.app_commands.Choice:
+    return bot_module.app_commands.Choice(name=value, value=value)
+
+
+async def dispatch(world: LoadWorld, event: dict) -> fakes.FakeInteraction:
+    op = event["op"]
+    args = event.get("args", {})
+    user = world.member(event.get("user", "staff"))
+
+    if op == "vote":
+        interaction = fakes.FakeInteraction(user, rest=world.rest)
+        await run_vote(interaction, args["motion"], args["vote"])
+        return interaction
+
+    if op == "rank":
+        command, kwargs = bot_module.rank, {
+            "target": args.get("target", "LoadTester"), "rank": choice(args.get("rank", "Class E")), "reason": "load test",
+        }
+    elif op == "notify":
+        command, kwargs = bot_module.notify, {
+            "user": world.notify_target, "type": choice("Class-E"), "reason": "load test", "duration": "1 day",
+            "trello_card": "https://trello.com/c/load", "appealable": True, "notifier_department": choice("IA"),
+        }
+    elif op == "ssu":
+        command, kwargs = bot_module.ssu, {}
+    elif op in {"application_accept", "application_reject"}:
+        command = bot_module.applications_accept if op == "application_accept" else bot_module.applications_reject
+        kwargs = {"message_link": world.application_link(), "applicant": world.applicant, "reason": "load test"}
+    elif op == "motion_create":
+        command, kwargs = bot_module.motion_create, {
+            "title": args.get("title", "Load motion"), "content": args.get("content", "Proposed change.\nSecond line."),
+        }
+    elif op == "motion_pass":
+        command, kwargs = bot_module.motion_pass, {"motion_number": args["motion"]}
+    elif op == "motion_status":
+        command, kwargs = bot_module.motion_status, {"motion_number": args["motion"]}
+    else:
+        raise ValueError(f"Unknown operation {op!r}")
+
+    interaction = fakes.FakeInteraction(user, rest=world.rest, command=command)
+    await run_command(command, interaction, **kwargs)
+    return interaction
+
+
+async def run_trace(trace: list[dict], world: LoadWorld, speed: float) -> dict:
+    results: dict[str, list[dict]] = {}
+
+    async def drive(event: dict):
+        fakes.current_operation.set(event["op"])
+        outcome = {"error": None, "ack_ms": None}
+        received = time.perf_counter()
+        try:
+            interaction = await dispatch(world, event)
+            if interaction.acknowledged_at is not None:
+                outcome["ack_ms"] = (interaction.acknowledged_at - interaction.received_at) * 1000
+        except Exception as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+        outcome["total_ms"] = (time.perf_counter() - received) * 1000
+        results.setdefault(event["op"], []).append(outcome)
+
+    started = time.perf_counter()
+    tasks = []
+    for event in trace:
+        delay = event["at"] / speed - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(drive(event)))
+    await asyncio.gather(*tasks)
+
+    for task in list(bot_module.motion_timer_tasks.values()):
+        task.cancel()
+    bot_module.motion_timer_tasks.clear()
+    return results
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def summarize(results: dict, rest: fakes.SimulatedDiscordRest) -> dict:
+    report = {}
+    for op, outcomes in sorted(results.items()):
+        acks = [o["ack_ms"] for o in outcomes if o["ack_ms"] is not None]
+        missed = sum(1 for o in outcomes if o["ack_ms"] is None or o["ack_ms"] > ACK_DEADLINE_SECONDS * 1000)
+        rest_calls = rest.calls.get(op, {})
+        report[op] = {
+            "count": len(outcomes),
+            "ack_p50_ms": round(statistics.median(acks), 1) if acks else None,
+            "ack_p95_ms": round(_percentile(acks, 95), 1) if acks else None,
+            "ack_max_ms": round(max(acks), 1) if acks else None,
+            "missed_3s_deadline": missed,
+            "rest_calls_per_op": round(sum(rest_calls.values()) / len(outcomes), 2),
+            "rest_429s": rest.rate_limited.get(op, 0),
+            "rest_routes": rest_calls,
+            "errors": sorted({o["error"] for o in outcomes if o["error"]}),
+        }
+    return report
+
+
+def print_table(report: dict):
+    print(f"{'operation':<20} {'n':>4} {'ack p50':>9} {'ack p95':>9} {'ack max':>9} {'missed':>7} {'REST/op':>8} {'429s':>5}",
+          file=sys.stderr)
+    for op, row in report.items():
+        cells = [f"{row[key]:>9.1f}" if row[key] is not None else f"{'-':>9}" for key in ("ack_p50_ms", "ack_p95_ms", "ack_max_ms")]
+        print(f"{op:<20} {row['count']:>4} {' '.join(cells)} {row['missed_3s_deadline']:>7} "
+              f"{row['rest_calls_per_op']:>8} {row['rest_429s']:>5}", file=sys.stderr)
+        for error in row["errors"]:
+            print(f"    error: {error}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", help="JSONL trace to replay (default: built-in vote burst)")
+    parser.add_argument("--votes", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10.0, help="vote burst duration")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--rest-latency-ms", type=float, default=80.0)
+    parser.add_argument("--rest-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--inject-429", type=float, default=0.0, help="fraction of REST calls answered with a 429")
+    parser.add_argument("--no-buckets", action="store_true", help="disable per-route rate-limit buckets")
+    parser.add_argument("--roblox-latency-ms", type=float, default=120.0)
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else build_vote_burst_trace(args.votes, args.seconds)
+    rest = fakes.SimulatedDiscordRest(
+        latency_ms=args.rest_latency_ms,
+        jitter_ms=args.rest_jitter_ms,
+        error_429_rate=args.inject_429,
+        buckets={} if args.no_buckets else None,
+    )
+    fakes.install_fake_roblox(
+        bot_module,
+        fakes.FakeRobloxApi(bot_module.ROBLOX_GROUP_ID, bot_module.ROBLOX_ROLE_VALUES, latency_ms=args.roblox_latency_ms),
+    )
+
+    async def run():
+        world = LoadWorld(rest)
+        bot_module.load_motion_state(world.guild.id)
+        return await run_trace(trace, world, args.speed)
+
+    report = summarize(asyncio.run(run()), rest)
+    print_table(report)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,39 @@ from datetime import datetime, UTC, timedelta
 import os
 import json
 import textwrap
+import abc
+import argparse
+import csv
+import gzip
+import io
+import tempfile
 from dotenv import load_dotenv
-from typing import List
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, fields, replace
+import heapq
 import re
 import requests
+import secrets
 import time
 import asyncio
+import contextlib
+import contextvars
+import bisect
+import functools
+import gc
+import inspect
+import socket
+import sys
+import threading
+import traceback
 import psycopg2
+import psycopg2.pool
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:  # optional speedup for motion state encoding
+    orjson = None
 
 # --- CONFIGURATION ---
 load_dotenv()
@@ -30,6 +56,48 @@ except (TypeError, ValueError):
 GAME_LINK = os.getenv("GAME_LINK", "https://www.roblox.com/games/17371095768/SCP-Lambda")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# --- MULTI-GUILD CONFIG ---
+# Every guild gets its own config (stored in Postgres, see /config) and its own
+# motion partition. The home guild defaults to the IDs in this file and keeps the
+# original storage keys, so existing motion state carries over; other guilds
+# start with nothing configured and can only point settings at their own
+# channels and roles. When HOME_GUILD_ID is unset the home guild is the one
+# holding the Board channel; sharded setups must set it.
+HOME_GUILD_ID = int(os.getenv("HOME_GUILD_ID", "0") or 0)
+GUILD_CONFIG_FILE = "guild_configs.json"  # used only without DATABASE_URL
+# Sharding: unset lets Discord pick the shard count. A fleet gives each process
+# the same SHARD_COUNT and its own comma-separated SHARD_IDS.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0") or 0) or None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()] or None
+if (SHARD_COUNT or SHARD_IDS) and not HOME_GUILD_ID:
+    # A shard that cannot see the home guild must still never treat another guild as home.
+    print("Error: HOME_GUILD_ID must be set when SHARD_COUNT or SHARD_IDS is used.")
+    exit()
+
+# --- REPLICA MODE CONFIG ---
+# Lets two processes share one bot token: motion state is synced through Postgres
+# LISTEN/NOTIFY and motion timers/bulletins only run on the advisory-lock leader.
+REPLICA_MODE = os.getenv("REPLICA_MODE", "").lower() in {"1", "true", "yes", "on"}
+INSTANCE_ID = os.getenv("INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+REPLICA_NOTIFY_CHANNEL = "scpfbot_motion_state"
+# Replicas of the same shard set share a leader; different shard sets do not.
+REPLICA_LEADER_LOCK_KEY = 7206110001 + (min(SHARD_IDS) if SHARD_IDS else 0)
+REPLICA_LEASE_CHECK_SECONDS = float(os.getenv("REPLICA_LEASE_CHECK_SECONDS", "3"))
+REPLICA_FOLLOWER_CLAIM_DELAY_SECONDS = float(os.getenv("REPLICA_FOLLOWER_CLAIM_DELAY_SECONDS", "0.25"))
+
+# --- RATE LIMIT CONFIG ---
+# "postgres" keeps limits across restarts and replicas; "memory" is per-process.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "postgres" if DATABASE_URL else "memory").lower()
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+RANK_RATE_LIMIT = int(os.getenv("RANK_RATE_LIMIT", "10"))
+RANK_RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RANK_RATE_LIMIT_WINDOW_SECONDS", "3600"))
+RANK_MIN_INTERVAL_SECONDS = float(os.getenv("RANK_MIN_INTERVAL_SECONDS", "15"))
+SSU_COOLDOWN_SECONDS = float(os.getenv("SSU_COOLDOWN_SECONDS", "600"))
+
+if REPLICA_MODE and not DATABASE_URL:
+    print("Warning: REPLICA_MODE requires DATABASE_URL. Running as a single instance.")
+    REPLICA_MODE = False
+
 # --- MOTION SYSTEM CONFIG (HARDCODED AS REQUESTED) ---
 LEVEL_4_ROLE_ID = 1233139781823627473
 LEVEL_3_ROLE_ID = 1233152664163057754
@@ -64,6 +132,23 @@ MOTION_EMOJIS = {
     },
 }
 
+# --- MOTION EARLY CLOSE CONFIG ---
+# Closes a voting stage once the members who have not voted yet could no longer
+# change its outcome. Voters may still switch their vote, so the stage only
+# closes if it is still decided after the grace period. Counting eligible voters
+# needs the privileged members intent (enable "Server Members Intent" in the
+# developer portal).
+MOTION_EARLY_CLOSE = os.getenv("MOTION_EARLY_CLOSE", "false").lower() == "true"
+MOTION_EARLY_CLOSE_GRACE_SECONDS = float(os.getenv("MOTION_EARLY_CLOSE_GRACE_SECONDS", "600"))
+
+# --- MOTION SEARCH CONFIG ---
+# Connections kept open for /motion search and motion number autocomplete.
+MOTION_SEARCH_POOL_SIZE = int(os.getenv("MOTION_SEARCH_POOL_SIZE", "4"))
+
+# --- MOTION EXPORT CONFIG ---
+MOTION_EXPORT_FETCH_SIZE = int(os.getenv("MOTION_EXPORT_FETCH_SIZE", "500"))  # motions per server-side cursor fetch
+MOTION_EXPORT_MAX_UPLOAD_BYTES = int(os.getenv("MOTION_EXPORT_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
 # --- ROBLOX CONFIG ---
 ROBLOX_COOKIE = os.getenv("ROBLOX_COOKIE")
 ROBLOX_HEADERS_BASE = {
@@ -72,32 +157,198 @@ ROBLOX_HEADERS_BASE = {
     "User-Agent": "SCPFbot",
 }
 
+# --- ROBLOX CIRCUIT BREAKER CONFIG ---
+# Per endpoint family: once at least ROBLOX_BREAKER_MIN_REQUESTS calls in the
+# window fail at ROBLOX_BREAKER_FAILURE_RATIO or worse, calls fail immediately for
+# ROBLOX_BREAKER_OPEN_SECONDS, after which a single probe decides whether to close.
+ROBLOX_HTTP_TIMEOUT_SECONDS = float(os.getenv("ROBLOX_HTTP_TIMEOUT_SECONDS", "8"))
+ROBLOX_BREAKER_WINDOW_SECONDS = float(os.getenv("ROBLOX_BREAKER_WINDOW_SECONDS", "60"))
+ROBLOX_BREAKER_MIN_REQUESTS = int(os.getenv("ROBLOX_BREAKER_MIN_REQUESTS", "5"))
+ROBLOX_BREAKER_FAILURE_RATIO = float(os.getenv("ROBLOX_BREAKER_FAILURE_RATIO", "0.5"))
+ROBLOX_BREAKER_OPEN_SECONDS = float(os.getenv("ROBLOX_BREAKER_OPEN_SECONDS", "30"))
+
 # --- ROLE IDs FOR PERMISSIONS ---
 EP_AND_ABOVE_ROLES = [
-    "1233139781823627473", "1233139781840670742",
-    "1233139781840670743", "1233139781840670746"
+    1233139781823627473, 1233139781840670742,
+    1233139781840670743, 1233139781840670746
 ]
-SSU_ALLOWED_ROLES = [str(LEVEL_3_ROLE_ID), str(ALT_LEVEL_3_ROLE_ID), *EP_AND_ABOVE_ROLES]
+SSU_ALLOWED_ROLES = [LEVEL_3_ROLE_ID, ALT_LEVEL_3_ROLE_ID, *EP_AND_ABOVE_ROLES]
 DD_AND_ABOVE_ROLES = [
-    "1246963191699734569", "1233139781840670742", "1233139781840670743",
-    "1233139781840670746"
+    1246963191699734569, 1233139781840670742, 1233139781840670743,
+    1233139781840670746
 ]
-NOTIFY_AND_APP_ROLES = EP_AND_ABOVE_ROLES + ["1234517225206059019", "1508079170192932986"]
+NOTIFY_AND_APP_ROLES = EP_AND_ABOVE_ROLES + [1234517225206059019, 1508079170192932986]
+MOTION_MANAGER_ROLES = [COUNCIL_CHAIRMAN_ROLE_ID, ADMINISTRATOR_ROLE_ID]
+MOTION_CREATOR_ROLES = [BOARD_ROLE_ID, O5_ROLE_ID, *MOTION_MANAGER_ROLES]
+BOARD_VOTER_ROLES = [BOARD_ROLE_ID, *MOTION_MANAGER_ROLES]
+O5_VOTER_ROLES = [O5_ROLE_ID, *MOTION_MANAGER_ROLES]
+DIAGNOSTICS_ROLES = [*DD_AND_ABOVE_ROLES, *MOTION_MANAGER_ROLES]
 
 # --- DISCORD ROLE -> MAX "RANK VALUE" THEY CAN ASSIGN ---
 # (These are your hierarchy values, NOT Roblox role IDs.)
 DISCORD_RANK_LIMITS = {
-    "1233139781823627473": 5,    # Level-4 Discord -> max Level-3 Roblox (value 5)
-    "1233139781840670743": 7,    # O5 Discord -> max Level-5 Roblox (value 7)
-    "1233139781840670746": 9,    # O5 Head Discord -> max O5 Council Roblox (value 9)
-    "1233139781840670749": 999,  # Administrator Discord -> unrestricted
-    "1508079170192932986": 7,    # Added role -> max Level-3 Roblox (value 5)
+    1233139781823627473: 5,    # Level-4 Discord -> max Level-3 Roblox (value 5)
+    1233139781840670743: 7,    # O5 Discord -> max Level-5 Roblox (value 7)
+    1233139781840670746: 9,    # O5 Head Discord -> max O5 Council Roblox (value 9)
+    1233139781840670749: 999,  # Administrator Discord -> unrestricted
+    1508079170192932986: 7,    # Added role -> max Level-3 Roblox (value 5)
+}
+
+# --- ROLE SYNC CONFIG ---
+# Discord roles that follow a linked member's Roblox group rank. Only these roles
+# are ever added or removed by the sync; every other role is left alone. Roles
+# listed for one rank are alternatives: holding any of them is enough, and the
+# first one the server has is added otherwise. Members whose Roblox rank is not
+# listed here keep their roles untouched. Off by default.
+ROLE_SYNC_DISCORD_ROLES = {
+    "Level 3": [LEVEL_3_ROLE_ID, ALT_LEVEL_3_ROLE_ID],
+    "Level 4": [LEVEL_4_ROLE_ID],
+    "Overseer Council": [O5_ROLE_ID],
+    "Council Chairman": [COUNCIL_CHAIRMAN_ROLE_ID],
+    "The Administrator": [ADMINISTRATOR_ROLE_ID],
 }
+ROLE_SYNC_ENABLED = os.getenv("ROLE_SYNC_ENABLED", "false").lower() == "true"
+# Each sweep tick re-checks the ROLE_SYNC_SWEEP_BATCH least recently checked
+# linked members; a member is not re-checked within ROLE_SYNC_RECHECK_SECONDS.
+ROLE_SYNC_SWEEP_INTERVAL_SECONDS = float(os.getenv("ROLE_SYNC_SWEEP_INTERVAL_SECONDS", "60"))
+ROLE_SYNC_SWEEP_BATCH = int(os.getenv("ROLE_SYNC_SWEEP_BATCH", "25"))
+ROLE_SYNC_RECHECK_SECONDS = float(os.getenv("ROLE_SYNC_RECHECK_SECONDS", "21600"))
+ROLE_SYNC_EDIT_INTERVAL_SECONDS = float(os.getenv("ROLE_SYNC_EDIT_INTERVAL_SECONDS", "1.0"))
+
+# --- GATEWAY PROFILE CONFIG ---
+# "lean" drops intents and caches that no handler uses (everything here is slash
+# commands, buttons and modals); "default" keeps the original gateway setup.
+GATEWAY_PROFILE = os.getenv("GATEWAY_PROFILE", "default").lower()
+
+# --- METRICS CONFIG ---
+# Prometheus text endpoint; disabled unless METRICS_PORT is set.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0") or 0)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# --- EVENT LOOP WATCHDOG CONFIG ---
+# A blocked loop longer than the threshold gets its stack logged; 0 disables it.
+LOOP_LAG_THRESHOLD_SECONDS = float(os.getenv("LOOP_LAG_THRESHOLD_SECONDS", "0.25"))
+LOOP_WATCHDOG_INTERVAL_SECONDS = float(os.getenv("LOOP_WATCHDOG_INTERVAL_SECONDS", "0.1"))
+LOOP_WATCHDOG_STACK_DEPTH = int(os.getenv("LOOP_WATCHDOG_STACK_DEPTH", "12"))
+LOOP_BLOCKING_TOP_N = int(os.getenv("LOOP_BLOCKING_TOP_N", "10"))
+
+# --- TRACING CONFIG ---
+# Interactions slower than the threshold are appended to SLOW_LOG_FILE as JSON lines.
+SLOW_INTERACTION_THRESHOLD_SECONDS = float(os.getenv("SLOW_INTERACTION_THRESHOLD_SECONDS", "2.0"))
+SLOW_LOG_FILE = os.getenv("SLOW_LOG_FILE", "slow_interactions.log")
+SLOW_LOG_RECENT_LIMIT = int(os.getenv("SLOW_LOG_RECENT_LIMIT", "50"))
+
+# --- PERMISSION CACHE CONFIG ---
+PERMISSION_CACHE_TTL_SECONDS = float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "60"))
+PERMISSION_CACHE_MAX_ENTRIES = int(os.getenv("PERMISSION_CACHE_MAX_ENTRIES", "5000"))
+
+# --- ROBLOX ACCOUNT LINK CONFIG ---
+ROBLOX_LINKS_FILE = "roblox_links.json"  # used only without DATABASE_URL
+LINK_VERIFICATION_TTL_SECONDS = float(os.getenv("LINK_VERIFICATION_TTL_SECONDS", "900"))
+
+# --- RANK LOG CONFIG ---
+# Above RANK_LOG_DIGEST_THRESHOLD entries per RANK_LOG_DIGEST_WINDOW_SECONDS the
+# rank log switches to compact digests flushed every RANK_LOG_DIGEST_FLUSH_SECONDS;
+# it returns to one embed per entry once the rate falls below half the threshold.
+RANK_LOG_FILE = "rank_log_entries.jsonl"  # used only without DATABASE_URL
+RANK_LOG_DIGEST_THRESHOLD = int(os.getenv("RANK_LOG_DIGEST_THRESHOLD", "10"))
+RANK_LOG_DIGEST_WINDOW_SECONDS = float(os.getenv("RANK_LOG_DIGEST_WINDOW_SECONDS", "60"))
+RANK_LOG_DIGEST_FLUSH_SECONDS = float(os.getenv("RANK_LOG_DIGEST_FLUSH_SECONDS", "15"))
+
+# --- OUTBOX CONFIG ---
+# Rank logs, application results, SSU pings and bulletins are queued here and
+# sent by the leader, one channel at a time in insertion order.
+OUTBOX_FILE = "outbox.json"  # used only without DATABASE_URL
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_CHANNEL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_CHANNEL_INTERVAL_SECONDS", "1.0"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "12"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "300"))
+# Entries read per channel on each poll, so one busy channel never starves the others.
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+
+# --- SCHEDULER CONFIG ---
+# Scheduled posts live in Postgres (or this file without a database). Posts that
+# fell due while the bot was down are still sent if they are at most
+# SCHEDULER_CATCH_UP_SECONDS late; older occurrences are skipped.
+SCHEDULED_POSTS_FILE = "scheduled_posts.json"
+SCHEDULER_CATCH_UP_SECONDS = float(os.getenv("SCHEDULER_CATCH_UP_SECONDS", "3600"))
+# Per guild.
+SCHEDULER_MAX_JOBS = int(os.getenv("SCHEDULER_MAX_JOBS", "500"))
+
+# --- MESSAGE LINK CACHE CONFIG ---
+# Resolved message links are reused for repeat actions on the same message.
+# Edit/delete events evict entries when the guild_messages intent is on (the
+# default profile); under the lean profile the TTL bounds staleness instead.
+MESSAGE_LINK_CACHE_TTL_SECONDS = float(os.getenv("MESSAGE_LINK_CACHE_TTL_SECONDS", "300"))
+MESSAGE_LINK_CACHE_MAX_ENTRIES = int(os.getenv("MESSAGE_LINK_CACHE_MAX_ENTRIES", "256"))
+
+# --- APPLICATION BATCH CONFIG ---
+APPLICATION_BATCH_SCAN_LIMIT = int(os.getenv("APPLICATION_BATCH_SCAN_LIMIT", "500"))
+APPLICATION_BATCH_MAX_APPLICANTS = int(os.getenv("APPLICATION_BATCH_MAX_APPLICANTS", "100"))
+APPLICATION_BATCH_REACTION_CONCURRENCY = int(os.getenv("APPLICATION_BATCH_REACTION_CONCURRENCY", "4"))
+
+# --- BULK NOTIFY CONFIG ---
+# DMs are paced globally as well as capped in flight: bursts of identical DMs
+# to non-friends are what Discord's spam heuristics flag.
+NOTIFY_BULK_MAX_TARGETS = int(os.getenv("NOTIFY_BULK_MAX_TARGETS", "500"))
+NOTIFY_BULK_CONCURRENCY = int(os.getenv("NOTIFY_BULK_CONCURRENCY", "2"))
+NOTIFY_BULK_DM_INTERVAL_SECONDS = float(os.getenv("NOTIFY_BULK_DM_INTERVAL_SECONDS", "1.0"))
+NOTIFY_BULK_MAX_ATTEMPTS = int(os.getenv("NOTIFY_BULK_MAX_ATTEMPTS", "3"))
+NOTIFY_BULK_PROGRESS_SECONDS = float(os.getenv("NOTIFY_BULK_PROGRESS_SECONDS", "2.0"))
+# Runs whose pacing alone would take longer are refused: the interaction token that
+# edits the progress message expires after 15 minutes, and 429 backoffs add more.
+NOTIFY_BULK_MAX_RUN_SECONDS = float(os.getenv("NOTIFY_BULK_MAX_RUN_SECONDS", "600"))
+
+# --- RUNTIME STATS CONFIG ---
+# Measuring audit-log bytes re-encodes every motion's log, so it is cached this long.
+STATS_AUDIT_SIZE_CACHE_SECONDS = float(os.getenv("STATS_AUDIT_SIZE_CACHE_SECONDS", "60"))
 
 # --- BOT SETUP ---
-intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+class InteractionClaimedElsewhere(app_commands.CheckFailure):
+    """Raised when another replica already handles this interaction."""
+
+
+class BotCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.autocomplete:
+            # Runs on every keystroke and is read-only: no claim row, no trace.
+            return True
+        interaction.extras["started_at"] = time.perf_counter()
+        if interaction.command is not None:
+            start_trace(f"/{interaction.command.qualified_name}", interaction)
+        if not await claim_interaction(interaction):
+            raise InteractionClaimedElsewhere()
+        return True
+
+
+def build_gateway_options(profile: str) -> dict:
+    if profile == "lean":
+        # Guilds keeps channels and roles cached for get_channel and role events.
+        lean_intents = discord.Intents.none()
+        lean_intents.guilds = True
+        return {
+            "intents": lean_intents,
+            "chunk_guilds_at_startup": False,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "max_messages": None,
+        }
+
+    default_intents = discord.Intents.default()
+    default_intents.message_content = True
+    return {"intents": default_intents}
+
+
+gateway_options = build_gateway_options(GATEWAY_PROFILE)
+if MOTION_EARLY_CLOSE:
+    # Early close counts role holders from the member cache, so it needs members chunked even under the lean profile.
+    gateway_options["intents"].members = True
+    if GATEWAY_PROFILE == "lean":
+        gateway_options["chunk_guilds_at_startup"] = True
+        gateway_options["member_cache_flags"] = discord.MemberCacheFlags.from_intents(gateway_options["intents"])
+intents = gateway_options["intents"]
+bot = commands.AutoShardedBot(
+    command_prefix="!", tree_cls=BotCommandTree, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **gateway_options
+)
 
 # --- CHOICES FOR COMMANDS ---
 COLOR_CHOICES = [
@@ -108,13 +359,731 @@ COLOR_CHOICES = [
     app_commands.Choice(name="Black", value="black"),
 ]
 
+# ===================== METRICS =====================
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        METRICS.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.label_names)
+
+    @abc.abstractmethod
+    def samples(self) -> list[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        super().__init__(name, description, label_names)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Values are read from `collect` at scrape time, so nothing needs updating."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, collect, label_names: tuple[str, ...] = ()):
+        super().__init__(name, description, label_names)
+        self.collect = collect
+
+    def samples(self) -> list[str]:
+        try:
+            values = self.collect()
+        except Exception as e:
+            print(f"Warning: failed to collect gauge {self.name}. Error: {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_format_labels(self.label_names, key if isinstance(key, tuple) else (key,))} {float(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, description, label_names)
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (bucket_counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_label = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, bucket_label)} {cumulative}")
+            inf_label = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, inf_label)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+METRICS: list[Metric] = []
+
+INTERACTION_SECONDS = Histogram(
+    "scpfbot_interaction_seconds", "Time spent handling slash commands, buttons and modals.", ("kind", "name", "outcome")
+)
+ROBLOX_REQUEST_SECONDS = Histogram(
+    "scpfbot_roblox_request_seconds", "Roblox API latency by endpoint family.", ("family", "method", "status")
+)
+DATABASE_SECONDS = Histogram("scpfbot_database_seconds", "Postgres operation latency.", ("operation", "outcome"))
+DISCORD_REST_SECONDS = Histogram(
+    "scpfbot_discord_rest_seconds", "Discord REST latency by route.", ("method", "route", "outcome")
+)
+ERRORS_TOTAL = Counter("scpfbot_errors_total", "Errors by source.", ("source",))
+CACHE_LOOKUPS_TOTAL = Counter("scpfbot_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result"))
+COOLDOWN_REJECTIONS_TOTAL = Counter(
+    "scpfbot_cooldown_rejections_total", "Invocations rejected by a cooldown or rate limit.", ("command",)
+)
+EVENT_LOOP_LAG_SECONDS = Histogram("scpfbot_event_loop_lag_seconds", "Event loop scheduling lag.")
+EVENT_LOOP_BLOCKED_SECONDS = Counter(
+    "scpfbot_event_loop_blocked_seconds_total", "Time the event loop spent blocked, by blocking call site.", ("site",)
+)
+Gauge(
+    "scpfbot_open_motions",
+    "Motions currently in a voting stage.",
+    lambda: {
+        (status,): sum(1 for motion in iter_all_motions() if motion.status == status)
+        for status in sorted(MOTION_OPEN_STATUSES)
+    },
+    ("status",),
+)
+Gauge("scpfbot_motion_timer_tasks", "Live motion deadline tasks.", lambda: sum(1 for t in motion_timer_tasks.values() if not t.done()))
+
+
+def timed(histogram: Histogram, span: str | None = None, **labels):
+    """
+    Decorator recording the wrapped call's duration with outcome="ok"/"error",
+    and as a trace span when `span` is given. Works for plain and async functions.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                outcome = "ok"
+                try:
+                    if span:
+                        with trace_span(span):
+                            return await func(*args, **kwargs)
+                    return await func(*args, **kwargs)
+                except Exception:
+                    outcome = "error"
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - started, outcome=outcome, **labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                if span:
+                    with trace_span(span):
+                        return func(*args, **kwargs)
+                return func(*args, **kwargs)
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - started, outcome=outcome, **labels)
+        return wrapper
+    return decorator
+
+
+def _instrument_rest_request(owner, source: str):
+    original_request = owner.request
+
+    async def request(route, *args, **kwargs):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            with trace_span(f"discord:{route.method} {route.path}"):
+                return await original_request(route, *args, **kwargs)
+        except Exception:
+            outcome = "error"
+            ERRORS_TOTAL.inc(source=source)
+            raise
+        finally:
+            DISCORD_REST_SECONDS.observe(
+                time.perf_counter() - started, method=route.method, route=route.path, outcome=outcome
+            )
+
+    owner.request = request
+
+
+def instrument_discord_http(client: commands.Bot):
+    """
+    Times every REST call discord.py makes by route template: the bot's own
+    HTTP client (sends, edits, fetches) and the webhook adapter that carries
+    interaction responses and followups.
+    """
+    _instrument_rest_request(client.http, "discord_rest")
+    _instrument_rest_request(discord.webhook.async_.async_context.get(), "discord_interaction")
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in METRICS) + "\n"
+
+
+_metrics_runner = None
+
+
+async def start_metrics_server():
+    global _metrics_runner
+    if not METRICS_PORT or _metrics_runner is not None:
+        return
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    _metrics_runner = web.AppRunner(app, access_log=None)
+    await _metrics_runner.setup()
+    await web.TCPSite(_metrics_runner, METRICS_HOST, METRICS_PORT).start()
+    print(f"Metrics available on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+
+instrument_discord_http(bot)
+
+# ===================== INTERACTION TRACING =====================
+@dataclass(slots=True)
+class TraceSpan:
+    name: str
+    offset_ms: float
+    duration_ms: float
+    outcome: str
+
+
+@dataclass(slots=True)
+class InteractionTrace:
+    name: str
+    interaction_id: int | None
+    user_id: int | None
+    started_at: float
+    received_lag_ms: float
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[TraceSpan] = field(default_factory=list)
+    total_ms: float = 0.0
+    outcome: str = "ok"
+    finished: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "interaction_id": self.interaction_id,
+            "user_id": self.user_id,
+            "started_at": self.started_at,
+            "received_lag_ms": self.received_lag_ms,
+            "total_ms": self.total_ms,
+            "outcome": self.outcome,
+            "spans": [
+                {"name": s.name, "offset_ms": s.offset_ms, "duration_ms": s.duration_ms, "outcome": s.outcome}
+                for s in self.spans
+            ],
+        }
+
+
+_current_trace: contextvars.ContextVar[InteractionTrace | None] = contextvars.ContextVar("interaction_trace", default=None)
+recent_slow_traces: deque[InteractionTrace] = deque(maxlen=SLOW_LOG_RECENT_LIMIT)
+
+
+def start_trace(name: str, interaction: discord.Interaction) -> InteractionTrace:
+    received_lag_ms = max((discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000, 0.0)
+    trace = InteractionTrace(
+        name=name,
+        interaction_id=interaction.id,
+        user_id=interaction.user.id if interaction.user else None,
+        started_at=time.time(),
+        received_lag_ms=round(received_lag_ms, 1),
+    )
+    interaction.extras["trace"] = trace
+    _current_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace: InteractionTrace | None, outcome: str = "ok"):
+    if trace is None or trace.finished:
+        return
+    trace.finished = True
+    trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 1)
+    trace.outcome = outcome
+    if trace.total_ms + trace.received_lag_ms < SLOW_INTERACTION_THRESHOLD_SECONDS * 1000:
+        return
+
+    recent_slow_traces.append(trace)
+    if SLOW_LOG_FILE:
+        try:
+            with open(SLOW_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict()) + "\n")
+        except OSError as e:
+            print(f"Warning: failed to write slow interaction log. Error: {e}")
+
+
+def get_active_trace() -> InteractionTrace | None:
+    """The current interaction's trace, or None once it has finished."""
+    trace = _current_trace.get()
+    return None if trace is None or trace.finished else trace
+
+
+def create_background_task(coro) -> asyncio.Task:
+    """Starts a task in an empty context, so it never inherits the trace of the command that spawned it."""
+    return asyncio.create_task(coro, context=contextvars.Context())
+
+
+@contextlib.contextmanager
+def trace_span(name: str):
+    """Records a timed span on the active interaction trace; a no-op outside one."""
+    trace = get_active_trace()
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        trace.spans.append(TraceSpan(
+            name=name,
+            offset_ms=round((started - trace.started) * 1000, 1),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            outcome=outcome,
+        ))
+
+
+def traced(name: str):
+    """
+    Starts a trace for handlers reached outside a slash command (buttons and
+    modals); inside a command's trace the handler is recorded as a span instead.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if get_active_trace() is not None:
+                with trace_span(f"handler:{name}"):
+                    return await func(*args, **kwargs)
+
+            interaction = next((arg for arg in args if isinstance(arg, discord.Interaction)), None)
+            if interaction is None:
+                return await func(*args, **kwargs)
+
+            trace = start_trace(name, interaction)
+            outcome = "ok"
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                finish_trace(trace, outcome)
+                _current_trace.set(None)
+        return wrapper
+    return decorator
+
+
+def format_trace_summary(trace: InteractionTrace, max_spans: int = 8) -> str:
+    slowest = sorted(trace.spans, key=lambda s: s.duration_ms, reverse=True)[:max_spans]
+    lines = [
+        f"<t:{int(trace.started_at)}:R> by <@{trace.user_id}> | total **{trace.total_ms:.0f} ms** "
+        f"(+{trace.received_lag_ms:.0f} ms before receipt) | {trace.outcome}"
+    ]
+    for span in slowest:
+        marker = " ⚠️" if span.outcome != "ok" else ""
+        lines.append(f"`{span.duration_ms:>7.1f} ms` @{span.offset_ms:.0f} {span.name}{marker}")
+    return "\n".join(lines)
+
+# ===================== GUILD CONFIG =====================
+@dataclass(frozen=True, slots=True)
+class GuildConfig:
+    """Channel and role IDs for one guild; defaults are the IDs hardcoded above."""
+    guild_id: int
+    announcement_channel_id: int = ANNOUNCEMENT_CHANNEL_ID
+    ssu_channel_id: int = SSU_CHANNEL_ID
+    application_results_channel_id: int = APPLICATION_RESULTS_CHANNEL_ID
+    rank_log_channel_id: int = RANK_LOG_CHANNEL_ID
+    board_motions_channel_id: int = BOARD_MOTIONS_CHANNEL_ID
+    o5_motions_channel_id: int = O5_MOTIONS_CHANNEL_ID
+    motion_updates_channel_id: int = MOTION_UPDATES_CHANNEL_ID
+    ssu_ping_role_id: int = SSU_PING_ROLE_ID
+    board_role_id: int = BOARD_ROLE_ID
+    o5_role_id: int = O5_ROLE_ID
+    administrator_role_id: int = ADMINISTRATOR_ROLE_ID
+    ssu_role_ids: frozenset[int] = frozenset(SSU_ALLOWED_ROLES)
+    notify_role_ids: frozenset[int] = frozenset(NOTIFY_AND_APP_ROLES)
+    announce_role_ids: frozenset[int] = frozenset(DD_AND_ABOVE_ROLES)
+    diagnostics_role_ids: frozenset[int] = frozenset(DIAGNOSTICS_ROLES)
+    motion_manager_role_ids: frozenset[int] = frozenset(MOTION_MANAGER_ROLES)
+    rank_limits: dict[int, int] = field(default_factory=lambda: dict(DISCORD_RANK_LIMITS))
+    role_sync_roles: dict[str, tuple[int, ...]] = field(
+        default_factory=lambda: {name: tuple(role_ids) for name, role_ids in ROLE_SYNC_DISCORD_ROLES.items()}
+    )
+
+    @property
+    def motion_creator_role_ids(self) -> frozenset[int]:
+        return self.motion_manager_role_ids | {self.board_role_id, self.o5_role_id}
+
+    @property
+    def board_voter_role_ids(self) -> frozenset[int]:
+        return self.motion_manager_role_ids | {self.board_role_id}
+
+    @property
+    def o5_voter_role_ids(self) -> frozenset[int]:
+        return self.motion_manager_role_ids | {self.o5_role_id}
+
+    def to_overrides(self) -> dict:
+        """Only the settings that differ from the defaults, JSON-ready."""
+        defaults = default_guild_config(self.guild_id)
+        overrides = {}
+        for name in GUILD_CONFIG_SETTINGS:
+            value = getattr(self, name)
+            if value == getattr(defaults, name):
+                continue
+            if isinstance(value, frozenset):
+                value = sorted(value)
+            elif name == "rank_limits":
+                value = {str(role_id): limit for role_id, limit in value.items()}
+            elif name == "role_sync_roles":
+                value = {rank_name: list(role_ids) for rank_name, role_ids in value.items()}
+            overrides[name] = value
+        return overrides
+
+    @classmethod
+    def from_overrides(cls, guild_id: int, overrides: dict) -> "GuildConfig":
+        values = {}
+        for name, value in overrides.items():
+            if name not in GUILD_CONFIG_SETTINGS:
+                continue
+            if name in HOME_GUILD_ONLY_SETTINGS and guild_id != HOME_GUILD_ID:
+                continue
+            if name.endswith("_role_ids"):
+                value = frozenset(int(role_id) for role_id in value)
+            elif name == "rank_limits":
+                value = {int(role_id): int(limit) for role_id, limit in value.items()}
+            elif name == "role_sync_roles":
+                value = {rank_name: tuple(int(role_id) for role_id in role_ids) for rank_name, role_ids in value.items()}
+            else:
+                value = int(value)
+            values[name] = value
+        return replace(default_guild_config(guild_id), **values)
+
+
+GUILD_CONFIG_SETTINGS = tuple(f.name for f in fields(GuildConfig) if f.name != "guild_id")
+# Ranks are changed in the one shared Roblox group, so only the home guild decides who may rank.
+HOME_GUILD_ONLY_SETTINGS = frozenset({"rank_limits", "role_sync_roles", "administrator_role_id"})
+
+
+def default_guild_config(guild_id: int) -> GuildConfig:
+    """
+    The hardcoded IDs belong to the home guild. Any other guild starts with no
+    channels or roles, so nothing it does can post or ping outside itself.
+    """
+    if guild_id == HOME_GUILD_ID:
+        return GuildConfig(guild_id)
+    blank = {}
+    for f in fields(GuildConfig):
+        if f.name == "guild_id":
+            continue
+        if f.name.endswith("_role_ids"):
+            blank[f.name] = frozenset()
+        elif f.name in {"rank_limits", "role_sync_roles"}:
+            blank[f.name] = {}
+        else:
+            blank[f.name] = 0
+    return GuildConfig(guild_id, **blank)
+
+
+class GuildConfigStore(abc.ABC):
+    @abc.abstractmethod
+    def load_all(self) -> dict[int, dict]:
+        ...
+
+    @abc.abstractmethod
+    def load(self, guild_id: int) -> dict | None:
+        ...
+
+    @abc.abstractmethod
+    def save(self, guild_id: int, overrides: dict):
+        ...
+
+
+class FileGuildConfigStore(GuildConfigStore):
+    def _read(self) -> dict[str, dict]:
+        if not os.path.exists(GUILD_CONFIG_FILE):
+            return {}
+        with open(GUILD_CONFIG_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_all(self) -> dict[int, dict]:
+        return {int(guild_id): overrides for guild_id, overrides in self._read().items()}
+
+    def load(self, guild_id: int) -> dict | None:
+        return self._read().get(str(guild_id))
+
+    def save(self, guild_id: int, overrides: dict):
+        data = self._read()
+        data[str(guild_id)] = overrides
+        with open(GUILD_CONFIG_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+class PostgresGuildConfigStore(GuildConfigStore):
+    def __init__(self):
+        self._table_ready = False
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guild_configs (
+                guild_id BIGINT PRIMARY KEY,
+                config JSONB NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """
+        )
+        self._table_ready = True
+
+    @timed(DATABASE_SECONDS, span="db:load_guild_configs", operation="load_guild_configs")
+    def load_all(self) -> dict[int, dict]:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute("SELECT guild_id, config FROM guild_configs")
+                return {int(guild_id): config for guild_id, config in cur.fetchall()}
+
+    @timed(DATABASE_SECONDS, span="db:load_guild_config", operation="load_guild_config")
+    def load(self, guild_id: int) -> dict | None:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute("SELECT config FROM guild_configs WHERE guild_id = %s", (guild_id,))
+                row = cur.fetchone()
+        return row[0] if row else None
+
+    @timed(DATABASE_SECONDS, span="db:save_guild_config", operation="save_guild_config")
+    def save(self, guild_id: int, overrides: dict):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    """
+                    INSERT INTO guild_configs (guild_id, config, updated_at)
+                    VALUES (%s, %s::jsonb, NOW())
+                    ON CONFLICT (guild_id) DO UPDATE SET config = EXCLUDED.config, updated_at = NOW()
+                    """,
+                    (guild_id, json.dumps(overrides)),
+                )
+
+
+def create_guild_config_store() -> GuildConfigStore:
+    return PostgresGuildConfigStore() if DATABASE_URL else FileGuildConfigStore()
+
+
+guild_config_store = create_guild_config_store()
+# Every lookup on the hot path is a single dict hit; guilds without stored config get a default entry on first use.
+_guild_configs: dict[int, GuildConfig] = {}
+
+
+def get_guild_config(guild_id: int | None) -> GuildConfig:
+    config = _guild_configs.get(guild_id)
+    if config is None:
+        config = _guild_configs[guild_id] = default_guild_config(guild_id or 0)
+    return config
+
+
+def load_guild_configs():
+    _guild_configs.clear()
+    for guild_id, overrides in guild_config_store.load_all().items():
+        _guild_configs[guild_id] = GuildConfig.from_overrides(guild_id, overrides)
+    print(f"Loaded config for {len(_guild_configs)} guild(s).")
+
+
+def refresh_guild_config(guild_id: int):
+    overrides = guild_config_store.load(guild_id)
+    _guild_configs[guild_id] = GuildConfig.from_overrides(guild_id, overrides or {})
+    invalidate_permission_profile(guild_id)
+
+
+async def save_guild_config(config: GuildConfig):
+    guild_config_store.save(config.guild_id, config.to_overrides())
+    _guild_configs[config.guild_id] = config
+    invalidate_permission_profile(config.guild_id)
+    await publish_replica_event("guild_config", guild_id=config.guild_id)
+
+
+def resolve_home_guild_id() -> int:
+    """
+    HOME_GUILD_ID, or the guild that holds the default Board motions channel.
+    Never guessed otherwise: the home guild owns the original motion state and counter.
+    """
+    global HOME_GUILD_ID
+    if not HOME_GUILD_ID:
+        board_channel = bot.get_channel(BOARD_MOTIONS_CHANNEL_ID)
+        if board_channel is not None:
+            HOME_GUILD_ID = board_channel.guild.id
+        else:
+            print("Warning: HOME_GUILD_ID is not set and the Board motions channel is not visible; "
+                  "no guild uses the original motion state.")
+    return HOME_GUILD_ID
+
 # --- PERMISSION CHECKS ---
-def has_any_role(required_roles: List[str]):
+@dataclass(frozen=True, slots=True)
+class PermissionProfile:
+    can_ssu: bool
+    can_notify: bool
+    can_announce: bool
+    can_rank: bool
+    can_create_motions: bool
+    can_vote_board: bool
+    can_vote_o5: bool
+    can_manage_motions: bool
+    can_view_diagnostics: bool
+    is_administrator: bool
+    max_rank_value: int
+
+
+_permission_cache: dict[tuple[int, int], tuple[PermissionProfile, float]] = {}
+
+
+def build_permission_profile(role_ids: set[int], config: GuildConfig) -> PermissionProfile:
+    max_rank_value = max((config.rank_limits.get(role_id, 0) for role_id in role_ids), default=0)
+    return PermissionProfile(
+        can_ssu=not role_ids.isdisjoint(config.ssu_role_ids),
+        can_notify=not role_ids.isdisjoint(config.notify_role_ids),
+        can_announce=not role_ids.isdisjoint(config.announce_role_ids),
+        can_rank=max_rank_value > 0,
+        can_create_motions=not role_ids.isdisjoint(config.motion_creator_role_ids),
+        can_vote_board=not role_ids.isdisjoint(config.board_voter_role_ids),
+        can_vote_o5=not role_ids.isdisjoint(config.o5_voter_role_ids),
+        can_manage_motions=not role_ids.isdisjoint(config.motion_manager_role_ids),
+        can_view_diagnostics=not role_ids.isdisjoint(config.diagnostics_role_ids),
+        is_administrator=config.administrator_role_id in role_ids,
+        max_rank_value=max_rank_value,
+    )
+
+
+NO_PERMISSIONS = PermissionProfile(*([False] * (len(fields(PermissionProfile)) - 1)), max_rank_value=0)
+
+
+def get_permission_profile(member: discord.abc.User) -> PermissionProfile:
+    """
+    Capability flags for a member, cached until their roles change (or the TTL
+    passes, as a safety net when member update events are not delivered).
+    """
+    if not isinstance(member, discord.Member):
+        return NO_PERMISSIONS
+
+    cache_key = (member.guild.id, member.id)
+    now = time.monotonic()
+    cached = _permission_cache.get(cache_key)
+    if cached and now - cached[1] < PERMISSION_CACHE_TTL_SECONDS:
+        CACHE_LOOKUPS_TOTAL.inc(cache="permission_profile", result="hit")
+        return cached[0]
+
+    CACHE_LOOKUPS_TOTAL.inc(cache="permission_profile", result="miss")
+    profile = build_permission_profile({role.id for role in member.roles}, get_guild_config(member.guild.id))
+    if len(_permission_cache) >= PERMISSION_CACHE_MAX_ENTRIES:
+        expired = [key for key, (_, built_at) in _permission_cache.items() if now - built_at >= PERMISSION_CACHE_TTL_SECONDS]
+        for key in expired or list(_permission_cache)[: PERMISSION_CACHE_MAX_ENTRIES // 10]:
+            del _permission_cache[key]
+    _permission_cache[cache_key] = (profile, now)
+    return profile
+
+
+def invalidate_permission_profile(guild_id: int, member_id: int | None = None):
+    if member_id is not None:
+        _permission_cache.pop((guild_id, member_id), None)
+        return
+    for key in [key for key in _permission_cache if key[0] == guild_id]:
+        del _permission_cache[key]
+
+
+async def resolve_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    """
+    Cache-first member lookup. With the lean gateway profile the member cache is
+    empty, so this falls back to a single targeted fetch.
+    """
+    member = guild.get_member(user_id)
+    if member:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except (discord.NotFound, discord.Forbidden):
+        return None
+
+
+def has_permission(*capabilities: str):
+    """Passes if the user has any of `capabilities`."""
     async def predicate(interaction: discord.Interaction) -> bool:
-        if not isinstance(interaction.user, discord.Member):
-            return False
-        user_role_ids = {str(role.id) for role in interaction.user.roles}
-        return any(role_id in user_role_ids for role_id in required_roles)
+        with trace_span(f"check:{'|'.join(capabilities)}"):
+            user = interaction.user
+            if not isinstance(user, discord.Member) and interaction.guild is not None:
+                user = await resolve_member(interaction.guild, user.id)
+            profile = get_permission_profile(user)
+            return any(getattr(profile, capability) for capability in capabilities)
     return app_commands.check(predicate)
 
 # --- HELPER FUNCTIONS ---
@@ -151,6 +1120,49 @@ def extract_buttons_from_message(message: discord.Message):
                     buttons.append({"label": label, "url": url})
     return buttons
 
+# --- MESSAGE LINKS ---
+MESSAGE_LINK_PATTERN = re.compile(r"https?://(?:(?:ptb|canary)\.)?discord(?:app)?\.com/channels/(?:\d+|@me)/(\d+)/(\d+)")
+
+_message_link_cache: OrderedDict[int, tuple[discord.Message, float]] = OrderedDict()
+
+
+def parse_message_link(link: str) -> tuple[int, int] | None:
+    """(channel_id, message_id) from a discord.com, ptb., canary. or discordapp.com link."""
+    match = MESSAGE_LINK_PATTERN.match(link.strip())
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def cache_linked_message(message: discord.Message):
+    _message_link_cache[message.id] = (message, time.monotonic())
+    _message_link_cache.move_to_end(message.id)
+    while len(_message_link_cache) > MESSAGE_LINK_CACHE_MAX_ENTRIES:
+        _message_link_cache.popitem(last=False)
+
+
+def evict_linked_message(message_id: int):
+    _message_link_cache.pop(message_id, None)
+
+
+async def fetch_linked_message(channel_id: int, message_id: int) -> discord.Message:
+    """
+    Cache-first lookup of a linked message; a miss costs the channel and
+    message fetches. Raises discord.NotFound/Forbidden like fetch_message.
+    """
+    cached = _message_link_cache.get(message_id)
+    if cached and cached[0].channel.id == channel_id and time.monotonic() - cached[1] < MESSAGE_LINK_CACHE_TTL_SECONDS:
+        CACHE_LOOKUPS_TOTAL.inc(cache="message_link", result="hit")
+        _message_link_cache.move_to_end(message_id)
+        return cached[0]
+
+    CACHE_LOOKUPS_TOTAL.inc(cache="message_link", result="miss")
+    with trace_span("resolve_message_link"):
+        channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+        message = await channel.fetch_message(message_id)
+    cache_linked_message(message)
+    return message
+
 # ===================== ROBLOX HELPERS (WORKING VERSION) =====================
 # These are your "rank values" (hierarchy), NOT Roblox role IDs.
 ROBLOX_ROLE_VALUES = {
@@ -180,10 +1192,140 @@ _roblox_csrf_token = None
 _group_roles_cache = None
 _group_roles_cache_time = 0.0
 _GROUP_ROLES_CACHE_SECONDS = 300  # 5 minutes
-_rank_cooldown_seconds = 15
-_rank_last_used = {}
 
-def roblox_request(method: str, url: str, json=None):
+class RobloxUnavailableError(RuntimeError):
+    """Raised without calling Roblox while a family's circuit breaker is open."""
+
+    def __init__(self, family: str, retry_after: float):
+        self.family = family
+        self.retry_after = retry_after
+        super().__init__(
+            f"Roblox is currently unavailable ({family}). Please try again in {max(int(retry_after), 1)} seconds."
+        )
+
+
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+ROBLOX_BREAKER_TRANSITIONS_TOTAL = Counter(
+    "scpfbot_roblox_breaker_transitions_total", "Roblox circuit breaker state changes.", ("family", "state")
+)
+ROBLOX_BREAKER_REJECTIONS_TOTAL = Counter(
+    "scpfbot_roblox_breaker_rejections_total", "Roblox calls failed fast by an open circuit breaker.", ("family",)
+)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when the recent failure ratio trips; open -> half-open after
+    ROBLOX_BREAKER_OPEN_SECONDS, letting one probe through; the probe's outcome
+    closes or re-opens it. Thread-safe, since role sync calls Roblox off the loop.
+    """
+
+    def __init__(self, family: str):
+        self.family = family
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            ROBLOX_BREAKER_TRANSITIONS_TOTAL.inc(family=self.family, state=state)
+            print(f"Roblox circuit breaker for {self.family} is now {state}.")
+
+    def retry_after(self) -> float:
+        return max(self.opened_at + ROBLOX_BREAKER_OPEN_SECONDS - time.monotonic(), 0.0)
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open" and self.retry_after() <= 0:
+                self._set_state("half_open")
+            if self.state == "open" or (self.state == "half_open" and self._probe_in_flight):
+                ROBLOX_BREAKER_REJECTIONS_TOTAL.inc(family=self.family)
+                raise RobloxUnavailableError(self.family, self.retry_after() or ROBLOX_BREAKER_OPEN_SECONDS)
+            if self.state == "half_open":
+                self._probe_in_flight = True
+
+    def record(self, failed: bool):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                if failed:
+                    self.opened_at = now
+                    self._set_state("open")
+                else:
+                    self._set_state("closed")
+                return
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and now - self._outcomes[0][0] > ROBLOX_BREAKER_WINDOW_SECONDS:
+                self._outcomes.popleft()
+            failures = sum(1 for _, outcome in self._outcomes if outcome)
+            if (
+                self.state == "closed"
+                and len(self._outcomes) >= ROBLOX_BREAKER_MIN_REQUESTS
+                and failures / len(self._outcomes) >= ROBLOX_BREAKER_FAILURE_RATIO
+            ):
+                self.opened_at = now
+                self._set_state("open")
+
+
+roblox_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_roblox_breaker(family: str) -> CircuitBreaker:
+    breaker = roblox_breakers.get(family)
+    if breaker is None:
+        breaker = roblox_breakers.setdefault(family, CircuitBreaker(family))
+    return breaker
+
+
+def describe_roblox_breakers() -> str | None:
+    """Short summary of every family that is not closed, or None when all are healthy."""
+    parts = []
+    for family, breaker in sorted(roblox_breakers.items()):
+        if breaker.state == "open":
+            parts.append(f"{family}: open ({int(breaker.retry_after())}s)")
+        elif breaker.state == "half_open":
+            parts.append(f"{family}: half-open")
+    return ", ".join(parts) or None
+
+
+Gauge(
+    "scpfbot_roblox_breaker_state",
+    "Roblox circuit breaker state per family (0 closed, 1 half-open, 2 open).",
+    lambda: {(family,): BREAKER_STATE_VALUES[breaker.state] for family, breaker in roblox_breakers.items()},
+    ("family",),
+)
+
+
+def roblox_http(family: str, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Single choke point for Roblox HTTP calls so every endpoint family is timed,
+    counted and guarded by its circuit breaker the same way.
+    """
+    breaker = get_roblox_breaker(family)
+    breaker.before_call()
+    kwargs.setdefault("timeout", ROBLOX_HTTP_TIMEOUT_SECONDS)
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with trace_span(f"roblox:{family}"):
+            response = requests.request(method, url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        # Timeouts, connection errors, 429s and 5xx count against Roblox; other 4xx are the caller's problem.
+        breaker.record(failed=status == "error" or status == "429" or status.startswith("5"))
+        if not status.startswith("2"):
+            ERRORS_TOTAL.inc(source=f"roblox_{family}")
+        ROBLOX_REQUEST_SECONDS.observe(time.perf_counter() - started, family=family, method=method, status=status)
+
+
+def roblox_request(method: str, url: str, json=None, family: str = "groups"):
     """
     Roblox requires X-CSRF-TOKEN for state-changing requests.
     We'll auto-retry once if we receive a token.
@@ -194,31 +1336,30 @@ def roblox_request(method: str, url: str, json=None):
     if _roblox_csrf_token:
         headers["X-CSRF-TOKEN"] = _roblox_csrf_token
 
-    r = requests.request(method, url, headers=headers, json=json)
+    r = roblox_http(family, method, url, headers=headers, json=json)
 
     # If token invalid/missing, Roblox returns 403 with X-CSRF-TOKEN header
     if r.status_code == 403 and "X-CSRF-TOKEN" in r.headers:
         _roblox_csrf_token = r.headers["X-CSRF-TOKEN"]
         headers["X-CSRF-TOKEN"] = _roblox_csrf_token
-        r = requests.request(method, url, headers=headers, json=json)
+        r = roblox_http(family, method, url, headers=headers, json=json)
 
     return r
 
-def get_max_allowed_rank_value(member: discord.Member) -> int:
-    return max((DISCORD_RANK_LIMITS.get(str(role.id), 0) for role in member.roles), default=0)
-
 def resolve_roblox_user(target: str):
     """
     target can be username OR userId in the same field.
     """
     if target.isdigit():
         user_id = int(target)
-        r = requests.get(f"https://users.roblox.com/v1/users/{user_id}")
+        r = roblox_http("users", "GET", f"https://users.roblox.com/v1/users/{user_id}")
         if r.status_code != 200:
             raise ValueError("Invalid Roblox user ID.")
         return user_id, r.json()["name"]
 
-    r = requests.post(
+    r = roblox_http(
+        "users",
+        "POST",
         "https://users.roblox.com/v1/usernames/users",
         json={"usernames": [target], "excludeBannedUsers": False},
     )
@@ -234,9 +1375,11 @@ def get_group_roles():
     global _group_roles_cache, _group_roles_cache_time
     now = time.time()
     if _group_roles_cache and (now - _group_roles_cache_time) < _GROUP_ROLES_CACHE_SECONDS:
+        CACHE_LOOKUPS_TOTAL.inc(cache="group_roles", result="hit")
         return _group_roles_cache
 
-    r = requests.get(f"https://groups.roblox.com/v1/groups/{ROBLOX_GROUP_ID}/roles")
+    CACHE_LOOKUPS_TOTAL.inc(cache="group_roles", result="miss")
+    r = roblox_http("group_roles", "GET", f"https://groups.roblox.com/v1/groups/{ROBLOX_GROUP_ID}/roles")
     if r.status_code != 200:
         raise RuntimeError(f"Failed to fetch group roles: {r.text}")
 
@@ -254,7 +1397,7 @@ def get_role_id_by_name(role_name: str) -> int:
     raise ValueError("That role does not exist in the Roblox group.")
 
 def get_current_role_name(user_id: int) -> str:
-    r = requests.get(f"https://groups.roblox.com/v1/users/{user_id}/groups/roles")
+    r = roblox_http("group_membership", "GET", f"https://groups.roblox.com/v1/users/{user_id}/groups/roles")
     if r.status_code != 200:
         return "Unknown"
     for g in r.json().get("data", []):
@@ -295,19 +1438,304 @@ def get_role_value(role_name: str) -> int | None:
 
     return None
 
+# ===================== RATE LIMITING =====================
+@dataclass(frozen=True)
+class RateLimitRule:
+    limit: int
+    window_seconds: float
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float
+    remaining: int
+    rule: RateLimitRule
+
+
+def _decide_rate_limit(hits: list[float], rules: list[RateLimitRule], now: float) -> RateLimitDecision:
+    """
+    Sliding-log decision shared by every backend. `hits` holds the timestamps
+    already recorded for the key (before the current attempt).
+    """
+    blocked = None
+    for rule in rules:
+        window_hits = sorted(h for h in hits if h > now - rule.window_seconds)
+        if len(window_hits) >= rule.limit:
+            # The attempt is allowed again once enough old hits slide out of the window.
+            retry_after = window_hits[len(window_hits) - rule.limit] + rule.window_seconds - now
+            if blocked is None or retry_after > blocked[0]:
+                blocked = (retry_after, rule)
+
+    widest = max(rules, key=lambda r: r.window_seconds)
+    widest_used = sum(1 for h in hits if h > now - widest.window_seconds)
+    if blocked:
+        return RateLimitDecision(False, max(blocked[0], 0.0), max(widest.limit - widest_used, 0), widest)
+    return RateLimitDecision(True, 0.0, max(widest.limit - widest_used - 1, 0), widest)
+
+
+class RateLimiter(abc.ABC):
+    """
+    Records an attempt for `key` if every rule still has quota; rejected
+    attempts do not consume quota.
+    """
+
+    @abc.abstractmethod
+    def hit(self, key: str, rules: list[RateLimitRule]) -> RateLimitDecision:
+        ...
+
+    @abc.abstractmethod
+    def release(self, key: str):
+        """Gives back the most recent attempt recorded for `key`."""
+
+    @abc.abstractmethod
+    def size(self) -> int:
+        ...
+
+
+class InMemoryRateLimiter(RateLimiter):
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._hits: dict[str, list[float]] = {}
+        self._expires_at: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    def _evict(self, now: float):
+        # Heap entries go stale when a key is hit again; only the latest expiry counts.
+        while self._expiry_heap and (
+            self._expiry_heap[0][0] <= now or len(self._hits) > self.max_keys
+        ):
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            if self._expires_at.get(key) == expires_at:
+                del self._expires_at[key]
+                del self._hits[key]
+
+    def hit(self, key: str, rules: list[RateLimitRule]) -> RateLimitDecision:
+        now = time.time()
+        self._evict(now)
+
+        widest_window = max(rule.window_seconds for rule in rules)
+        hits = [h for h in self._hits.get(key, []) if h > now - widest_window]
+        decision = _decide_rate_limit(hits, rules, now)
+        if decision.allowed:
+            hits.append(now)
+
+        if hits:
+            expires_at = max(hits) + widest_window
+            self._hits[key] = hits
+            self._expires_at[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._evict(now)
+        return decision
+
+    def release(self, key: str):
+        hits = self._hits.get(key)
+        if hits:
+            hits.pop()
+
+    def size(self) -> int:
+        return len(self._hits)
+
+
+class PostgresRateLimiter(RateLimiter):
+    """
+    Keeps the sliding log in one row per key so limits survive restarts and are
+    shared by every replica. The conditional upsert makes check-and-record atomic.
+    """
+
+    _CLEANUP_EVERY = 500
+
+    def __init__(self):
+        self._table_ready = False
+        self._hits_since_cleanup = 0
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_hits (
+                bucket_key TEXT PRIMARY KEY,
+                hits DOUBLE PRECISION[] NOT NULL,
+                expires_at DOUBLE PRECISION NOT NULL
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS rate_limit_hits_expires_at_idx ON rate_limit_hits (expires_at)")
+        self._table_ready = True
+
+    def hit(self, key: str, rules: list[RateLimitRule]) -> RateLimitDecision:
+        now = time.time()
+        widest_window = max(rule.window_seconds for rule in rules)
+        quota_conditions = " AND ".join(
+            "(SELECT count(*) FROM unnest(rate_limit_hits.hits) AS h WHERE h > %s) < %s"
+            for _ in rules
+        )
+        quota_params = [value for rule in rules for value in (now - rule.window_seconds, rule.limit)]
+
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    f"""
+                    INSERT INTO rate_limit_hits (bucket_key, hits, expires_at)
+                    VALUES (%s, ARRAY[%s]::DOUBLE PRECISION[], %s)
+                    ON CONFLICT (bucket_key) DO UPDATE
+                    SET hits = ARRAY(
+                            SELECT h FROM unnest(rate_limit_hits.hits) AS h WHERE h > %s
+                        ) || %s::DOUBLE PRECISION,
+                        expires_at = EXCLUDED.expires_at
+                    WHERE {quota_conditions}
+                    RETURNING hits
+                    """,
+                    [key, now, now + widest_window, now - widest_window, now, *quota_params],
+                )
+                row = cur.fetchone()
+                if row:
+                    previous_hits = list(row[0])[:-1]
+                else:
+                    cur.execute("SELECT hits FROM rate_limit_hits WHERE bucket_key = %s", (key,))
+                    existing = cur.fetchone()
+                    previous_hits = list(existing[0]) if existing else []
+
+                self._hits_since_cleanup += 1
+                if self._hits_since_cleanup >= self._CLEANUP_EVERY:
+                    self._hits_since_cleanup = 0
+                    cur.execute("DELETE FROM rate_limit_hits WHERE expires_at < %s", (now,))
+
+        decision = _decide_rate_limit(previous_hits, rules, now)
+        if row is None and decision.allowed:
+            # Another process consumed the last slot between our upsert and read.
+            return RateLimitDecision(False, 1.0, 0, decision.rule)
+        return decision
+
+    def release(self, key: str):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    "UPDATE rate_limit_hits SET hits = hits[1:array_length(hits, 1) - 1] WHERE bucket_key = %s",
+                    (key,),
+                )
+
+    def size(self) -> int:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute("SELECT count(*) FROM rate_limit_hits WHERE expires_at >= %s", (time.time(),))
+                return int(cur.fetchone()[0])
+
+
+def create_rate_limiter() -> RateLimiter:
+    if RATE_LIMIT_BACKEND == "postgres":
+        if DATABASE_URL:
+            return PostgresRateLimiter()
+        print("Warning: RATE_LIMIT_BACKEND=postgres requires DATABASE_URL. Using in-memory rate limits.")
+    return InMemoryRateLimiter(max_keys=RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = create_rate_limiter()
+
+
+async def check_rate_limit(key: str, rules: list[RateLimitRule]) -> RateLimitDecision:
+    try:
+        with trace_span("rate_limit"):
+            if isinstance(rate_limiter, PostgresRateLimiter):
+                # Connects to the database; keep it off the event loop.
+                return await asyncio.to_thread(rate_limiter.hit, key, rules)
+            return rate_limiter.hit(key, rules)
+    except Exception as e:
+        # Never block staff because the limiter's database is unreachable.
+        print(f"Warning: rate limiter failed for {key}. Error: {e}")
+        return RateLimitDecision(True, 0.0, 0, rules[0])
+
+
+async def release_rate_limit(key: str):
+    """Refunds an attempt whose action never happened, e.g. an SSU that could not be posted."""
+    try:
+        if isinstance(rate_limiter, PostgresRateLimiter):
+            await asyncio.to_thread(rate_limiter.release, key)
+        else:
+            rate_limiter.release(key)
+    except Exception as e:
+        print(f"Warning: failed to release rate limit for {key}. Error: {e}")
+
+
+RANK_RATE_LIMIT_RULES = [
+    RateLimitRule(limit=1, window_seconds=RANK_MIN_INTERVAL_SECONDS),
+    RateLimitRule(limit=RANK_RATE_LIMIT, window_seconds=RANK_RATE_LIMIT_WINDOW_SECONDS),
+]
+# Guild-wide, shared by /ssu and scheduled SSUs.
+SSU_RATE_LIMIT_RULES = [RateLimitRule(limit=1, window_seconds=SSU_COOLDOWN_SECONDS)]
+
 # --- BOT EVENTS ---
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user.name}')
-    load_motion_state()
+    resolve_home_guild_id()
+    try:
+        load_guild_configs()
+    except Exception as e:
+        print(f"Warning: failed to load guild configs; using defaults. Error: {e}")
+    for guild in bot.guilds:
+        load_motion_state(guild.id)
+        rebuild_stage_voter_cache(guild)
+    try:
+        load_roblox_links()
+    except Exception as e:
+        print(f"Warning: failed to load Roblox account links. Error: {e}")
     register_motion_views()
     restore_motion_timers()
+    start_scheduler()
+    start_outbox_dispatcher()
+    start_role_sync()
+    if REPLICA_MODE:
+        await start_replica_mode()
+    await start_metrics_server()
+    start_loop_watchdog()
     try:
         synced = await bot.tree.sync()
         print(f"Synced {len(synced)} command(s)")
     except Exception as e:
         print(f"Failed to sync commands: {e}")
 
+@bot.listen("on_guild_join")
+async def load_joined_guild(guild: discord.Guild):
+    """A guild added after startup gets its config and motion partition right away."""
+    refresh_guild_config(guild.id)
+    load_motion_state(guild.id)
+    rebuild_stage_voter_cache(guild)
+
+@bot.listen("on_member_update")
+async def invalidate_permissions_on_role_change(before: discord.Member, after: discord.Member):
+    if before.roles != after.roles:
+        invalidate_permission_profile(after.guild.id, after.id)
+
+
+@bot.listen("on_member_remove")
+async def invalidate_permissions_on_leave(member: discord.Member):
+    invalidate_permission_profile(member.guild.id, member.id)
+
+
+@bot.listen("on_guild_role_delete")
+async def invalidate_permissions_on_role_delete(role: discord.Role):
+    invalidate_permission_profile(role.guild.id)
+
+@bot.listen("on_raw_message_edit")
+async def evict_edited_linked_message(payload: discord.RawMessageUpdateEvent):
+    evict_linked_message(payload.message_id)
+
+
+@bot.listen("on_raw_message_delete")
+async def evict_deleted_linked_message(payload: discord.RawMessageDeleteEvent):
+    evict_linked_message(payload.message_id)
+
+
+@bot.listen("on_raw_bulk_message_delete")
+async def evict_bulk_deleted_linked_messages(payload: discord.RawBulkMessageDeleteEvent):
+    for message_id in payload.message_ids:
+        evict_linked_message(message_id)
+
 # --- MODALS (FORMS) ---
 class EditAnnouncementModal(discord.ui.Modal):
     def __init__(self, message: discord.Message, original_embed: discord.Embed, **kwargs):
@@ -329,6 +1757,11 @@ class EditAnnouncementModal(discord.ui.Modal):
         self.add_item(self.title_input)
         self.add_item(self.message_input)
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await claim_interaction(interaction)
+
+    @timed(INTERACTION_SECONDS, kind="modal", name="announce_edit")
+    @traced("announce_edit")
     async def on_submit(self, interaction: discord.Interaction):
         existing_color = self.original_embed.color or discord.Color.default()
         embed_color = get_discord_color(self.kwargs.get('color')) if self.kwargs.get('color') else existing_color
@@ -389,14 +1822,132 @@ class EditAnnouncementModal(discord.ui.Modal):
         view = create_button_view(buttons_list)
 
         try:
-            await self.message.edit(embed=new_embed, view=view)
+            cache_linked_message(await self.message.edit(embed=new_embed, view=view))
             await interaction.response.send_message("Announcement has been updated!", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"Failed to edit the announcement: {e}", ephemeral=True)
 
 # --- APPLICATION & NOTIFICATION COMMANDS ---
+NOTIFICATION_TYPE_CHOICES = [
+    app_commands.Choice(name="Class-E", value="Class-E"),
+    app_commands.Choice(name="Blacklist", value="Blacklist"),
+]
+NOTIFIER_DEPARTMENT_CHOICES = [app_commands.Choice(name="IA", value="IA"), app_commands.Choice(name="EC", value="EC")]
+APPEAL_SERVER_LINKS = {
+    "IA": ("IA Server", "https://discord.gg/rQwMDFbfEg"),
+    "EC": ("EC Server", "https://discord.gg/pAWjndT9jF"),
+}
+
+
+def build_notification_embed(
+    type_name: str,
+    reason: str,
+    duration: str,
+    trello_card: str | None,
+    appealable: bool,
+    notifier_department: app_commands.Choice[str],
+) -> tuple[discord.Embed, discord.ui.View | None]:
+    embed = discord.Embed(title=f"Notification of {type_name}", color=discord.Color.orange(), timestamp=datetime.now(UTC))
+    embed.add_field(name="Reason", value=reason, inline=False)
+    embed.add_field(name="Duration", value=duration, inline=False)
+    if trello_card:
+        embed.add_field(name="Trello Card", value=f"[View Card]({trello_card})", inline=False)
+
+    if not appealable:
+        embed.add_field(name="Appeals", value="This decision is **unappealable**.", inline=False)
+        return embed, None
+
+    appeal_text = f"You must appeal to **{notifier_department.name}** as you were disciplined by **{notifier_department.name}**."
+    embed.add_field(name="Appeals", value=appeal_text, inline=False)
+    view = discord.ui.View()
+    if notifier_department.value in APPEAL_SERVER_LINKS:
+        label, url = APPEAL_SERVER_LINKS[notifier_department.value]
+        view.add_item(discord.ui.Button(label=label, style=discord.ButtonStyle.link, url=url))
+    return embed, view
+
+
+async def dispatch_direct_messages(members: list[discord.Member], on_progress=None, **send_kwargs) -> dict[str, list]:
+    """
+    Sends the same DM to many members. At most NOTIFY_BULK_CONCURRENCY sends are
+    in flight and sends start at least NOTIFY_BULK_DM_INTERVAL_SECONDS apart;
+    a 429 that outlives discord.py's own retries pushes the whole wave back.
+    """
+    results: dict[str, list] = {"sent": [], "forbidden": [], "failed": []}
+    semaphore = asyncio.Semaphore(NOTIFY_BULK_CONCURRENCY)
+    pacing_lock = asyncio.Lock()
+    next_send_at = 0.0
+
+    async def wait_for_slot(backoff: float = 0.0):
+        nonlocal next_send_at
+        async with pacing_lock:
+            now = time.monotonic()
+            send_at = max(now, next_send_at) + backoff
+            next_send_at = send_at + NOTIFY_BULK_DM_INTERVAL_SECONDS
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def deliver(member: discord.Member):
+        async with semaphore:
+            backoff = 0.0
+            for attempt in range(1, NOTIFY_BULK_MAX_ATTEMPTS + 1):
+                await wait_for_slot(backoff)
+                try:
+                    await member.send(**send_kwargs)
+                    results["sent"].append(member)
+                    break
+                except discord.Forbidden:
+                    results["forbidden"].append(member)
+                    break
+                except discord.HTTPException as e:
+                    if e.status == 429 and attempt < NOTIFY_BULK_MAX_ATTEMPTS:
+                        backoff = NOTIFY_BULK_DM_INTERVAL_SECONDS * 5 * attempt
+                        continue
+                    results["failed"].append((member, str(e)))
+                    break
+        if on_progress:
+            await on_progress(results)
+
+    await asyncio.gather(*(deliver(member) for member in members))
+    return results
+
+
+async def resolve_notify_targets(guild: discord.Guild, targets: str) -> tuple[list[discord.Member], list[str]]:
+    """
+    Parses user mentions, role mentions and raw IDs. Role members come from the
+    member cache, so roles only expand fully when the members intent is on.
+    """
+    members: dict[int, discord.Member] = {}
+    unresolved = []
+    role_ids = {int(role_id) for role_id in re.findall(r"<@&(\d+)>", targets)}
+    user_ids = [int(user_id) for user_id in re.findall(r"\d{15,20}", re.sub(r"<@&\d+>", "", targets))]
+
+    for role_id in role_ids:
+        role = guild.get_role(role_id)
+        if role is None:
+            unresolved.append(f"<@&{role_id}>")
+            continue
+        if not role.members:
+            unresolved.append(f"{role.mention} (no cached members)")
+        for member in role.members:
+            members.setdefault(member.id, member)
+
+    for user_id in dict.fromkeys(user_ids):
+        if user_id in members:
+            continue
+        member = await resolve_member(guild, user_id)
+        if member is None:
+            unresolved.append(f"`{user_id}`")
+        elif not member.bot:
+            members[user_id] = member
+    return list(members.values()), unresolved
+
+
+def _format_member_list(members: list, limit: int = 900) -> str:
+    text = ", ".join(member.mention for member in members)
+    return text if len(text) <= limit else text[: limit - 1].rsplit(",", 1)[0] + ", …"
+
 @bot.tree.command(name="notify", description="Sends a Class-E or Blacklist notification to a user.")
-@has_any_role(NOTIFY_AND_APP_ROLES)
+@has_permission("can_notify")
 @app_commands.describe(
     user="The user to notify.",
     type="The type of notification.",
@@ -406,10 +1957,7 @@ class EditAnnouncementModal(discord.ui.Modal):
     appealable="Whether the user can appeal this action.",
     notifier_department="The department issuing the notification."
 )
-@app_commands.choices(
-    type=[app_commands.Choice(name="Class-E", value="Class-E"), app_commands.Choice(name="Blacklist", value="Blacklist")],
-    notifier_department=[app_commands.Choice(name="IA", value="IA"), app_commands.Choice(name="EC", value="EC")]
-)
+@app_commands.choices(type=NOTIFICATION_TYPE_CHOICES, notifier_department=NOTIFIER_DEPARTMENT_CHOICES)
 async def notify(
     interaction: discord.Interaction,
     user: discord.Member,
@@ -420,60 +1968,132 @@ async def notify(
     appealable: bool,
     notifier_department: app_commands.Choice[str]
 ):
-    embed = discord.Embed(title=f"Notification of {type.name}", color=discord.Color.orange(), timestamp=datetime.now(UTC))
-    embed.add_field(name="Reason", value=reason, inline=False)
-    embed.add_field(name="Duration", value=duration, inline=False)
-    embed.add_field(name="Trello Card", value=f"[View Card]({trello_card})", inline=False)
-
-    view = discord.ui.View()
-    if appealable:
-        appeal_text = f"You must appeal to **{notifier_department.name}** as you were disciplined by **{notifier_department.name}**."
-        embed.add_field(name="Appeals", value=appeal_text, inline=False)
-        if notifier_department.value == "IA":
-            view.add_item(discord.ui.Button(label="IA Server", style=discord.ButtonStyle.link, url="https://discord.gg/rQwMDFbfEg"))
-        elif notifier_department.value == "EC":
-            view.add_item(discord.ui.Button(label="EC Server", style=discord.ButtonStyle.link, url="https://discord.gg/pAWjndT9jF"))
-    else:
-        embed.add_field(name="Appeals", value="This decision is **unappealable**.", inline=False)
+    embed, view = build_notification_embed(type.name, reason, duration, trello_card, appealable, notifier_department)
 
     try:
-        await user.send(embed=embed, view=view if appealable else None)
+        await user.send(embed=embed, view=view)
         await interaction.response.send_message(f"✅ Successfully sent a {type.name} notification to {user.mention}.", ephemeral=True)
     except discord.Forbidden:
         await interaction.response.send_message(f"⚠️ Could not send a DM to {user.mention}. Their DMs are likely closed.", ephemeral=True)
     except Exception as e:
         await interaction.response.send_message(f"An error occurred: {e}", ephemeral=True)
 
+@bot.tree.command(name="notify_bulk", description="Sends the same Class-E or Blacklist notification to many users.")
+@has_permission("can_notify")
+@app_commands.describe(
+    targets="User mentions, user IDs and/or role mentions, separated by spaces.",
+    type="The type of notification.",
+    reason="The reason for this action.",
+    duration="The duration of this action.",
+    appealable="Whether the users can appeal this action.",
+    notifier_department="The department issuing the notification.",
+    trello_card="Optional link to a shared Trello card.",
+)
+@app_commands.choices(type=NOTIFICATION_TYPE_CHOICES, notifier_department=NOTIFIER_DEPARTMENT_CHOICES)
+async def notify_bulk(
+    interaction: discord.Interaction,
+    targets: str,
+    type: app_commands.Choice[str],
+    reason: str,
+    duration: str,
+    appealable: bool,
+    notifier_department: app_commands.Choice[str],
+    trello_card: str | None = None,
+):
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    members, unresolved = await resolve_notify_targets(interaction.guild, targets)
+    if not members:
+        await interaction.followup.send("No users to notify were found in that list.", ephemeral=True)
+        return
+    if len(members) > NOTIFY_BULK_MAX_TARGETS:
+        await interaction.followup.send(
+            f"That resolves to {len(members)} users; the limit is {NOTIFY_BULK_MAX_TARGETS} per run.", ephemeral=True
+        )
+        return
+    estimated_seconds = len(members) * NOTIFY_BULK_DM_INTERVAL_SECONDS
+    if estimated_seconds > NOTIFY_BULK_MAX_RUN_SECONDS:
+        max_targets = int(NOTIFY_BULK_MAX_RUN_SECONDS // NOTIFY_BULK_DM_INTERVAL_SECONDS)
+        await interaction.followup.send(
+            f"That resolves to {len(members)} users, which would take about {timedelta(seconds=int(estimated_seconds))} "
+            f"to send; split it into runs of at most {max_targets} users.",
+            ephemeral=True,
+        )
+        return
+
+    embed, view = build_notification_embed(type.name, reason, duration, trello_card, appealable, notifier_department)
+    progress_message = await interaction.followup.send(
+        f"Sending {type.name} notifications: 0/{len(members)}…", ephemeral=True, wait=True
+    )
+    last_progress_edit = time.monotonic()
+
+    async def report_progress(results: dict[str, list]):
+        nonlocal last_progress_edit
+        done = sum(len(entries) for entries in results.values())
+        if done == len(members) or time.monotonic() - last_progress_edit < NOTIFY_BULK_PROGRESS_SECONDS:
+            return
+        last_progress_edit = time.monotonic()
+        try:
+            await progress_message.edit(content=f"Sending {type.name} notifications: {done}/{len(members)}…")
+        except discord.HTTPException:
+            pass
+
+    results = await dispatch_direct_messages(members, on_progress=report_progress, embed=embed, view=view)
+
+    lines = [f"✅ Sent {len(results['sent'])}/{len(members)} {type.name} notifications."]
+    if results["forbidden"]:
+        lines.append(f"⚠️ DMs closed ({len(results['forbidden'])}): {_format_member_list(results['forbidden'])}")
+    if results["failed"]:
+        lines.append(
+            f"❌ Failed ({len(results['failed'])}): {_format_member_list([member for member, _ in results['failed']])}"
+        )
+    if unresolved:
+        lines.append(f"❔ Not resolved: {', '.join(unresolved)[:300]}")
+    try:
+        await progress_message.edit(content="\n".join(lines))
+    except discord.HTTPException:
+        # The interaction token expired (429 backoffs ran long); the summary goes to the sender instead.
+        try:
+            await interaction.user.send(content="\n".join(lines), allowed_mentions=discord.AllowedMentions.none())
+        except discord.HTTPException as e:
+            print(f"Warning: failed to deliver the notify_bulk summary. Error: {e}")
+
+def detect_application_level(channel_name: str) -> str:
+    """Application level prefix ("Level-2 ") from the channel name, or "" when it is not one."""
+    lowered = channel_name.lower()
+    for level in ("level-1", "level-2", "level-3"):
+        if level in lowered:
+            return f"Level-{level[-1]} "
+    return ""
+
+
+@traced("process_application")
 async def process_application(interaction: discord.Interaction, message_link: str, applicant: discord.Member, accepted: bool, details: str):
-    results_channel = bot.get_channel(APPLICATION_RESULTS_CHANNEL_ID)
+    results_channel = bot.get_channel(get_guild_config(interaction.guild_id).application_results_channel_id)
     if not results_channel:
         return await interaction.response.send_message("Error: Application results channel not found.", ephemeral=True)
 
-    match = re.match(r"https://discord.com/channels/\d+/(\d+)/(\d+)", message_link)
-    if not match:
+    link = parse_message_link(message_link)
+    if not link:
         return await interaction.response.send_message("Invalid message link format.", ephemeral=True)
 
-    channel_id, message_id = map(int, match.groups())
+    channel_id, message_id = link
 
     try:
-        channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
-        message = await channel.fetch_message(message_id)
+        message = await fetch_linked_message(channel_id, message_id)
     except (discord.NotFound, discord.Forbidden):
         return await interaction.response.send_message("Could not find the application message. Please check the link.", ephemeral=True)
+    channel = message.channel
 
     reaction = "✅" if accepted else "❌"
     try:
         await message.add_reaction(reaction)
+    except discord.NotFound:
+        evict_linked_message(message_id)
+        return await interaction.response.send_message("Could not find the application message. Please check the link.", ephemeral=True)
     except discord.Forbidden:
         print(f"Could not add reaction to message {message_id}. Missing permissions.")
 
-    app_level = ""
-    if "level-1" in channel.name.lower():
-        app_level = "Level-1 "
-    elif "level-2" in channel.name.lower():
-        app_level = "Level-2 "
-    elif "level-3" in channel.name.lower():
-        app_level = "Level-3 "
+    app_level = detect_application_level(channel.name)
 
     status = "Accepted" if accepted else "Denied"
     color = discord.Color.green() if accepted else discord.Color.red()
@@ -487,55 +2107,261 @@ async def process_application(interaction: discord.Interaction, message_link: st
     embed.add_field(name="Reason", value=details, inline=False)
     embed.set_footer(text=f"Processed by {interaction.user.display_name}")
 
-    allowed_mentions = discord.AllowedMentions(users=[applicant]) if accepted else None
-    content = applicant.mention if accepted else None
-    await results_channel.send(content=content, embed=embed, allowed_mentions=allowed_mentions)
+    await enqueue_outbound_message(
+        results_channel.id,
+        "application_result",
+        content=applicant.mention if accepted else None,
+        embeds=[embed],
+        mention_user_ids=[applicant.id] if accepted else (),
+    )
     await interaction.response.send_message(f"Application for {applicant.mention} has been processed.", ephemeral=True)
 
 applications_group = app_commands.Group(name="applications", description="Manage application results.")
 
 @applications_group.command(name="accept", description="Accept a user's application and log the result.")
-@has_any_role(NOTIFY_AND_APP_ROLES)
+@has_permission("can_notify")
 @app_commands.describe(message_link="Link to the application message.", applicant="The user who applied.", reason="Optional reason for acceptance.")
 async def applications_accept(interaction: discord.Interaction, message_link: str, applicant: discord.Member, reason: str = "Not provided."):
     await process_application(interaction, message_link, applicant, accepted=True, details=reason)
 
 @applications_group.command(name="reject", description="Reject a user's application and log the result.")
-@has_any_role(NOTIFY_AND_APP_ROLES)
+@has_permission("can_notify")
 @app_commands.describe(message_link="Link to the application message.", applicant="The user who applied.", reason="Optional reason for rejection.")
 async def applications_reject(interaction: discord.Interaction, message_link: str, applicant: discord.Member, reason: str = "Not provided."):
     await process_application(interaction, message_link, applicant, accepted=False, details=reason)
 
-# --- CORE BOT COMMANDS ---
-@bot.tree.command(name="ssu", description="Announce a Server Start Up (SSU).")
-@app_commands.checks.cooldown(1, 600, key=lambda i: i.guild_id)
-@has_any_role(SSU_ALLOWED_ROLES)
-async def ssu(interaction: discord.Interaction):
-    ssu_channel = bot.get_channel(SSU_CHANNEL_ID)
-    if not ssu_channel:
-        return await interaction.response.send_message("Error: SSU channel not found.", ephemeral=True)
 
-    view = discord.ui.View()
-    view.add_item(discord.ui.Button(label="Join Game", style=discord.ButtonStyle.link, url=GAME_LINK))
+async def find_application_messages(channel: discord.abc.Messageable, applicant_ids: set[int], scan_limit: int) -> dict[int, discord.Message]:
+    """
+    Each applicant's application: the oldest message they wrote within the
+    scanned window (later chat lines are replies, not the application). Only
+    when they wrote nothing, the oldest form-bot post mentioning them counts;
+    mentions by members, such as reviewers, never do. One pass over the
+    channel history, fetched 100 messages per request.
+    """
+    authored: dict[int, discord.Message] = {}
+    bot_posts: dict[int, discord.Message] = {}
+    # History comes newest first, so the last match seen is the oldest.
+    async for message in channel.history(limit=scan_limit):
+        if message.author.id in applicant_ids:
+            authored[message.author.id] = message
+        elif message.author.bot:
+            for user in message.mentions:
+                if user.id in applicant_ids:
+                    bot_posts[user.id] = message
+    return {**bot_posts, **authored}
+
+
+async def add_reactions_concurrently(messages: list[tuple[discord.Message, str]]) -> int:
+    """Adds reactions with a bounded number in flight; returns how many failed."""
+    semaphore = asyncio.Semaphore(APPLICATION_BATCH_REACTION_CONCURRENCY)
+    failures = 0
+
+    async def react(message: discord.Message, emoji: str):
+        nonlocal failures
+        async with semaphore:
+            try:
+                await message.add_reaction(emoji)
+            except discord.HTTPException as e:
+                failures += 1
+                print(f"Could not add reaction to message {message.id}. Error: {e}")
+
+    await asyncio.gather(*(react(message, emoji) for message, emoji in messages))
+    return failures
+
+
+def build_grouped_result_embeds(title: str, mentions: list[str], color: discord.Color, reason: str, footer: str) -> list[discord.Embed]:
+    """Splits a list of applicants over as few embeds as the description limit allows."""
+    embeds = []
+    lines: list[str] = []
+    length = 0
+    for mention in mentions:
+        line = f"• {mention}"
+        if lines and length + len(line) + 1 > 4000:
+            embeds.append(lines)
+            lines, length = [], 0
+        lines.append(line)
+        length += len(line) + 1
+    if lines:
+        embeds.append(lines)
+
+    result = []
+    for index, chunk in enumerate(embeds, start=1):
+        suffix = f" ({index}/{len(embeds)})" if len(embeds) > 1 else ""
+        embed = discord.Embed(title=f"{title}{suffix}", description="\n".join(chunk), color=color, timestamp=datetime.now(UTC))
+        embed.add_field(name="Reason", value=reason[:1024], inline=False)
+        embed.set_footer(text=footer)
+        result.append(embed)
+    return result
+
+
+def chunk_mentions(user_ids: list[int], limit: int = 2000) -> list[list[int]]:
+    """Splits user IDs so each chunk's space-separated mentions fit in one message."""
+    chunks: list[list[int]] = [[]]
+    length = 0
+    for user_id in user_ids:
+        mention_length = len(f"<@{user_id}>") + (1 if chunks[-1] else 0)
+        if chunks[-1] and length + mention_length > limit:
+            chunks.append([])
+            length, mention_length = 0, mention_length - 1
+        chunks[-1].append(user_id)
+        length += mention_length
+    return chunks
+
+
+async def enqueue_embeds_in_batches(channel_id: int, kind: str, embeds: list[discord.Embed], content: str | None = None,
+                                    mention_user_ids=()):
+    """Packs embeds into outbox messages of at most 10 embeds and 6000 characters."""
+    batch: list[discord.Embed] = []
+    batch_length = 0
+    for embed in embeds:
+        if batch and (len(batch) == 10 or batch_length + len(embed) > 6000):
+            await enqueue_outbound_message(channel_id, kind, content=content, embeds=batch, mention_user_ids=mention_user_ids)
+            content = None
+            batch, batch_length = [], 0
+        batch.append(embed)
+        batch_length += len(embed)
+    if batch:
+        await enqueue_outbound_message(channel_id, kind, content=content, embeds=batch, mention_user_ids=mention_user_ids)
+
+
+@applications_group.command(name="batch", description="Accept and/or reject many applicants from one application channel.")
+@has_permission("can_notify")
+@app_commands.describe(
+    channel="The level-1/2/3 application channel to scan.",
+    accepted="Mentions or IDs of applicants to accept.",
+    rejected="Mentions or IDs of applicants to reject.",
+    reason="Reason shown on the results (shared by everyone in this batch).",
+)
+async def applications_batch(
+    interaction: discord.Interaction,
+    channel: discord.TextChannel,
+    accepted: str | None = None,
+    rejected: str | None = None,
+    reason: str = "Not provided.",
+):
+    app_level = detect_application_level(channel.name)
+    if not app_level:
+        await interaction.response.send_message("That is not a level-1/2/3 application channel.", ephemeral=True)
+        return
+
+    accepted_ids = list(dict.fromkeys(int(user_id) for user_id in re.findall(r"\d{15,20}", accepted or "")))
+    rejected_ids = [user_id for user_id in dict.fromkeys(int(user_id) for user_id in re.findall(r"\d{15,20}", rejected or ""))
+                    if user_id not in accepted_ids]
+    if not accepted_ids and not rejected_ids:
+        await interaction.response.send_message("List at least one applicant to accept or reject.", ephemeral=True)
+        return
+    if len(accepted_ids) + len(rejected_ids) > APPLICATION_BATCH_MAX_APPLICANTS:
+        await interaction.response.send_message(
+            f"A batch can hold at most {APPLICATION_BATCH_MAX_APPLICANTS} applicants.", ephemeral=True
+        )
+        return
+
+    results_channel = bot.get_channel(get_guild_config(interaction.guild_id).application_results_channel_id)
+    if not results_channel:
+        await interaction.response.send_message("Error: Application results channel not found.", ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        messages = await find_application_messages(channel, set(accepted_ids) | set(rejected_ids), APPLICATION_BATCH_SCAN_LIMIT)
+    except discord.Forbidden:
+        await interaction.followup.send(f"I cannot read the history of {channel.mention}.", ephemeral=True)
+        return
+
+    accepted_found = [user_id for user_id in accepted_ids if user_id in messages]
+    rejected_found = [user_id for user_id in rejected_ids if user_id in messages]
+    missing = [user_id for user_id in accepted_ids + rejected_ids if user_id not in messages]
 
+    reaction_failures = await add_reactions_concurrently(
+        [(messages[user_id], "✅") for user_id in accepted_found] + [(messages[user_id], "❌") for user_id in rejected_found]
+    )
+
+    footer = f"Processed by {interaction.user.display_name}"
+    if accepted_found:
+        mentions = [f"<@{user_id}>" for user_id in accepted_found]
+        mention_chunks = chunk_mentions(accepted_found)
+        await enqueue_embeds_in_batches(
+            results_channel.id,
+            "application_result",
+            build_grouped_result_embeds(f"{app_level}Applications Accepted", mentions, discord.Color.green(), reason, footer),
+            content=" ".join(f"<@{user_id}>" for user_id in mention_chunks[0]),
+            mention_user_ids=mention_chunks[0],
+        )
+        # Pings that do not fit next to the embeds follow in their own messages.
+        for chunk in mention_chunks[1:]:
+            await enqueue_outbound_message(
+                results_channel.id,
+                "application_result",
+                content=" ".join(f"<@{user_id}>" for user_id in chunk),
+                mention_user_ids=chunk,
+            )
+    if rejected_found:
+        await enqueue_embeds_in_batches(
+            results_channel.id,
+            "application_result",
+            build_grouped_result_embeds(
+                f"{app_level}Applications Denied", [f"<@{user_id}>" for user_id in rejected_found], discord.Color.red(), reason, footer
+            ),
+        )
+
+    lines = [f"Processed {len(accepted_found)} accepted and {len(rejected_found)} denied applications from {channel.mention}."]
+    if missing:
+        lines.append(
+            f"No application found in the last {APPLICATION_BATCH_SCAN_LIMIT} messages for: "
+            + ", ".join(f"<@{user_id}>" for user_id in missing)[:1500]
+        )
+    if reaction_failures:
+        lines.append(f"⚠️ {reaction_failures} reactions could not be added.")
+    await interaction.followup.send("\n".join(lines), ephemeral=True)
+
+# --- CORE BOT COMMANDS ---
+async def queue_ssu_announcement(config: GuildConfig, host_mention: str, host_name: str):
+    """The SSU cooldown is refunded if the announcement is never delivered."""
     embed = discord.Embed(
         title="🚀 Server Start Up (SSU) Hosted!",
-        description=f"A Server Start Up has been started by {interaction.user.mention}. Join us now!",
+        description=f"A Server Start Up has been started by {host_mention}. Join us now!",
         color=discord.Color.green(),
         timestamp=datetime.now(UTC)
     )
-    embed.set_footer(text=f"Hosted by {interaction.user.display_name}")
-
-    await ssu_channel.send(
-        content=f"<@&{SSU_PING_ROLE_ID}>",
-        embed=embed,
-        view=view,
-        allowed_mentions=discord.AllowedMentions(roles=True),
+    embed.set_footer(text=f"Hosted by {host_name}")
+
+    await enqueue_outbound_message(
+        config.ssu_channel_id,
+        "ssu",
+        content=f"<@&{config.ssu_ping_role_id}>",
+        embeds=[embed],
+        mention_roles=True,
+        link_buttons=[{"label": "Join Game", "url": GAME_LINK}],
+        cooldown_key=f"ssu:{config.guild_id}",
     )
-    await interaction.response.send_message("SSU announcement has been sent!", ephemeral=True)
+
+
+@bot.tree.command(name="ssu", description="Announce a Server Start Up (SSU).")
+@has_permission("can_ssu")
+async def ssu(interaction: discord.Interaction):
+    config = get_guild_config(interaction.guild_id)
+    if not bot.get_channel(config.ssu_channel_id):
+        return await interaction.response.send_message("Error: SSU channel not found.", ephemeral=True)
+
+    decision = await check_rate_limit(f"ssu:{interaction.guild_id}", SSU_RATE_LIMIT_RULES)
+    if not decision.allowed:
+        COOLDOWN_REJECTIONS_TOTAL.inc(command="ssu")
+        time_left = str(timedelta(seconds=int(decision.retry_after) + 1))
+        return await interaction.response.send_message(
+            f"This command is on cooldown for everyone. Please try again in **{time_left}**.",
+            ephemeral=True
+        )
+
+    try:
+        await queue_ssu_announcement(config, interaction.user.mention, interaction.user.display_name)
+    except Exception:
+        await release_rate_limit(f"ssu:{interaction.guild_id}")
+        raise
+    await interaction.response.send_message("SSU announcement has been queued and will be posted shortly.", ephemeral=True)
 
 @bot.tree.command(name="announce_edit", description="Edit an existing server announcement.")
-@has_any_role(DD_AND_ABOVE_ROLES)
+@has_permission("can_announce")
 @app_commands.choices(color=COLOR_CHOICES)
 @app_commands.describe(
     message_link="Link to the announcement message.",
@@ -568,26 +2394,17 @@ async def announce_edit(
     remove_thumbnail: bool = False,
     clear_footer: bool = False,
 ):
-    match = re.match(r"https://discord.com/channels/\d+/(\d+)/(\d+)", message_link)
-    if not match:
+    link = parse_message_link(message_link)
+    if not link:
         return await interaction.response.send_message("Invalid message link format.", ephemeral=True)
 
-    channel_id, message_id = map(int, match.groups())
+    channel_id, message_id = link
 
-    if channel_id != ANNOUNCEMENT_CHANNEL_ID:
+    if channel_id != get_guild_config(interaction.guild_id).announcement_channel_id:
         return await interaction.response.send_message("That message is not in the announcement channel.", ephemeral=True)
 
-    announcement_channel = bot.get_channel(channel_id)
-    if not announcement_channel:
-        try:
-            announcement_channel = await bot.fetch_channel(channel_id)
-        except (discord.NotFound, discord.Forbidden):
-            announcement_channel = None
-    if not announcement_channel:
-        return await interaction.response.send_message("Announcement channel could not be found.", ephemeral=True)
-
     try:
-        message = await announcement_channel.fetch_message(message_id)
+        message = await fetch_linked_message(channel_id, message_id)
     except (discord.NotFound, discord.Forbidden):
         return await interaction.response.send_message("Announcement message could not be found.", ephemeral=True)
 
@@ -619,32 +2436,37 @@ async def announce_edit(
     await interaction.response.send_modal(EditAnnouncementModal(message=message, original_embed=original_embed, **modal_kwargs))
 
 # ===================== NEW: /RANK (WORKING) =====================
-@bot.tree.command(name="rank", description="Rank a Roblox user in the group (username or userId).")
-@has_any_role(list(DISCORD_RANK_LIMITS.keys()))
-@app_commands.checks.cooldown(10, 3600, key=lambda i: i.user.id)
+@bot.tree.command(name="rank", description="Rank a Roblox user in the group (username, userId or linked member).")
+@has_permission("can_rank")
 @app_commands.choices(rank=RANK_CHOICES)
 @app_commands.describe(
-    target="Roblox username or userId",
     rank="Rank to assign",
-    reason="Reason for this action (required)"
+    reason="Reason for this action (required)",
+    target="Roblox username or userId",
+    member="Discord member with a linked Roblox account (instead of target)",
 )
-async def rank(interaction: discord.Interaction, target: str, rank: app_commands.Choice[str], reason: str):
-    log_channel = bot.get_channel(RANK_LOG_CHANNEL_ID)
-    max_allowed_value = get_max_allowed_rank_value(interaction.user)
-    now = time.time()
-    last_used = _rank_last_used.get(interaction.user.id, 0)
-    remaining_cooldown = _rank_cooldown_seconds - (now - last_used)
-    if remaining_cooldown > 0:
+async def rank(
+    interaction: discord.Interaction,
+    rank: app_commands.Choice[str],
+    reason: str,
+    target: str | None = None,
+    member: discord.Member | None = None,
+):
+    max_allowed_value = get_permission_profile(interaction.user).max_rank_value
+    decision = await check_rate_limit(f"rank:{interaction.user.id}", RANK_RATE_LIMIT_RULES)
+    if not decision.allowed:
+        COOLDOWN_REJECTIONS_TOTAL.inc(command="rank")
+        window = timedelta(seconds=int(decision.rule.window_seconds))
         await interaction.response.send_message(
-            f"Please wait {int(remaining_cooldown)} more seconds before ranking again.",
+            f"Please wait **{timedelta(seconds=int(decision.retry_after) + 1)}** before ranking again. "
+            f"You have {decision.remaining}/{decision.rule.limit} ranks left in the current {window} window.",
             ephemeral=True
         )
         return
-    _rank_last_used[interaction.user.id] = now
 
     try:
         error_message = None
-        user_id, username = resolve_roblox_user(target)
+        user_id, username = resolve_rank_target(target, member)
         old_role_name = get_current_role_name(user_id)
         current_value = get_role_value(old_role_name)
 
@@ -668,51 +2490,1738 @@ async def rank(interaction: discord.Interaction, target: str, rank: app_commands
         r = roblox_request(
             "PATCH",
             f"https://groups.roblox.com/v1/groups/{ROBLOX_GROUP_ID}/users/{user_id}",
-            json={"roleId": role_id}
+            json={"roleId": role_id},
+            family="rank_change",
         )
 
         if r.status_code != 200:
             raise RuntimeError(format_roblox_error(r.text))
 
-        result = "✅ Success"
-        color = discord.Color.green()
-        response = f"✅ Ranked **{username}** to **{desired_role_name}**."
+        linked = roblox_links_by_roblox.get(user_id)
+        if linked is not None and interaction.guild is not None:
+            enqueue_role_sync(interaction.guild, linked.discord_id, desired_value)
+
+        response = f"✅ Ranked **{username}** to **{desired_role_name}**."
+
+    except Exception as e:
+        error_message = str(e)
+        response = f"❌ {error_message}"
+
+    await record_rank_log(RankLogEntry(
+        entry_id=0,
+        created_at=epoch_now(),
+        executive_id=interaction.user.id,
+        target_name=username if 'username' in locals() else (target or "Unknown"),
+        roblox_id=user_id if 'user_id' in locals() else None,
+        member_id=member.id if member is not None else None,
+        old_rank=old_role_name if 'old_role_name' in locals() else "Unknown",
+        new_rank=rank.value,
+        succeeded=error_message is None,
+        reason=reason,
+        error=error_message,
+        roblox_status=describe_roblox_breakers(),
+        guild_id=interaction.guild_id,
+    ))
+
+    await interaction.response.send_message(response, ephemeral=True)
+
+
+
+# ===================== RANK LOG =====================
+RANK_LOG_ENTRIES_TOTAL = Counter("scpfbot_rank_log_entries_total", "Rank log entries by delivery mode.", ("mode",))
+
+
+@dataclass(slots=True)
+class RankLogEntry:
+    entry_id: int
+    created_at: int  # epoch seconds
+    executive_id: int
+    target_name: str
+    roblox_id: int | None
+    member_id: int | None
+    old_rank: str
+    new_rank: str
+    succeeded: bool
+    reason: str
+    error: str | None = None
+    roblox_status: str | None = None  # non-closed circuit breakers when the entry was logged
+    guild_id: int | None = None  # None on entries logged before multi-guild support (the home guild)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in RANK_LOG_ENTRY_FIELDS}
+
+
+RANK_LOG_ENTRY_FIELDS = tuple(f.name for f in fields(RankLogEntry))
+
+
+class RankLogStore(abc.ABC):
+    @abc.abstractmethod
+    def insert(self, entry: RankLogEntry) -> int:
+        ...
+
+    @abc.abstractmethod
+    def query(
+        self, guild_id: int, target: str | None = None, executive_id: int | None = None, limit: int = 10
+    ) -> list[RankLogEntry]:
+        """Newest first. `target` matches a Roblox userId or a username (case-insensitive)."""
+
+
+class FileRankLogStore(RankLogStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_id: int | None = None  # read from the file once, then counted up
+
+    def _read(self) -> list[RankLogEntry]:
+        if not os.path.exists(RANK_LOG_FILE):
+            return []
+        with open(RANK_LOG_FILE, "r", encoding="utf-8") as f:
+            return [RankLogEntry(**json.loads(line)) for line in f if line.strip()]
+
+    def insert(self, entry: RankLogEntry) -> int:
+        with self._lock:
+            if self._last_id is None:
+                self._last_id = max((existing.entry_id for existing in self._read()), default=0)
+            self._last_id += 1
+            entry.entry_id = self._last_id
+            with open(RANK_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry.to_dict(), separators=(",", ":")) + "\n")
+        return entry.entry_id
+
+    def query(self, guild_id, target=None, executive_id=None, limit=10) -> list[RankLogEntry]:
+        with self._lock:
+            entries = self._read()
+        matches = []
+        for entry in reversed(entries):
+            if (entry.guild_id or HOME_GUILD_ID) != guild_id:
+                continue
+            if executive_id is not None and entry.executive_id != executive_id:
+                continue
+            if target is not None and not (
+                (target.isdigit() and entry.roblox_id == int(target)) or entry.target_name.lower() == target.lower()
+            ):
+                continue
+            matches.append(entry)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+class PostgresRankLogStore(RankLogStore):
+    def __init__(self):
+        self._table_ready = False
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rank_log_entries (
+                entry_id BIGSERIAL PRIMARY KEY,
+                created_at BIGINT NOT NULL,
+                executive_id BIGINT NOT NULL,
+                target_name TEXT NOT NULL,
+                roblox_id BIGINT,
+                member_id BIGINT,
+                old_rank TEXT NOT NULL,
+                new_rank TEXT NOT NULL,
+                succeeded BOOLEAN NOT NULL,
+                reason TEXT NOT NULL,
+                error TEXT
+            )
+            """
+        )
+        cur.execute("ALTER TABLE rank_log_entries ADD COLUMN IF NOT EXISTS roblox_status TEXT")
+        cur.execute("ALTER TABLE rank_log_entries ADD COLUMN IF NOT EXISTS guild_id BIGINT")
+        cur.execute("CREATE INDEX IF NOT EXISTS rank_log_entries_guild_idx ON rank_log_entries (guild_id, entry_id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS rank_log_entries_roblox_idx ON rank_log_entries (roblox_id, entry_id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS rank_log_entries_target_idx ON rank_log_entries (lower(target_name), entry_id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS rank_log_entries_executive_idx ON rank_log_entries (executive_id, entry_id DESC)")
+        self._table_ready = True
+
+    @timed(DATABASE_SECONDS, span="db:insert_rank_log", operation="insert_rank_log")
+    def insert(self, entry: RankLogEntry) -> int:
+        values = entry.to_dict()
+        del values["entry_id"]
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    f"INSERT INTO rank_log_entries ({', '.join(values)}) VALUES ({', '.join(['%s'] * len(values))}) RETURNING entry_id",
+                    tuple(values.values()),
+                )
+                entry.entry_id = cur.fetchone()[0]
+        return entry.entry_id
+
+    @timed(DATABASE_SECONDS, span="db:query_rank_log", operation="query_rank_log")
+    def query(self, guild_id, target=None, executive_id=None, limit=10) -> list[RankLogEntry]:
+        # Entries from before multi-guild support have no guild and belong to the home guild.
+        conditions = ["(guild_id = %s OR guild_id IS NULL)" if guild_id == HOME_GUILD_ID else "guild_id = %s"]
+        params = [guild_id]
+        if target is not None:
+            if target.isdigit():
+                conditions.append("roblox_id = %s")
+                params.append(int(target))
+            else:
+                conditions.append("lower(target_name) = lower(%s)")
+                params.append(target)
+        if executive_id is not None:
+            conditions.append("executive_id = %s")
+            params.append(executive_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    f"SELECT {', '.join(RANK_LOG_ENTRY_FIELDS)} FROM rank_log_entries {where} ORDER BY entry_id DESC LIMIT %s",
+                    (*params, limit),
+                )
+                return [RankLogEntry(*row) for row in cur.fetchall()]
+
+
+def create_rank_log_store() -> RankLogStore:
+    return PostgresRankLogStore() if DATABASE_URL else FileRankLogStore()
+
+
+rank_log_store = create_rank_log_store()
+_rank_log_recent: deque[float] = deque()
+_rank_log_digest_buffers: dict[int, list[RankLogEntry]] = {}  # by rank log channel
+_rank_log_digest_task: asyncio.Task | None = None
+
+Gauge("scpfbot_rank_log_digest_mode", "1 while the rank log is posting digests.", lambda: int(_rank_log_digest_task is not None))
+
+
+def build_rank_log_embed(entry: RankLogEntry) -> discord.Embed:
+    embed = discord.Embed(
+        title="Rank Log",
+        color=discord.Color.green() if entry.succeeded else discord.Color.red(),
+        timestamp=datetime.fromtimestamp(entry.created_at, UTC),
+    )
+    embed.add_field(name="Executive", value=f"<@{entry.executive_id}>", inline=False)
+    target_label = f"{entry.target_name} (<@{entry.member_id}>)" if entry.member_id else entry.target_name
+    embed.add_field(name="Target", value=target_label, inline=False)
+    embed.add_field(name="Old → New", value=f"{entry.old_rank} → {entry.new_rank}", inline=False)
+    embed.add_field(name="Result", value="✅ Success" if entry.succeeded else "❌ Failed", inline=False)
+    embed.add_field(name="Reason", value=entry.reason, inline=False)
+    if entry.error:
+        embed.add_field(name="Error", value=textwrap.shorten(entry.error, width=1024, placeholder="…"), inline=False)
+    if entry.roblox_status:
+        embed.add_field(name="Roblox API", value=_clip(entry.roblox_status, 1024), inline=False)
+    return embed
+
+
+def _clip(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def rank_log_field(entry: RankLogEntry, when_style: str = "T", value_width: int = 200) -> tuple[str, str]:
+    """(name, value) for one entry in a multi-entry embed."""
+    name = f"{'✅' if entry.succeeded else '❌'} {entry.target_name}: {entry.old_rank} → {entry.new_rank}"
+    value = f"<t:{entry.created_at}:{when_style}> by <@{entry.executive_id}>\nReason: {entry.reason}"
+    if entry.error:
+        value += f"\nError: {entry.error}"
+    if entry.roblox_status:
+        value += f"\nRoblox API: {entry.roblox_status}"
+    return _clip(name, 256), _clip(value, value_width)
+
+
+def build_rank_log_digest_embeds(entries: list[RankLogEntry]) -> list[discord.Embed]:
+    """
+    Packs entries into as few embeds as the 25-field and 6000-character embed
+    limits allow; enqueue_embeds_in_batches then packs embeds into messages.
+    """
+    footer = "Full details: /ranklog"
+    chunks: list[list[tuple[str, str, RankLogEntry]]] = [[]]
+    chunk_length = 0
+    for entry in entries:
+        name, value = rank_log_field(entry)
+        if chunks[-1] and (len(chunks[-1]) == 25 or chunk_length + len(name) + len(value) > 5800 - len(footer)):
+            chunks.append([])
+            chunk_length = 0
+        chunks[-1].append((name, value, entry))
+        chunk_length += len(name) + len(value)
+
+    embeds = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        embed = discord.Embed(
+            title=f"Rank Log Digest ({len(chunk)} entries)",
+            color=discord.Color.green() if all(entry.succeeded for _, _, entry in chunk) else discord.Color.orange(),
+            timestamp=datetime.fromtimestamp(chunk[-1][2].created_at, UTC),
+        )
+        for name, value, _ in chunk:
+            embed.add_field(name=name, value=value, inline=False)
+        embed.set_footer(text=footer)
+        embeds.append(embed)
+    return embeds
+
+
+def _rank_log_rate(now: float) -> int:
+    while _rank_log_recent and now - _rank_log_recent[0] > RANK_LOG_DIGEST_WINDOW_SECONDS:
+        _rank_log_recent.popleft()
+    return len(_rank_log_recent)
+
+
+async def flush_rank_log_digest():
+    buffers = dict(_rank_log_digest_buffers)
+    _rank_log_digest_buffers.clear()
+    for channel_id, entries in buffers.items():
+        await enqueue_embeds_in_batches(channel_id, "rank_log", build_rank_log_digest_embeds(entries))
+
+
+async def run_rank_log_digest():
+    global _rank_log_digest_task
+    try:
+        while True:
+            await asyncio.sleep(RANK_LOG_DIGEST_FLUSH_SECONDS)
+            await flush_rank_log_digest()
+            if _rank_log_rate(time.monotonic()) < RANK_LOG_DIGEST_THRESHOLD / 2:
+                print("Rank log traffic is back to normal; posting entries individually.")
+                return
+    finally:
+        _rank_log_digest_task = None
+        await flush_rank_log_digest()
+
+
+async def record_rank_log(entry: RankLogEntry):
+    """
+    Stores the full entry, then posts it on its own or, while the rank rate is
+    above the digest threshold, buffers it for the next digest.
+    """
+    global _rank_log_digest_task
+    try:
+        await asyncio.to_thread(rank_log_store.insert, entry)
+    except Exception as e:
+        print(f"Warning: failed to store rank log entry. Error: {e}")
+
+    now = time.monotonic()
+    _rank_log_recent.append(now)
+    if _rank_log_digest_task is None and _rank_log_rate(now) > RANK_LOG_DIGEST_THRESHOLD:
+        print("Rank log traffic is high; switching to digest posts.")
+        _rank_log_digest_task = create_background_task(run_rank_log_digest())
+
+    channel_id = get_guild_config(entry.guild_id).rank_log_channel_id
+    if not channel_id:
+        return
+    if _rank_log_digest_task is not None:
+        _rank_log_digest_buffers.setdefault(channel_id, []).append(entry)
+        RANK_LOG_ENTRIES_TOTAL.inc(mode="digest")
+    else:
+        await enqueue_outbound_message(channel_id, "rank_log", embeds=[build_rank_log_embed(entry)])
+        RANK_LOG_ENTRIES_TOTAL.inc(mode="single")
+
+
+@bot.tree.command(name="ranklog", description="Look up past rank changes.")
+@has_permission("can_rank")
+@app_commands.describe(
+    target="Roblox username or userId to filter by",
+    executive="Only show ranks performed by this member",
+    limit="How many entries to show (max 25)",
+)
+async def ranklog(
+    interaction: discord.Interaction,
+    target: str | None = None,
+    executive: discord.Member | None = None,
+    limit: app_commands.Range[int, 1, 25] = 10,
+):
+    target = target.strip() if target else None
+    entries = await asyncio.to_thread(
+        rank_log_store.query,
+        interaction.guild_id,
+        target=target,
+        executive_id=executive.id if executive else None,
+        limit=limit,
+    )
+    if not entries:
+        await interaction.response.send_message("No matching rank log entries.", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="Rank Log", color=discord.Color.blurple())
+    for entry in entries:
+        name, value = rank_log_field(entry, when_style="f", value_width=400)
+        if len(embed) + len(name) + len(value) > 5900:
+            break
+        embed.add_field(name=name, value=value, inline=False)
+    embed.set_footer(text=f"Showing the {len(embed.fields)} most recent matching entries")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+# ===================== ROBLOX ACCOUNT LINKS =====================
+@dataclass(frozen=True, slots=True)
+class RobloxLink:
+    discord_id: int
+    roblox_id: int
+    roblox_username: str
+    verified_at: int
+
+
+# Every link is held in memory under both IDs, so lookups never touch Roblox or the database.
+# Usernames are not indexed: they can change hands, so they are always resolved through Roblox.
+roblox_links_by_discord: dict[int, RobloxLink] = {}
+roblox_links_by_roblox: dict[int, RobloxLink] = {}
+_pending_link_verifications: dict[int, dict] = {}
+
+
+def _index_roblox_link(link: RobloxLink):
+    _unindex_roblox_link(link.discord_id)
+    previous_owner = roblox_links_by_roblox.get(link.roblox_id)
+    if previous_owner:
+        _unindex_roblox_link(previous_owner.discord_id)
+    roblox_links_by_discord[link.discord_id] = link
+    roblox_links_by_roblox[link.roblox_id] = link
+
+
+def _unindex_roblox_link(discord_id: int) -> RobloxLink | None:
+    link = roblox_links_by_discord.pop(discord_id, None)
+    if link:
+        roblox_links_by_roblox.pop(link.roblox_id, None)
+    return link
+
+
+def _ensure_roblox_links_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS roblox_links (
+            discord_id BIGINT PRIMARY KEY,
+            roblox_id BIGINT NOT NULL UNIQUE,
+            roblox_username TEXT NOT NULL,
+            verified_at BIGINT NOT NULL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS roblox_links_username_idx ON roblox_links (lower(roblox_username))")
+
+
+def _write_roblox_links_file():
+    with open(ROBLOX_LINKS_FILE, "w", encoding="utf-8") as f:
+        json.dump([[link.discord_id, link.roblox_id, link.roblox_username, link.verified_at]
+                   for link in roblox_links_by_discord.values()], f, separators=(",", ":"))
+
+
+@timed(DATABASE_SECONDS, span="db:load_roblox_links", operation="load_roblox_links")
+def _load_roblox_links_from_database(discord_id: int | None = None) -> list[RobloxLink]:
+    with psycopg2.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            _ensure_roblox_links_table(cur)
+            if discord_id is None:
+                cur.execute("SELECT discord_id, roblox_id, roblox_username, verified_at FROM roblox_links")
+            else:
+                cur.execute(
+                    "SELECT discord_id, roblox_id, roblox_username, verified_at FROM roblox_links WHERE discord_id = %s",
+                    (discord_id,),
+                )
+            return [RobloxLink(*row) for row in cur.fetchall()]
+
+
+def load_roblox_links():
+    roblox_links_by_discord.clear()
+    roblox_links_by_roblox.clear()
+    if DATABASE_URL:
+        links = _load_roblox_links_from_database()
+    elif os.path.exists(ROBLOX_LINKS_FILE):
+        with open(ROBLOX_LINKS_FILE, "r", encoding="utf-8") as f:
+            links = [RobloxLink(*row) for row in json.load(f)]
+    else:
+        links = []
+    for link in links:
+        _index_roblox_link(link)
+    print(f"Loaded {len(links)} Roblox account link(s).")
+
+
+def refresh_roblox_link(discord_id: int):
+    """Re-reads one member's link after another replica changed it."""
+    _unindex_roblox_link(discord_id)
+    for link in _load_roblox_links_from_database(discord_id):
+        _index_roblox_link(link)
+
+
+@timed(DATABASE_SECONDS, span="db:save_roblox_link", operation="save_roblox_link")
+async def save_roblox_link(link: RobloxLink):
+    if DATABASE_URL:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                _ensure_roblox_links_table(cur)
+                # A verified Roblox account moves to whoever proved ownership last.
+                cur.execute("DELETE FROM roblox_links WHERE roblox_id = %s AND discord_id <> %s", (link.roblox_id, link.discord_id))
+                cur.execute(
+                    """
+                    INSERT INTO roblox_links (discord_id, roblox_id, roblox_username, verified_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (discord_id) DO UPDATE SET
+                        roblox_id = EXCLUDED.roblox_id,
+                        roblox_username = EXCLUDED.roblox_username,
+                        verified_at = EXCLUDED.verified_at
+                    """,
+                    (link.discord_id, link.roblox_id, link.roblox_username, link.verified_at),
+                )
+    _index_roblox_link(link)
+    if not DATABASE_URL:
+        _write_roblox_links_file()
+    await publish_replica_event("link", discord_id=link.discord_id)
+
+
+async def delete_roblox_link(discord_id: int) -> RobloxLink | None:
+    if DATABASE_URL:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                _ensure_roblox_links_table(cur)
+                cur.execute("DELETE FROM roblox_links WHERE discord_id = %s", (discord_id,))
+    link = _unindex_roblox_link(discord_id)
+    if not DATABASE_URL:
+        _write_roblox_links_file()
+    await publish_replica_event("link", discord_id=discord_id)
+    return link
+
+
+def resolve_rank_target(target: str | None, member: discord.Member | None) -> tuple[int, str]:
+    """
+    (roblox_id, username) for /rank. Members and linked userIds resolve from
+    the link table; usernames always go to Roblox, since a linked account may
+    have been renamed and its old name taken by someone else.
+    """
+    if member is not None:
+        link = roblox_links_by_discord.get(member.id)
+        if link is None:
+            raise ValueError(f"{member.display_name} has not linked a Roblox account (`/link start`).")
+        return link.roblox_id, link.roblox_username
+
+    target = (target or "").strip()
+    if not target:
+        raise ValueError("Give either a Roblox username/userId or a Discord member.")
+    link = roblox_links_by_roblox.get(int(target)) if target.isdigit() else None
+    if link is not None:
+        return link.roblox_id, link.roblox_username
+    return resolve_roblox_user(target)
+
+
+link_group = app_commands.Group(name="link", description="Link your Discord account to your Roblox account.")
+
+
+@link_group.command(name="start", description="Start linking a Roblox account to your Discord account.")
+@app_commands.describe(roblox_username="Your Roblox username or userId.")
+async def link_start(interaction: discord.Interaction, roblox_username: str):
+    try:
+        roblox_id, username = resolve_roblox_user(roblox_username.strip())
+    except (ValueError, RobloxUnavailableError) as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+
+    now = time.time()
+    for discord_id in [discord_id for discord_id, pending in _pending_link_verifications.items() if pending["expires_at"] < now]:
+        del _pending_link_verifications[discord_id]
+
+    code = f"SCPF-{secrets.token_hex(3).upper()}"
+    _pending_link_verifications[interaction.user.id] = {
+        "roblox_id": roblox_id,
+        "username": username,
+        "code": code,
+        "expires_at": now + LINK_VERIFICATION_TTL_SECONDS,
+    }
+    await interaction.response.send_message(
+        f"To prove you own **{username}**, add this code anywhere in your Roblox profile's About section:\n"
+        f"```{code}```\nThen run `/link verify` within {int(LINK_VERIFICATION_TTL_SECONDS // 60)} minutes. "
+        "You can remove the code afterwards.",
+        ephemeral=True,
+    )
+
+
+@link_group.command(name="verify", description="Finish linking after adding the code to your Roblox profile.")
+async def link_verify(interaction: discord.Interaction):
+    pending = _pending_link_verifications.get(interaction.user.id)
+    if not pending or pending["expires_at"] < time.time():
+        _pending_link_verifications.pop(interaction.user.id, None)
+        await interaction.response.send_message("No link in progress. Start with `/link start`.", ephemeral=True)
+        return
+
+    try:
+        r = roblox_http("users", "GET", f"https://users.roblox.com/v1/users/{pending['roblox_id']}")
+    except RobloxUnavailableError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+    if r.status_code != 200:
+        await interaction.response.send_message("Could not read that Roblox profile. Try again shortly.", ephemeral=True)
+        return
+    profile = r.json()
+    if pending["code"] not in (profile.get("description") or ""):
+        await interaction.response.send_message(
+            f"The code `{pending['code']}` is not in **{pending['username']}**'s About section yet.", ephemeral=True
+        )
+        return
+
+    _pending_link_verifications.pop(interaction.user.id, None)
+    link = RobloxLink(interaction.user.id, pending["roblox_id"], profile.get("name") or pending["username"], epoch_now())
+    await save_roblox_link(link)
+    await interaction.response.send_message(f"✅ Linked to Roblox account **{link.roblox_username}**.", ephemeral=True)
+
+
+@link_group.command(name="status", description="Show which Roblox account a member is linked to.")
+@app_commands.describe(member="Member to look up (defaults to you).")
+async def link_status(interaction: discord.Interaction, member: discord.Member | None = None):
+    member = member or interaction.user
+    link = roblox_links_by_discord.get(member.id)
+    if link is None:
+        await interaction.response.send_message(f"{member.mention} has no linked Roblox account.", ephemeral=True)
+        return
+    await interaction.response.send_message(
+        f"{member.mention} is linked to **{link.roblox_username}** (`{link.roblox_id}`) since <t:{link.verified_at}:D>.",
+        ephemeral=True,
+    )
+
+
+@link_group.command(name="remove", description="Unlink your Roblox account.")
+async def link_remove(interaction: discord.Interaction):
+    link = await delete_roblox_link(interaction.user.id)
+    if link is None:
+        await interaction.response.send_message("You have no linked Roblox account.", ephemeral=True)
+        return
+    await interaction.response.send_message(f"Unlinked **{link.roblox_username}**.", ephemeral=True)
+
+# ===================== ROLE SYNC =====================
+ROLE_SYNC_TOTAL = Counter("scpfbot_role_sync_total", "Member role sync checks by result.", ("result",))
+
+_role_sync_queue: asyncio.Queue | None = None
+_role_sync_pending: dict[tuple[int, int], int | None] = {}
+_role_sync_checked_at: dict[int, float] = {}
+_role_sync_worker_task: asyncio.Task | None = None
+_role_sync_sweep_task: asyncio.Task | None = None
+
+Gauge("scpfbot_role_sync_pending", "Members waiting for a role sync.", lambda: len(_role_sync_pending))
+
+
+def diff_synced_roles(current_role_ids, rank_value: int, config: GuildConfig, guild_role_ids) -> tuple[set[int], set[int]]:
+    """
+    (to_add, to_remove) among the guild's managed roles for a member at
+    `rank_value`. A rank value with no mapped roles changes nothing.
+    """
+    current_role_ids = set(current_role_ids)
+    desired, managed = set(), set()
+    mapped = False
+    for rank_name, role_ids in config.role_sync_roles.items():
+        managed.update(role_ids)
+        if ROBLOX_ROLE_VALUES.get(rank_name) != rank_value or not role_ids:
+            continue
+        mapped = True
+        held = current_role_ids.intersection(role_ids)
+        if held:
+            desired.update(held)
+        else:
+            desired.update(next(([role_id] for role_id in role_ids if role_id in guild_role_ids), []))
+    if not mapped:
+        return set(), set()
+    current = managed & current_role_ids
+    return desired - current, current - desired
+
+
+def enqueue_role_sync(guild: discord.Guild, discord_id: int, rank_value: int | None = None):
+    """
+    Queues one member for the sync worker. A known rank value (e.g. right after
+    /rank) skips the Roblox lookup; repeat requests for a queued member merge.
+    """
+    if not ROLE_SYNC_ENABLED or _role_sync_queue is None:
+        return
+    key = (guild.id, discord_id)
+    if key in _role_sync_pending:
+        if rank_value is not None:
+            _role_sync_pending[key] = rank_value
+        return
+    _role_sync_pending[key] = rank_value
+    _role_sync_queue.put_nowait(key)
+
+
+async def sync_member_roles(guild: discord.Guild, discord_id: int, rank_value: int | None = None) -> str:
+    """Brings one linked member's managed roles in line with their Roblox rank."""
+    _role_sync_checked_at[discord_id] = time.monotonic()
+    link = roblox_links_by_discord.get(discord_id)
+    if link is None:
+        return "unlinked"
+
+    if rank_value is None:
+        role_name = await asyncio.to_thread(get_current_role_name, link.roblox_id)
+        if role_name == "Unknown":
+            # A failed lookup must never strip roles.
+            return "unknown_rank"
+        rank_value = get_role_value(role_name)
+        if rank_value is None:
+            return "unknown_rank"
+
+    member = await resolve_member(guild, discord_id)
+    if member is None:
+        return "not_member"
+
+    to_add, to_remove = diff_synced_roles(
+        (role.id for role in member.roles), rank_value, get_guild_config(guild.id), {role.id for role in guild.roles}
+    )
+    if not to_add and not to_remove:
+        return "unchanged"
+
+    # Only the diff is sent, so role changes made by staff in the meantime are kept.
+    reason = f"Role sync: Roblox rank value {rank_value}"
+    try:
+        if to_remove:
+            await member.remove_roles(*map(discord.Object, to_remove), reason=reason)
+        if to_add:
+            await member.add_roles(*map(discord.Object, to_add), reason=reason)
+    except discord.Forbidden:
+        return "forbidden"
+    invalidate_permission_profile(guild.id, discord_id)
+    return "updated"
+
+
+async def run_role_sync_worker():
+    """Single consumer, so Discord role edits are paced no matter how many callers enqueue."""
+    while True:
+        guild_id, discord_id = await _role_sync_queue.get()
+        rank_value = _role_sync_pending.pop((guild_id, discord_id), None)
+        guild = bot.get_guild(guild_id)
+        result = "not_member"
+        try:
+            if guild is not None:
+                result = await sync_member_roles(guild, discord_id, rank_value)
+        except Exception as e:
+            result = "error"
+            print(f"Warning: role sync failed for {discord_id}. Error: {e}")
+        ROLE_SYNC_TOTAL.inc(result=result)
+        if result in {"updated", "forbidden", "error"}:
+            await asyncio.sleep(ROLE_SYNC_EDIT_INTERVAL_SECONDS)
+
+
+def next_role_sync_batch(now: float) -> list[int]:
+    """The least recently checked linked members that are due, oldest first."""
+    due = (
+        discord_id for discord_id in roblox_links_by_discord
+        if now - _role_sync_checked_at.get(discord_id, float("-inf")) >= ROLE_SYNC_RECHECK_SECONDS
+    )
+    return heapq.nsmallest(ROLE_SYNC_SWEEP_BATCH, due, key=lambda discord_id: _role_sync_checked_at.get(discord_id, float("-inf")))
+
+
+async def run_role_sync_sweep():
+    """
+    Walks the link table a small batch per tick, so thousands of members are
+    covered over a few hours without a burst of Roblox or Discord calls.
+    """
+    while True:
+        await asyncio.sleep(ROLE_SYNC_SWEEP_INTERVAL_SECONDS)
+        if not is_motion_leader() or _role_sync_pending:
+            continue
+        batch = next_role_sync_batch(time.monotonic())
+        for guild in bot.guilds:
+            if not get_guild_config(guild.id).role_sync_roles:
+                continue
+            for discord_id in batch:
+                enqueue_role_sync(guild, discord_id)
+
+
+def start_role_sync():
+    global _role_sync_queue, _role_sync_worker_task, _role_sync_sweep_task
+    if not ROLE_SYNC_ENABLED or (_role_sync_worker_task and not _role_sync_worker_task.done()):
+        return
+    _role_sync_queue = asyncio.Queue()
+    _role_sync_worker_task = asyncio.create_task(run_role_sync_worker())
+    if ROLE_SYNC_SWEEP_INTERVAL_SECONDS > 0:
+        _role_sync_sweep_task = asyncio.create_task(run_role_sync_sweep())
+
+# ===================== OUTBOX =====================
+OUTBOX_MESSAGES_TOTAL = Counter("scpfbot_outbox_messages_total", "Outbox deliveries by kind and result.", ("kind", "result"))
+
+
+@dataclass(slots=True)
+class OutboxEntry:
+    entry_id: int
+    channel_id: int
+    kind: str  # "rank_log", "application_result", "ssu" or "bulletin"
+    payload: dict
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: str | None = None
+    status: str = "pending"  # "pending" or "failed"
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in OUTBOX_ENTRY_FIELDS}
+
+
+OUTBOX_ENTRY_FIELDS = tuple(f.name for f in fields(OutboxEntry))
+
+
+class OutboxStore(abc.ABC):
+    @abc.abstractmethod
+    def enqueue(self, channel_id: int, kind: str, payload: dict) -> int:
+        ...
+
+    @abc.abstractmethod
+    def pending(self, limit: int) -> list[OutboxEntry]:
+        """
+        Up to `limit` pending entries per channel, ordered by channel, then
+        insertion order. Channels whose oldest entry is still backing off are left out.
+        """
+
+    @abc.abstractmethod
+    def mark_sent(self, entry_id: int):
+        ...
+
+    @abc.abstractmethod
+    def mark_retry(self, entry_id: int, attempts: int, next_attempt_at: float, error: str):
+        ...
+
+    @abc.abstractmethod
+    def mark_failed(self, entry_id: int, attempts: int, error: str):
+        ...
+
+    @abc.abstractmethod
+    def counts(self) -> dict[str, int]:
+        ...
+
+
+class FileOutboxStore(OutboxStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        if not os.path.exists(OUTBOX_FILE):
+            return {"next_entry_id": 1, "entries": []}
+        with open(OUTBOX_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, data: dict):
+        with open(OUTBOX_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def _update(self, entry_id: int, **changes):
+        with self._lock:
+            data = self._read()
+            for entry in data["entries"]:
+                if entry["entry_id"] == entry_id:
+                    entry.update(changes)
+            self._write(data)
+
+    def enqueue(self, channel_id, kind, payload) -> int:
+        with self._lock:
+            data = self._read()
+            entry = OutboxEntry(data["next_entry_id"], channel_id, kind, payload, next_attempt_at=time.time())
+            data["next_entry_id"] += 1
+            data["entries"].append(entry.to_dict())
+            self._write(data)
+        return entry.entry_id
+
+    def pending(self, limit) -> list[OutboxEntry]:
+        with self._lock:
+            entries = [OutboxEntry(**entry) for entry in self._read()["entries"] if entry["status"] == "pending"]
+        by_channel: dict[int, list[OutboxEntry]] = {}
+        for entry in sorted(entries, key=lambda entry: (entry.channel_id, entry.entry_id)):
+            by_channel.setdefault(entry.channel_id, []).append(entry)
+        now = time.time()
+        return [
+            entry
+            for channel_entries in by_channel.values() if channel_entries[0].next_attempt_at <= now
+            for entry in channel_entries[:limit]
+        ]
+
+    def mark_sent(self, entry_id):
+        with self._lock:
+            data = self._read()
+            data["entries"] = [entry for entry in data["entries"] if entry["entry_id"] != entry_id]
+            self._write(data)
+
+    def mark_retry(self, entry_id, attempts, next_attempt_at, error):
+        self._update(entry_id, attempts=attempts, next_attempt_at=next_attempt_at, last_error=error)
+
+    def mark_failed(self, entry_id, attempts, error):
+        self._update(entry_id, attempts=attempts, last_error=error, status="failed")
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            entries = self._read()["entries"]
+        return {status: sum(1 for entry in entries if entry["status"] == status) for status in ("pending", "failed")}
+
+
+class PostgresOutboxStore(OutboxStore):
+    def __init__(self):
+        self._table_ready = False
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                entry_id BIGSERIAL PRIMARY KEY,
+                channel_id BIGINT NOT NULL,
+                kind TEXT NOT NULL,
+                payload JSONB NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at DOUBLE PRECISION NOT NULL,
+                last_error TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS outbox_pending_idx ON outbox (channel_id, entry_id) WHERE status = 'pending'")
+        self._table_ready = True
+
+    @timed(DATABASE_SECONDS, span="db:outbox_enqueue", operation="outbox_enqueue")
+    def enqueue(self, channel_id, kind, payload) -> int:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    """
+                    INSERT INTO outbox (channel_id, kind, payload, next_attempt_at)
+                    VALUES (%s, %s, %s::jsonb, %s)
+                    RETURNING entry_id
+                    """,
+                    (channel_id, kind, json.dumps(payload), time.time()),
+                )
+                return cur.fetchone()[0]
+
+    @timed(DATABASE_SECONDS, span="db:outbox_pending", operation="outbox_pending")
+    def pending(self, limit) -> list[OutboxEntry]:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    """
+                    WITH ranked AS (
+                        SELECT entry_id, channel_id, kind, payload, attempts, next_attempt_at, last_error, status,
+                               ROW_NUMBER() OVER (PARTITION BY channel_id ORDER BY entry_id) AS position
+                        FROM outbox WHERE status = 'pending'
+                    )
+                    SELECT entry_id, channel_id, kind, payload, attempts, next_attempt_at, last_error, status
+                    FROM ranked
+                    WHERE position <= %s
+                      AND channel_id IN (SELECT channel_id FROM ranked WHERE position = 1 AND next_attempt_at <= %s)
+                    ORDER BY channel_id, entry_id
+                    """,
+                    (limit, time.time()),
+                )
+                return [OutboxEntry(*row) for row in cur.fetchall()]
+
+    @timed(DATABASE_SECONDS, span="db:outbox_update", operation="outbox_update")
+    def mark_sent(self, entry_id):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM outbox WHERE entry_id = %s", (entry_id,))
+
+    @timed(DATABASE_SECONDS, span="db:outbox_update", operation="outbox_update")
+    def mark_retry(self, entry_id, attempts, next_attempt_at, error):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE outbox SET attempts = %s, next_attempt_at = %s, last_error = %s WHERE entry_id = %s",
+                    (attempts, next_attempt_at, error, entry_id),
+                )
+
+    @timed(DATABASE_SECONDS, span="db:outbox_update", operation="outbox_update")
+    def mark_failed(self, entry_id, attempts, error):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE outbox SET attempts = %s, last_error = %s, status = 'failed' WHERE entry_id = %s",
+                    (attempts, error, entry_id),
+                )
+
+    @timed(DATABASE_SECONDS, span="db:outbox_counts", operation="outbox_counts")
+    def counts(self) -> dict[str, int]:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+                return {"pending": 0, "failed": 0, **dict(cur.fetchall())}
+
+
+def create_outbox_store() -> OutboxStore:
+    return PostgresOutboxStore() if DATABASE_URL else FileOutboxStore()
+
+
+outbox_store = create_outbox_store()
+_outbox_wakeup = asyncio.Event()
+_outbox_task: asyncio.Task | None = None
+_outbox_channel_tasks: dict[int, asyncio.Task] = {}
+_outbox_pending_seen = 0
+# Sent but not yet marked sent (the store was unreachable); never delivered again.
+_outbox_delivered_ids: set[int] = set()
+
+Gauge("scpfbot_outbox_pending", "Outbox entries waiting to be sent at the last poll.", lambda: _outbox_pending_seen)
+
+
+async def enqueue_outbound_message(channel_id: int, kind: str, *, content: str | None = None,
+                                   embeds: list[discord.Embed] = (), mention_user_ids=(), mention_roles: bool = False,
+                                   link_buttons=(), **extra) -> int:
+    """
+    Queues a message for `channel_id` without waiting for Discord; the store
+    write runs off the event loop. Mentions are off unless listed, since the
+    message may go out long after the interaction.
+    """
+    payload = {
+        "content": content,
+        "embeds": [embed.to_dict() for embed in embeds],
+        "mention_user_ids": [int(user_id) for user_id in mention_user_ids],
+        "mention_roles": mention_roles,
+        "link_buttons": list(link_buttons),
+        **extra,
+    }
+    entry_id = await asyncio.to_thread(outbox_store.enqueue, channel_id, kind, payload)
+    if is_motion_leader():
+        _outbox_wakeup.set()
+    else:
+        await publish_replica_event("outbox")
+    return entry_id
+
+
+def _outbox_send_kwargs(payload: dict) -> dict:
+    return {
+        "content": payload.get("content"),
+        "embeds": [discord.Embed.from_dict(embed) for embed in payload.get("embeds", [])],
+        "view": create_button_view(payload.get("link_buttons")),
+        "allowed_mentions": discord.AllowedMentions(
+            everyone=False,
+            users=[discord.Object(user_id) for user_id in payload.get("mention_user_ids", [])],
+            roles=payload.get("mention_roles", False),
+        ),
+    }
+
+
+async def deliver_outbox_entry(entry: OutboxEntry, channel: discord.abc.Messageable):
+    kwargs = _outbox_send_kwargs(entry.payload)
+    if entry.kind == "bulletin":
+        # Later bulletins for a motion edit the message the first one created.
+        # Rows queued before guild partitioning belong to the home guild.
+        guild_id = int(entry.payload.get("guild_id") or HOME_GUILD_ID)
+        motion = get_motion_state(guild_id)["motions"].get(entry.payload.get("motion_id"))
+        if motion and motion.updates_message_id:
+            try:
+                existing_message = await channel.fetch_message(motion.updates_message_id)
+                await existing_message.edit(embeds=kwargs["embeds"])
+                return
+            except discord.NotFound:
+                pass
+        if kwargs["view"] is None:
+            kwargs.pop("view")
+        sent_message = await channel.send(**kwargs)
+        if motion:
+            def record_bulletin_message(state: dict):
+                motion = state["motions"].get(entry.payload.get("motion_id"))
+                if motion is None:
+                    return False
+                motion.updates_message_id = sent_message.id
+
+            await update_motion_state(guild_id, record_bulletin_message)
+        return
+
+    if kwargs["view"] is None:
+        kwargs.pop("view")
+    await channel.send(**kwargs)
+
+
+def _outbox_backoff_seconds(attempts: int, error: Exception) -> float:
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+    return min(OUTBOX_MAX_BACKOFF_SECONDS, 2 ** attempts)
+
+
+async def _mark_outbox_entry_sent(entry: OutboxEntry) -> bool:
+    """False if the store could not be updated; the entry is retried on the next drain, not resent."""
+    try:
+        await asyncio.to_thread(outbox_store.mark_sent, entry.entry_id)
+    except Exception as e:
+        print(f"Warning: failed to mark outbox entry #{entry.entry_id} as sent. Error: {e}")
+        return False
+    _outbox_delivered_ids.discard(entry.entry_id)
+    return True
+
+
+async def drain_outbox_channel(channel_id: int, entries: list[OutboxEntry]):
+    """
+    Sends one channel's entries strictly in order. An entry waiting for a retry
+    holds back everything queued after it in the same channel.
+    """
+    for entry in entries:
+        if entry.entry_id in _outbox_delivered_ids:
+            if not await _mark_outbox_entry_sent(entry):
+                return
+            continue
+
+        delay = entry.next_attempt_at - time.time()
+        if delay > 0:
+            return
+
+        try:
+            channel = await get_channel_by_id(channel_id)
+            if channel is None:
+                raise RuntimeError(f"channel {channel_id} not found")
+            await deliver_outbox_entry(entry, channel)
+        except Exception as e:
+            attempts = entry.attempts + 1
+            error = f"{type(e).__name__}: {e}"[:500]
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                # Kept in the store as "failed" so nothing audit-relevant disappears silently.
+                await asyncio.to_thread(outbox_store.mark_failed, entry.entry_id, attempts, error)
+                OUTBOX_MESSAGES_TOTAL.inc(kind=entry.kind, result="failed")
+                print(f"Outbox entry #{entry.entry_id} ({entry.kind}) failed permanently. Error: {error}")
+                if entry.payload.get("cooldown_key"):
+                    await release_rate_limit(entry.payload["cooldown_key"])
+                continue
+            next_attempt_at = time.time() + _outbox_backoff_seconds(attempts, e)
+            await asyncio.to_thread(outbox_store.mark_retry, entry.entry_id, attempts, next_attempt_at, error)
+            OUTBOX_MESSAGES_TOTAL.inc(kind=entry.kind, result="retry")
+            print(f"Warning: outbox entry #{entry.entry_id} ({entry.kind}) will be retried. Error: {error}")
+            return
+
+        OUTBOX_MESSAGES_TOTAL.inc(kind=entry.kind, result="sent")
+        _outbox_delivered_ids.add(entry.entry_id)
+        if not await _mark_outbox_entry_sent(entry):
+            return
+        await asyncio.sleep(OUTBOX_CHANNEL_INTERVAL_SECONDS)
+
+    # Entries queued for this channel while it was draining go out without waiting for the next poll.
+    _outbox_wakeup.set()
+
+
+async def run_outbox_dispatcher():
+    global _outbox_pending_seen
+    while True:
+        _outbox_wakeup.clear()
+        try:
+            entries = await asyncio.to_thread(outbox_store.pending, OUTBOX_BATCH_SIZE)
+        except Exception as e:
+            print(f"Warning: failed to read the outbox. Error: {e}")
+            entries = []
+        _outbox_pending_seen = len(entries)
+
+        by_channel: dict[int, list[OutboxEntry]] = {}
+        for entry in entries:
+            by_channel.setdefault(entry.channel_id, []).append(entry)
+        for channel_id, channel_entries in by_channel.items():
+            task = _outbox_channel_tasks.get(channel_id)
+            if task is None or task.done():
+                _outbox_channel_tasks[channel_id] = asyncio.create_task(drain_outbox_channel(channel_id, channel_entries))
+
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_outbox_wakeup.wait(), timeout=OUTBOX_POLL_SECONDS)
+
+
+def start_outbox_dispatcher():
+    """Only the leader sends, so a message is never delivered twice by two replicas."""
+    global _outbox_task
+    if not is_motion_leader() or (_outbox_task and not _outbox_task.done()):
+        return
+    _outbox_task = asyncio.create_task(run_outbox_dispatcher())
+
+
+def stop_outbox_dispatcher():
+    global _outbox_task
+    if _outbox_task:
+        _outbox_task.cancel()
+        _outbox_task = None
+    for task in _outbox_channel_tasks.values():
+        task.cancel()
+    _outbox_channel_tasks.clear()
+
+# ===================== SCHEDULED POSTS =====================
+SCHEDULE_REPEAT_CHOICES = [
+    app_commands.Choice(name="Does not repeat", value=0),
+    app_commands.Choice(name="Every 12 hours", value=12 * 3600),
+    app_commands.Choice(name="Daily", value=24 * 3600),
+    app_commands.Choice(name="Weekly", value=7 * 24 * 3600),
+]
+
+
+@dataclass(slots=True)
+class ScheduledPost:
+    job_id: int
+    kind: str  # "ssu" or "announce"
+    run_at: int  # epoch seconds
+    interval_seconds: int | None
+    payload: dict
+    created_by: int
+    guild_id: int
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SCHEDULED_POST_FIELDS}
+
+
+SCHEDULED_POST_FIELDS = tuple(f.name for f in fields(ScheduledPost))
+
+
+class ScheduledPostStore(abc.ABC):
+    @abc.abstractmethod
+    def load_all(self) -> list[ScheduledPost]:
+        ...
+
+    @abc.abstractmethod
+    def insert(self, kind: str, run_at: int, interval_seconds: int | None, payload: dict, created_by: int, guild_id: int) -> ScheduledPost:
+        ...
+
+    @abc.abstractmethod
+    def update_run_at(self, job_id: int, run_at: int):
+        ...
+
+    @abc.abstractmethod
+    def delete(self, job_id: int) -> bool:
+        ...
+
+
+class FileScheduledPostStore(ScheduledPostStore):
+    def _read(self) -> dict:
+        if not os.path.exists(SCHEDULED_POSTS_FILE):
+            return {"next_job_id": 1, "jobs": []}
+        with open(SCHEDULED_POSTS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, data: dict):
+        with open(SCHEDULED_POSTS_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def load_all(self) -> list[ScheduledPost]:
+        return [ScheduledPost(**job) for job in self._read()["jobs"]]
+
+    def insert(self, kind, run_at, interval_seconds, payload, created_by, guild_id) -> ScheduledPost:
+        data = self._read()
+        job = ScheduledPost(data["next_job_id"], kind, run_at, interval_seconds, payload, created_by, guild_id)
+        data["next_job_id"] += 1
+        data["jobs"].append(job.to_dict())
+        self._write(data)
+        return job
+
+    def update_run_at(self, job_id: int, run_at: int):
+        data = self._read()
+        for job in data["jobs"]:
+            if job["job_id"] == job_id:
+                job["run_at"] = run_at
+        self._write(data)
+
+    def delete(self, job_id: int) -> bool:
+        data = self._read()
+        remaining = [job for job in data["jobs"] if job["job_id"] != job_id]
+        data["jobs"], deleted = remaining, len(remaining) != len(data["jobs"])
+        self._write(data)
+        return deleted
+
+
+class PostgresScheduledPostStore(ScheduledPostStore):
+    def __init__(self):
+        self._table_ready = False
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scheduled_posts (
+                job_id BIGSERIAL PRIMARY KEY,
+                kind TEXT NOT NULL,
+                run_at BIGINT NOT NULL,
+                interval_seconds BIGINT,
+                payload JSONB NOT NULL,
+                created_by BIGINT NOT NULL,
+                guild_id BIGINT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """
+        )
+        self._table_ready = True
+
+    @timed(DATABASE_SECONDS, span="db:load_scheduled_posts", operation="load_scheduled_posts")
+    def load_all(self) -> list[ScheduledPost]:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(f"SELECT {', '.join(SCHEDULED_POST_FIELDS)} FROM scheduled_posts")
+                return [ScheduledPost(*row) for row in cur.fetchall()]
+
+    @timed(DATABASE_SECONDS, span="db:insert_scheduled_post", operation="insert_scheduled_post")
+    def insert(self, kind, run_at, interval_seconds, payload, created_by, guild_id) -> ScheduledPost:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                cur.execute(
+                    """
+                    INSERT INTO scheduled_posts (kind, run_at, interval_seconds, payload, created_by, guild_id)
+                    VALUES (%s, %s, %s, %s::jsonb, %s, %s)
+                    RETURNING job_id
+                    """,
+                    (kind, run_at, interval_seconds, json.dumps(payload), created_by, guild_id),
+                )
+                job_id = cur.fetchone()[0]
+        return ScheduledPost(job_id, kind, run_at, interval_seconds, payload, created_by, guild_id)
+
+    @timed(DATABASE_SECONDS, span="db:update_scheduled_post", operation="update_scheduled_post")
+    def update_run_at(self, job_id: int, run_at: int):
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute("UPDATE scheduled_posts SET run_at = %s WHERE job_id = %s", (run_at, job_id))
+
+    @timed(DATABASE_SECONDS, span="db:delete_scheduled_post", operation="delete_scheduled_post")
+    def delete(self, job_id: int) -> bool:
+        with psycopg2.connect(DATABASE_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM scheduled_posts WHERE job_id = %s", (job_id,))
+                return cur.rowcount > 0
+
+
+def create_scheduled_post_store() -> ScheduledPostStore:
+    return PostgresScheduledPostStore() if DATABASE_URL else FileScheduledPostStore()
+
+
+scheduled_post_store = create_scheduled_post_store()
+scheduled_posts: dict[int, ScheduledPost] = {}
+_schedule_heap: list[tuple[int, int]] = []  # (run_at, job_id); stale entries are skipped when popped
+_scheduler_wakeup = asyncio.Event()
+_scheduler_task: asyncio.Task | None = None
+
+
+def parse_schedule_time(text: str, now: float | None = None) -> int:
+    """
+    Accepts a Discord timestamp (<t:1700000000:F>), a unix time, a relative
+    offset ("in 2h30m", "45m") or "YYYY-MM-DD HH:MM" in UTC.
+    """
+    now = time.time() if now is None else now
+    text = text.strip()
+    if match := re.fullmatch(r"<t:(\d+)(?::[tTdDfFR])?>|(\d{9,11})", text):
+        return int(match.group(1) or match.group(2))
+
+    relative = re.fullmatch(r"(?:in\s+)?(?:(\d+)\s*d)?\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?", text.lower())
+    if relative and any(relative.groups()):
+        days, hours, minutes = (int(value or 0) for value in relative.groups())
+        return int(now + timedelta(days=days, hours=hours, minutes=minutes).total_seconds())
+
+    try:
+        return int(datetime.strptime(text, "%Y-%m-%d %H:%M").replace(tzinfo=UTC).timestamp())
+    except ValueError:
+        raise ValueError(
+            "Use a Discord timestamp, a unix time, a relative time like `in 2h30m`, or `YYYY-MM-DD HH:MM` (UTC)."
+        ) from None
+
+
+def describe_repeat(interval_seconds: int | None) -> str:
+    if not interval_seconds:
+        return "once"
+    label = next((choice.name for choice in SCHEDULE_REPEAT_CHOICES if choice.value == interval_seconds), None)
+    return label.lower() if label else f"every {timedelta(seconds=interval_seconds)}"
+
+
+def _push_scheduled_post(job: ScheduledPost):
+    heapq.heappush(_schedule_heap, (job.run_at, job.job_id))
+    _scheduler_wakeup.set()
+
+
+def _next_occurrence(job: ScheduledPost, now: float) -> int:
+    missed = int((now - job.run_at) // job.interval_seconds) + 1
+    return job.run_at + missed * job.interval_seconds
+
+
+def reload_scheduled_posts():
+    """Replaces the in-memory queue with the stored jobs (startup and leader changes)."""
+    scheduled_posts.clear()
+    _schedule_heap.clear()
+    for job in scheduled_post_store.load_all():
+        scheduled_posts[job.job_id] = job
+        _schedule_heap.append((job.run_at, job.job_id))
+    heapq.heapify(_schedule_heap)
+    _scheduler_wakeup.set()
+
+
+async def run_scheduled_post(job: ScheduledPost):
+    """
+    The job is advanced (or deleted) before posting: a crash mid-post skips one
+    occurrence rather than pinging everyone twice after a restart.
+    """
+    now = time.time()
+    late_by = now - job.run_at
+    if job.interval_seconds:
+        job.run_at = _next_occurrence(job, now)
+        scheduled_post_store.update_run_at(job.job_id, job.run_at)
+        _push_scheduled_post(job)
+    else:
+        scheduled_posts.pop(job.job_id, None)
+        scheduled_post_store.delete(job.job_id)
+
+    if late_by > SCHEDULER_CATCH_UP_SECONDS:
+        print(f"Skipping scheduled {job.kind} #{job.job_id}: {late_by:.0f}s overdue.")
+        return
+
+    config = get_guild_config(job.guild_id)
+    if job.kind == "ssu":
+        if not await get_channel_by_id(config.ssu_channel_id):
+            print(f"Scheduled SSU #{job.job_id} skipped: SSU channel not found.")
+            return
+        decision = await check_rate_limit(f"ssu:{job.guild_id}", SSU_RATE_LIMIT_RULES)
+        if not decision.allowed:
+            COOLDOWN_REJECTIONS_TOTAL.inc(command="scheduled_ssu")
+            print(f"Scheduled SSU #{job.job_id} skipped: SSU cooldown has {decision.retry_after:.0f}s left.")
+            return
+        try:
+            await queue_ssu_announcement(config, f"<@{job.created_by}>", job.payload.get("host_name", "Scheduled SSU"))
+        except Exception:
+            await release_rate_limit(f"ssu:{job.guild_id}")
+            raise
+    elif job.kind == "announce":
+        announcement_channel = await get_channel_by_id(config.announcement_channel_id)
+        if not announcement_channel:
+            print(f"Scheduled announcement #{job.job_id} skipped: announcement channel not found.")
+            return
+        payload = job.payload
+        embed = discord.Embed(
+            title=payload["title"],
+            description=payload["message"].replace("\\n", "\n"),
+            color=get_discord_color(payload.get("color", "default")),
+            timestamp=datetime.now(UTC),
+        )
+        if payload.get("image_url"):
+            embed.set_image(url=payload["image_url"])
+        buttons = [{"label": payload["button_text"], "url": payload["button_url"]}] if payload.get("button_url") else []
+        sent = await announcement_channel.send(embed=embed, view=create_button_view(buttons))
+        cache_linked_message(sent)
+
+
+async def run_scheduler():
+    """
+    One task drives every scheduled post: it sleeps until the earliest run_at
+    (or until a job is added) instead of keeping a sleeping task per post.
+    """
+    while True:
+        while _schedule_heap:
+            run_at, job_id = _schedule_heap[0]
+            job = scheduled_posts.get(job_id)
+            if job is not None and job.run_at == run_at:
+                break
+            heapq.heappop(_schedule_heap)
+
+        timeout = _schedule_heap[0][0] - time.time() if _schedule_heap else None
+        if timeout is None or timeout > 0:
+            _scheduler_wakeup.clear()
+            try:
+                await asyncio.wait_for(_scheduler_wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        _, job_id = heapq.heappop(_schedule_heap)
+        try:
+            await run_scheduled_post(scheduled_posts[job_id])
+        except Exception as e:
+            ERRORS_TOTAL.inc(source="scheduler")
+            print(f"Warning: scheduled post #{job_id} failed. Error: {e}")
+
+
+def start_scheduler():
+    """Starts the scheduler on the leader only; jobs that fell due while down run first."""
+    global _scheduler_task
+    if not is_motion_leader() or (_scheduler_task and not _scheduler_task.done()):
+        return
+    try:
+        reload_scheduled_posts()
+    except Exception as e:
+        print(f"Warning: failed to load scheduled posts. Error: {e}")
+    _scheduler_task = asyncio.create_task(run_scheduler())
+
+
+def stop_scheduler():
+    global _scheduler_task
+    if _scheduler_task:
+        _scheduler_task.cancel()
+        _scheduler_task = None
+
+
+def sync_scheduled_posts_for_follower():
+    """Only the leader keeps the queue in memory; a follower reads the store instead."""
+    if not is_motion_leader():
+        reload_scheduled_posts()
+
+
+async def notify_scheduled_posts_changed():
+    """A follower hands changes to the leader, which reloads its queue from the store."""
+    if not is_motion_leader():
+        await publish_replica_event("schedule")
+
+
+schedule_group = app_commands.Group(name="schedule", description="Schedule SSUs and announcements.", guild_only=True)
+
+
+async def _create_scheduled_post(interaction: discord.Interaction, kind: str, when: str, repeat: int, payload: dict):
+    try:
+        run_at = parse_schedule_time(when)
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+    if run_at <= time.time():
+        await interaction.response.send_message("That time is in the past.", ephemeral=True)
+        return
+    sync_scheduled_posts_for_follower()
+    if sum(1 for job in scheduled_posts.values() if job.guild_id == interaction.guild_id) >= SCHEDULER_MAX_JOBS:
+        await interaction.response.send_message(
+            f"This server already has {SCHEDULER_MAX_JOBS} scheduled posts.", ephemeral=True
+        )
+        return
+
+    job = scheduled_post_store.insert(kind, run_at, repeat or None, payload, interaction.user.id, interaction.guild_id)
+    scheduled_posts[job.job_id] = job
+    _push_scheduled_post(job)
+    await notify_scheduled_posts_changed()
+
+    await interaction.response.send_message(
+        f"Scheduled {kind} **#{job.job_id}** for <t:{run_at}:F> (<t:{run_at}:R>), {describe_repeat(job.interval_seconds)}.",
+        ephemeral=True,
+    )
+
+
+@schedule_group.command(name="ssu", description="Schedule an SSU announcement, optionally repeating.")
+@has_permission("can_ssu")
+@app_commands.describe(
+    when="Discord timestamp, unix time, `in 2h30m` or `YYYY-MM-DD HH:MM` (UTC).",
+    repeat="Repeat this SSU on a schedule.",
+)
+@app_commands.choices(repeat=SCHEDULE_REPEAT_CHOICES)
+async def schedule_ssu(interaction: discord.Interaction, when: str, repeat: app_commands.Choice[int] = None):
+    await _create_scheduled_post(
+        interaction, "ssu", when, repeat.value if repeat else 0, {"host_name": interaction.user.display_name}
+    )
+
+
+@schedule_group.command(name="announce", description="Schedule an announcement, optionally repeating.")
+@has_permission("can_announce")
+@app_commands.choices(color=COLOR_CHOICES, repeat=SCHEDULE_REPEAT_CHOICES)
+@app_commands.describe(
+    when="Discord timestamp, unix time, `in 2h30m` or `YYYY-MM-DD HH:MM` (UTC).",
+    title="Announcement title.",
+    message="Announcement text. Use \\n for new lines.",
+    color="Embed color.",
+    image_url="Optional image URL.",
+    button_text="Optional link button text.",
+    button_url="Optional link button URL.",
+    repeat="Repeat this announcement on a schedule.",
+)
+async def schedule_announce(
+    interaction: discord.Interaction,
+    when: str,
+    title: str,
+    message: str,
+    color: app_commands.Choice[str] = None,
+    image_url: str = None,
+    button_text: str = None,
+    button_url: str = None,
+    repeat: app_commands.Choice[int] = None,
+):
+    payload = {
+        "title": title,
+        "message": message,
+        "color": color.value if color else "default",
+        "image_url": image_url,
+        "button_text": button_text or "Open",
+        "button_url": button_url,
+    }
+    await _create_scheduled_post(interaction, "announce", when, repeat.value if repeat else 0, payload)
+
+
+@schedule_group.command(name="list", description="List upcoming scheduled posts.")
+@has_permission("can_ssu", "can_announce")
+async def schedule_list(interaction: discord.Interaction):
+    sync_scheduled_posts_for_follower()
+    guild_posts = [job for job in scheduled_posts.values() if job.guild_id == interaction.guild_id]
+    upcoming = sorted(guild_posts, key=lambda job: job.run_at)[:20]
+    if not upcoming:
+        await interaction.response.send_message("Nothing is scheduled.", ephemeral=True)
+        return
+
+    lines = []
+    for job in upcoming:
+        label = "SSU" if job.kind == "ssu" else f"Announcement: {textwrap.shorten(job.payload.get('title', ''), 60)}"
+        lines.append(
+            f"**#{job.job_id}** <t:{job.run_at}:F> (<t:{job.run_at}:R>), {describe_repeat(job.interval_seconds)} | {label} | by <@{job.created_by}>"
+        )
+    embed = discord.Embed(title=f"Scheduled Posts ({len(guild_posts)})", description="\n".join(lines), color=discord.Color.blurple())
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@schedule_group.command(name="cancel", description="Cancel a scheduled post.")
+@has_permission("can_ssu", "can_announce")
+@app_commands.describe(job_id="The number shown by /schedule list.")
+async def schedule_cancel(interaction: discord.Interaction, job_id: int):
+    sync_scheduled_posts_for_follower()
+    job = scheduled_posts.get(job_id)
+    if job is None or job.guild_id != interaction.guild_id:
+        await interaction.response.send_message("No scheduled post with that number.", ephemeral=True)
+        return
+    # The decorator admits either capability; cancelling needs the one for this kind of post.
+    profile = get_permission_profile(interaction.user)
+    if not (profile.can_ssu if job.kind == "ssu" else profile.can_announce):
+        await interaction.response.send_message("You do not have permission to cancel that post.", ephemeral=True)
+        return
+
+    scheduled_post_store.delete(job_id)
+    scheduled_posts.pop(job_id, None)
+    await notify_scheduled_posts_changed()
+    await interaction.response.send_message(f"Cancelled scheduled post **#{job_id}**.", ephemeral=True)
+
+# ===================== MOTION SYSTEM =====================
+MOTION_OPEN_STATUSES = frozenset({"board_voting", "o5_voting"})
+MOTION_FINAL_STATUSES = frozenset({"passed", "failed_board", "failed_o5", "vetoed"})
+MOTION_STAGE_DURATION_SECONDS = 24 * 60 * 60
+MOTION_TIMESTAMP_FIELDS = ("created_at", "board_deadline", "o5_started_at", "o5_deadline", "finalized_at")
+
+
+def _to_epoch(value) -> int | None:
+    """Accepts epoch ints and the ISO strings written by older versions."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def epoch_now() -> int:
+    return int(time.time())
+
+
+def empty_motion_votes() -> dict[str, list[int]]:
+    return {option: [] for option in MOTION_VOTE_OPTIONS}
+
+
+@dataclass(slots=True)
+class Motion:
+    motion_number: int
+    title: str
+    content: str
+    proposer_id: int
+    status: str
+    created_at: int
+    board_channel_id: int
+    board_deadline: int | None = None
+    board_message_id: int | None = None
+    o5_started_at: int | None = None
+    o5_deadline: int | None = None
+    o5_channel_id: int | None = None
+    o5_message_id: int | None = None
+    updates_message_id: int | None = None
+    finalized_at: int | None = None
+    finalized_by: int | None = None
+    board_votes: dict[str, list[int]] = field(default_factory=empty_motion_votes)
+    o5_votes: dict[str, list[int]] = field(default_factory=empty_motion_votes)
+    audit_log: list[dict] = field(default_factory=list)
+
+    @property
+    def motion_id(self) -> str:
+        return str(self.motion_number)
+
+    def stage_votes(self, stage: str) -> dict[str, list[int]]:
+        return self.board_votes if stage == "board" else self.o5_votes
+
+    @classmethod
+    def from_dict(cls, data: dict, motion_id: str | None = None) -> "Motion":
+        values = {name: data[name] for name in MOTION_FIELD_NAMES if name in data}
+        values.setdefault("motion_number", int(motion_id) if motion_id is not None else 0)
+        values.setdefault("board_channel_id", BOARD_MOTIONS_CHANNEL_ID)
+        values.setdefault("created_at", 0)
+        for name in MOTION_TIMESTAMP_FIELDS:
+            value = values.get(name)
+            if value is not None and not isinstance(value, int):
+                values[name] = _to_epoch(value)
+        for name in ("board_votes", "o5_votes"):
+            votes = values.get(name)
+            if not votes or len(votes) != len(MOTION_VOTE_OPTIONS):
+                votes = votes or {}
+                values[name] = {option: list(votes.get(option, [])) for option in MOTION_VOTE_OPTIONS}
+
+        audit_log = values.get("audit_log") or []
+        if audit_log and not isinstance(audit_log[0].get("timestamp"), int):
+            for entry in audit_log:
+                entry["timestamp"] = _to_epoch(entry.get("timestamp"))
+        values["audit_log"] = audit_log
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in MOTION_FIELD_NAMES}
+
+
+MOTION_FIELD_NAMES = tuple(f.name for f in fields(Motion))
+
+
+def _motion_state_to_json_ready(state: dict) -> dict:
+    return {
+        "next_motion_number": state["next_motion_number"],
+        "motions": {motion_id: motion.to_dict() for motion_id, motion in state["motions"].items()},
+    }
+
+
+def encode_motion_state(state: dict) -> bytes:
+    payload = _motion_state_to_json_ready(state)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
 
-    except Exception as e:
-        result = "❌ Failed"
-        color = discord.Color.red()
-        error_message = str(e)
-        response = f"❌ {error_message}"
+def decode_motion_state(raw: bytes | str | dict) -> dict:
+    """
+    Reads both the current compact encoding and the legacy indent=2 JSON, so
+    older state files and database rows migrate on first load.
+    """
+    # Parsing builds hundreds of thousands of containers that all survive;
+    # pausing the cyclic GC avoids repeated full-heap scans while they are created.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if isinstance(raw, dict):
+            payload = raw
+        elif orjson is not None:
+            payload = orjson.loads(raw)
+        else:
+            payload = json.loads(raw)
 
-    embed = discord.Embed(
-        title="Rank Log",
-        color=color,
-        timestamp=datetime.now(UTC)
-    )
-    embed.add_field(name="Executive", value=interaction.user.mention, inline=False)
-    embed.add_field(name="Target", value=username if 'username' in locals() else target, inline=False)
-    embed.add_field(name="Old → New", value=f"{old_role_name if 'old_role_name' in locals() else 'Unknown'} → {rank.value}", inline=False)
-    embed.add_field(name="Result", value=result, inline=False)
-    embed.add_field(name="Reason", value=reason, inline=False)
-    if error_message:
-        embed.add_field(name="Error", value=textwrap.shorten(error_message, width=1024, placeholder="…"), inline=False)
+        motions = {}
+        for motion_id, data in (payload.get("motions") or {}).items():
+            try:
+                motions[motion_id] = Motion.from_dict(data, motion_id)
+            except (TypeError, ValueError) as e:
+                print(f"Warning: skipping unreadable motion {motion_id}. Error: {e}")
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"next_motion_number": int(payload.get("next_motion_number", 1)), "motions": motions}
+
+
+# Motion state is partitioned by guild: each guild has its own motions, numbering,
+# state row, state file and counter, and every lookup goes through the guild the
+# interaction came from.
+motion_states: dict[int, dict] = {}
+motion_state_serialized_bytes: dict[int, int] = {}  # size of each guild's last write, so stats never re-encode
+# Postgres row version each partition was loaded at; a save only lands if the row is still at it.
+motion_state_versions: dict[int, int] = {}
+MOTION_STATE_SAVE_ATTEMPTS = 5
+MOTION_STATE_CONFLICTS_TOTAL = Counter(
+    "scpfbot_motion_state_conflicts_total", "Motion state saves rejected because another process saved first."
+)
+_bot_state_table_ready = False
+motion_timer_tasks: dict[tuple[int, str], asyncio.Task] = {}
 
-    if log_channel:
-        await log_channel.send(embed=embed)
 
-    await interaction.response.send_message(response, ephemeral=True)
+def motion_partition_keys(guild_id: int) -> tuple[str, str, str]:
+    """(bot_state key, state file, counter key) for a guild; the home guild keeps the original names."""
+    if guild_id == HOME_GUILD_ID:
+        return MOTION_STATE_DB_KEY, MOTION_STATE_FILE, "motion_number"
+    root, ext = os.path.splitext(MOTION_STATE_FILE)
+    return f"{MOTION_STATE_DB_KEY}:{guild_id}", f"{root}_{guild_id}{ext}", f"motion_number:{guild_id}"
 
 
+def get_motion_state(guild_id: int) -> dict:
+    """A guild's motion partition, loaded on first use."""
+    state = motion_states.get(guild_id)
+    if state is None:
+        state = load_motion_state(guild_id)
+    return state
 
-# ===================== MOTION SYSTEM =====================
-motion_state = {"next_motion_number": 1, "motions": {}}
-motion_timer_tasks: dict[str, asyncio.Task] = {}
 
+def iter_all_motions():
+    for state in motion_states.values():
+        yield from state["motions"].values()
 
-def initialize_motion_counter_table(seed_value: int):
+
+@timed(DATABASE_SECONDS, span="db:initialize_motion_counter", operation="initialize_motion_counter")
+def initialize_motion_counter_table(guild_id: int, seed_value: int):
     if not DATABASE_URL:
         return
 
+    counter_key = motion_partition_keys(guild_id)[2]
+
     with psycopg2.connect(DATABASE_URL) as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -729,7 +4238,7 @@ def initialize_motion_counter_table(seed_value: int):
                 VALUES (%s, %s)
                 ON CONFLICT (counter_key) DO NOTHING
                 """,
-                ("motion_number", seed_value),
+                (counter_key, seed_value),
             )
             cur.execute(
                 """
@@ -738,80 +4247,105 @@ def initialize_motion_counter_table(seed_value: int):
                 WHERE counter_key = %s
                   AND counter_value < %s
                 """,
-                (seed_value, "motion_number", seed_value),
+                (seed_value, counter_key, seed_value),
             )
             cur.execute(
                 "SELECT counter_value FROM bot_counters WHERE counter_key = %s",
-                ("motion_number",),
+                (counter_key,),
             )
             row = cur.fetchone()
 
     if row:
-        motion_state["next_motion_number"] = int(row[0])
+        motion_states[guild_id]["next_motion_number"] = int(row[0])
 
 
-def _save_motion_state_to_database():
-    if not DATABASE_URL:
+def _ensure_bot_state_table(cur):
+    global _bot_state_table_ready
+    if _bot_state_table_ready:
         return
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bot_state (
+            state_key TEXT PRIMARY KEY,
+            state_value JSONB NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+    cur.execute("ALTER TABLE bot_state ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0")
+    _bot_state_table_ready = True
+
+
+@timed(DATABASE_SECONDS, span="db:save_motion_state", operation="save_motion_state")
+def _save_motion_state_to_database(guild_id: int) -> bool:
+    """False if another process saved the partition since this one loaded it."""
+    if not DATABASE_URL:
+        return True
 
     with psycopg2.connect(DATABASE_URL) as conn:
         with conn.cursor() as cur:
+            _ensure_bot_state_table(cur)
             cur.execute(
                 """
-                CREATE TABLE IF NOT EXISTS bot_state (
-                    state_key TEXT PRIMARY KEY,
-                    state_value JSONB NOT NULL,
-                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                )
-                """
-            )
-            cur.execute(
-                """
-                INSERT INTO bot_state (state_key, state_value, updated_at)
-                VALUES (%s, %s::jsonb, NOW())
+                INSERT INTO bot_state (state_key, state_value, version, updated_at)
+                VALUES (%s, %s::jsonb, 1, NOW())
                 ON CONFLICT (state_key)
                 DO UPDATE SET
                     state_value = EXCLUDED.state_value,
+                    version = bot_state.version + 1,
                     updated_at = NOW()
+                WHERE bot_state.version = %s
+                RETURNING version
                 """,
-                (MOTION_STATE_DB_KEY, json.dumps(motion_state)),
+                (
+                    motion_partition_keys(guild_id)[0],
+                    encode_motion_state(motion_states[guild_id]).decode("utf-8"),
+                    motion_state_versions.get(guild_id, 0),
+                ),
             )
+            row = cur.fetchone()
+            if row is None:
+                return False
+            motion_state_versions[guild_id] = int(row[0])
+            if REPLICA_MODE:
+                # Delivered to peers only once this transaction commits.
+                cur.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    (
+                        REPLICA_NOTIFY_CHANNEL,
+                        json.dumps({"origin": INSTANCE_ID, "kind": "state", "guild_id": guild_id}),
+                    ),
+                )
+    return True
 
 
-def _load_motion_state_from_database() -> dict | None:
+@timed(DATABASE_SECONDS, span="db:load_motion_state", operation="load_motion_state")
+def _load_motion_state_from_database(guild_id: int) -> tuple[dict, int] | None:
+    """(state, row version) for a guild's partition, or None if it was never saved."""
     if not DATABASE_URL:
         return None
 
     with psycopg2.connect(DATABASE_URL) as conn:
         with conn.cursor() as cur:
+            _ensure_bot_state_table(cur)
             cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS bot_state (
-                    state_key TEXT PRIMARY KEY,
-                    state_value JSONB NOT NULL,
-                    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                )
-                """
-            )
-            cur.execute(
-                "SELECT state_value FROM bot_state WHERE state_key = %s",
-                (MOTION_STATE_DB_KEY,),
+                "SELECT state_value::text, version FROM bot_state WHERE state_key = %s",
+                (motion_partition_keys(guild_id)[0],),
             )
             row = cur.fetchone()
 
     if not row:
         return None
 
-    payload = row[0]
-    if isinstance(payload, str):
-        return json.loads(payload)
-    return payload
+    return decode_motion_state(row[0]), int(row[1])
 
 
-def reserve_motion_number() -> int:
+@timed(DATABASE_SECONDS, span="db:reserve_motion_number", operation="reserve_motion_number")
+def reserve_motion_number(guild_id: int) -> int:
+    state = get_motion_state(guild_id)
     if not DATABASE_URL:
-        motion_number = int(motion_state["next_motion_number"])
-        motion_state["next_motion_number"] = motion_number + 1
+        motion_number = int(state["next_motion_number"])
+        state["next_motion_number"] = motion_number + 1
         return motion_number
 
     with psycopg2.connect(DATABASE_URL) as conn:
@@ -823,7 +4357,7 @@ def reserve_motion_number() -> int:
                 WHERE counter_key = %s
                 RETURNING counter_value - 1
                 """,
-                ("motion_number",),
+                (motion_partition_keys(guild_id)[2],),
             )
             row = cur.fetchone()
 
@@ -831,94 +4365,460 @@ def reserve_motion_number() -> int:
         raise RuntimeError("Failed to reserve next motion number from database.")
 
     motion_number = int(row[0])
-    motion_state["next_motion_number"] = motion_number + 1
+    state["next_motion_number"] = motion_number + 1
     return motion_number
 
 
-def _motion_vote_snapshot(motion: dict) -> dict:
+def _motion_vote_snapshot(motion: Motion) -> dict:
     return {
-        "board": {option: list(motion["board_votes"][option]) for option in MOTION_VOTE_OPTIONS},
-        "o5": {option: list(motion["o5_votes"][option]) for option in MOTION_VOTE_OPTIONS},
+        "board": {option: list(motion.board_votes[option]) for option in MOTION_VOTE_OPTIONS},
+        "o5": {option: list(motion.o5_votes[option]) for option in MOTION_VOTE_OPTIONS},
     }
 
 
-def append_motion_audit_entry(motion: dict, action: str, actor_id: int | None = None, extra: dict | None = None):
+def append_motion_audit_entry(motion: Motion, action: str, actor_id: int | None = None, extra: dict | None = None):
     entry = {
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": epoch_now(),
         "action": action,
         "actor_id": actor_id,
     }
     if extra:
         entry.update(extra)
-    motion.setdefault("audit_log", []).append(entry)
+    motion.audit_log.append(entry)
+
+
+def _write_motion_state_file(guild_id: int):
+    payload = encode_motion_state(motion_states[guild_id])
+    motion_state_serialized_bytes[guild_id] = len(payload)
+    with open(motion_partition_keys(guild_id)[1], "wb") as f:
+        f.write(payload)
 
 
-def save_motion_state():
-    with open(MOTION_STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(motion_state, f, indent=2)
+def save_motion_state(guild_id: int) -> bool:
+    """
+    False only when another process saved the partition first; motion changes
+    go through update_motion_state, which then reloads and retries.
+    """
+    _write_motion_state_file(guild_id)
 
     if DATABASE_URL:
         try:
-            _save_motion_state_to_database()
+            if not _save_motion_state_to_database(guild_id):
+                MOTION_STATE_CONFLICTS_TOTAL.inc()
+                return False
         except Exception as e:
+            ERRORS_TOTAL.inc(source="database")
             print(f"Warning: failed to save motion state to database. Error: {e}")
+    return True
+
+
+async def update_motion_state(guild_id: int, mutate) -> bool:
+    """
+    Applies `mutate(state)` to a guild's motion state and saves it. If another
+    process saved first, the fresh copy is loaded and `mutate` runs again on it,
+    so no process overwrites changes it has not seen. `mutate` must not do I/O
+    and returns False to leave the state alone (e.g. the motion moved on).
+    """
+    for _ in range(MOTION_STATE_SAVE_ATTEMPTS):
+        if mutate(get_motion_state(guild_id)) is False:
+            return False
+        if save_motion_state(guild_id):
+            return True
+        if not await apply_remote_motion_state(guild_id):
+            break
+    print(f"Warning: motion state for guild {guild_id} could not be saved without overwriting newer changes.")
+    return False
 
 
-def load_motion_state():
-    global motion_state
-    loaded_from_db = False
+def load_motion_state(guild_id: int) -> dict:
+    state = None
 
     if DATABASE_URL:
         try:
-            db_state = _load_motion_state_from_database()
-            if db_state:
-                motion_state = db_state
-                loaded_from_db = True
+            loaded = _load_motion_state_from_database(guild_id)
         except Exception as e:
             print(f"Warning: failed to load motion state from database. Falling back to file. Error: {e}")
-
-    if not loaded_from_db:
-        if os.path.exists(MOTION_STATE_FILE):
-            with open(MOTION_STATE_FILE, "r", encoding="utf-8") as f:
-                motion_state = json.load(f)
         else:
-            save_motion_state()
+            if loaded:
+                state, motion_state_versions[guild_id] = loaded
+
+    if not state:
+        state_file = motion_partition_keys(guild_id)[1]
+        if os.path.exists(state_file):
+            with open(state_file, "rb") as f:
+                state = decode_motion_state(f.read())
+        else:
+            state = {"next_motion_number": 1, "motions": {}}
+    motion_states[guild_id] = state
+    rebuild_motion_indexes(guild_id)
+
+    max_motion_number = max((motion.motion_number for motion in state["motions"].values()), default=0)
+    state["next_motion_number"] = max(state["next_motion_number"], max_motion_number + 1)
+
+    try:
+        initialize_motion_counter_table(guild_id, state["next_motion_number"])
+    except Exception as e:
+        print(f"Warning: motion counter DB sync failed, falling back to file counter. Error: {e}")
+
+    save_motion_state(guild_id)
+    return state
+
+
+# --- MOTION SEARCH ---
+def tokenize_motion_text(text: str) -> list[str]:
+    """Lowercased words; underscores split too, matching Postgres' parser (so `failed_o5` is `failed` + `o5`)."""
+    return re.findall(r"[^\W_]+", text.lower())
+
+
+def motion_search_document(motion: Motion) -> dict[str, int]:
+    """Token weights for one motion: title, status and proposer outweigh the body."""
+    weights: dict[str, int] = {}
+    for token in tokenize_motion_text(normalize_motion_content(motion.content)):
+        weights[token] = weights.get(token, 0) + 1
+    for token in [*tokenize_motion_text(f"{motion.title} {motion.status}"), str(motion.proposer_id)]:
+        weights[token] = weights.get(token, 0) + 3
+    return weights
+
+
+class MotionSearchIndex(abc.ABC):
+    @abc.abstractmethod
+    def rebuild(self, guild_id: int, motions: dict[str, Motion]):
+        ...
+
+    @abc.abstractmethod
+    def index(self, guild_id: int, motion: Motion):
+        ...
+
+    @abc.abstractmethod
+    def search(self, guild_id: int, query: str, limit: int = 10) -> list[int]:
+        """Motion numbers matching every query word (as a prefix), best match first."""
 
-    motion_state.setdefault("next_motion_number", 1)
-    motion_state.setdefault("motions", {})
 
-    max_motion_number = 0
-    for motion_id, motion in motion_state["motions"].items():
+class InMemoryMotionSearchIndex(MotionSearchIndex):
+    """
+    Inverted index per guild: token -> {motion_id: weight}, plus a sorted
+    vocabulary for prefix lookups. A guild is indexed from its current motion
+    state on its first search, so loading state stays as fast as before.
+    """
+
+    def __init__(self):
+        self._postings: dict[int, dict[str, dict[str, int]]] = {}
+        self._vocabulary: dict[int, list[str]] = {}
+        self._documents: dict[tuple[int, str], dict[str, int]] = {}
+        self._unbuilt: set[int] = set()
+
+    def rebuild(self, guild_id: int, motions: dict[str, Motion]):
+        self._postings.pop(guild_id, None)
+        self._vocabulary.pop(guild_id, None)
+        for key in [key for key in self._documents if key[0] == guild_id]:
+            del self._documents[key]
+        self._unbuilt.add(guild_id)
+
+    def _ensure_built(self, guild_id: int):
+        if guild_id in self._unbuilt:
+            self._unbuilt.discard(guild_id)
+            for motion in get_motion_state(guild_id)["motions"].values():
+                self._index(guild_id, motion)
+
+    def index(self, guild_id: int, motion: Motion):
+        if guild_id in self._unbuilt:
+            return  # picked up with the rest of the guild on its first search
+        self._index(guild_id, motion)
+
+    def _index(self, guild_id: int, motion: Motion):
+        postings = self._postings.setdefault(guild_id, {})
+        vocabulary = self._vocabulary.setdefault(guild_id, [])
+        motion_id = motion.motion_id
+        document = motion_search_document(motion)
+        previous = self._documents.get((guild_id, motion_id), {})
+        for token in previous.keys() - document.keys():
+            del postings[token][motion_id]
+            if not postings[token]:
+                del postings[token]
+                del vocabulary[bisect.bisect_left(vocabulary, token)]
+        for token, weight in document.items():
+            if token not in postings:
+                postings[token] = {}
+                bisect.insort(vocabulary, token)
+            postings[token][motion_id] = weight
+        self._documents[(guild_id, motion_id)] = document
+
+    def search(self, guild_id: int, query: str, limit: int = 10) -> list[int]:
+        self._ensure_built(guild_id)
+        postings = self._postings.get(guild_id, {})
+        vocabulary = self._vocabulary.get(guild_id, [])
+        scores: dict[str, int] | None = None
+        for term in dict.fromkeys(tokenize_motion_text(query)):
+            term_scores: dict[str, int] = {}
+            position = bisect.bisect_left(vocabulary, term)
+            while position < len(vocabulary) and vocabulary[position].startswith(term):
+                for motion_id, weight in postings[vocabulary[position]].items():
+                    term_scores[motion_id] = term_scores.get(motion_id, 0) + weight
+                position += 1
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {motion_id: score + term_scores[motion_id] for motion_id, score in scores.items() if motion_id in term_scores}
+            if not scores:
+                return []
+        if not scores:
+            return []
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], -int(item[0])))
+        return [int(motion_id) for motion_id, _ in best]
+
+
+class PostgresMotionSearchIndex(MotionSearchIndex):
+    """
+    One row per motion with a weighted tsvector under a GIN index. The motion
+    state blob stays the source of truth; rows are rewritten on every status change.
+    """
+
+    _DOCUMENT_SQL = (
+        "setweight(to_tsvector('simple', %(title)s || ' ' || %(status)s || ' ' || %(proposer_id)s::text), 'A')"
+        " || setweight(to_tsvector('simple', %(content)s), 'B')"
+    )
+
+    def __init__(self):
+        self._table_ready = False
+        self._pool: psycopg2.pool.ThreadedConnectionPool | None = None
+        self._pool_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _cursor(self):
+        """
+        A cursor on a pooled connection; searches run on every autocomplete
+        keystroke, so they must not pay for a new connection each time.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = psycopg2.pool.ThreadedConnectionPool(1, MOTION_SEARCH_POOL_SIZE, DATABASE_URL)
+        conn = self._pool.getconn()
         try:
-            max_motion_number = max(max_motion_number, int(motion.get("motion_number", int(motion_id))))
-        except (TypeError, ValueError):
-            continue
-        motion.setdefault("audit_log", [])
+            with conn:
+                with conn.cursor() as cur:
+                    self._ensure_table(cur)
+                    yield cur
+        except psycopg2.Error:
+            self._pool.putconn(conn, close=True)
+            raise
+        except BaseException:
+            self._pool.putconn(conn)
+            raise
+        self._pool.putconn(conn)
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS motion_search (
+                guild_id BIGINT NOT NULL,
+                motion_number INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                document TSVECTOR NOT NULL,
+                PRIMARY KEY (guild_id, motion_number)
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS motion_search_document_idx ON motion_search USING GIN (document)")
+        self._table_ready = True
+
+    @staticmethod
+    def _row(guild_id: int, motion: Motion) -> dict:
+        return {
+            "guild_id": guild_id,
+            "motion_number": motion.motion_number,
+            "title": motion.title,
+            "status": motion.status,
+            "proposer_id": motion.proposer_id,
+            "content": normalize_motion_content(motion.content),
+        }
+
+    def _upsert(self, cur, rows: list[dict]):
+        cur.executemany(
+            f"""
+            INSERT INTO motion_search (guild_id, motion_number, status, document)
+            VALUES (%(guild_id)s, %(motion_number)s, %(status)s, {self._DOCUMENT_SQL})
+            ON CONFLICT (guild_id, motion_number)
+            DO UPDATE SET status = EXCLUDED.status, document = EXCLUDED.document
+            """,
+            rows,
+        )
+
+    @timed(DATABASE_SECONDS, span="db:rebuild_motion_search", operation="rebuild_motion_search")
+    def rebuild(self, guild_id: int, motions: dict[str, Motion]):
+        # Only rows that are missing or carry an outdated status are rewritten,
+        # so a restart over an up-to-date table is a single SELECT.
+        with self._cursor() as cur:
+            cur.execute("SELECT motion_number, status FROM motion_search WHERE guild_id = %s", (guild_id,))
+            indexed = dict(cur.fetchall())
+            stale = [
+                self._row(guild_id, motion) for motion in motions.values()
+                if indexed.get(motion.motion_number) != motion.status
+            ]
+            if stale:
+                self._upsert(cur, stale)
+
+    @timed(DATABASE_SECONDS, span="db:index_motion", operation="index_motion")
+    def index(self, guild_id: int, motion: Motion):
+        with self._cursor() as cur:
+            self._upsert(cur, [self._row(guild_id, motion)])
+
+    @timed(DATABASE_SECONDS, span="db:search_motions", operation="search_motions")
+    def search(self, guild_id: int, query: str, limit: int = 10) -> list[int]:
+        terms = dict.fromkeys(tokenize_motion_text(query))
+        if not terms:
+            return []
+        with self._cursor() as cur:
+            cur.execute(
+                """
+                SELECT motion_number
+                FROM motion_search, to_tsquery('simple', %s) AS query
+                WHERE guild_id = %s AND document @@ query
+                ORDER BY ts_rank(document, query) DESC, motion_number DESC
+                LIMIT %s
+                """,
+                (" & ".join(f"{term}:*" for term in terms), guild_id, limit),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+
+def create_motion_search_index() -> MotionSearchIndex:
+    return PostgresMotionSearchIndex() if DATABASE_URL else InMemoryMotionSearchIndex()
+
+
+motion_search_index = create_motion_search_index()
+
+
+async def search_motions(guild_id: int, query: str, limit: int = 10) -> list[int]:
+    """Postgres searches run in a worker thread; the in-memory index is read on the loop it is updated from."""
+    if isinstance(motion_search_index, PostgresMotionSearchIndex):
+        return await asyncio.to_thread(motion_search_index.search, guild_id, query, limit)
+    return motion_search_index.search(guild_id, query, limit)
+
+
+# --- MOTION LIST INDEX ---
+class MotionListIndex:
+    """
+    Per-guild secondary indexes for /motion list: status -> motion numbers and
+    proposer -> motion numbers, each kept sorted on mutation, plus creation times
+    in number order. Numbers are handed out in creation order, so a date range
+    becomes a number range and every filter is a bisect over a sorted list.
+    """
+
+    def __init__(self):
+        self._by_status: dict[int, dict[str, list[int]]] = {}
+        self._by_proposer: dict[int, dict[int, list[int]]] = {}
+        self._created: dict[int, tuple[list[int], list[int]]] = {}  # (numbers, created_at), ascending
+        self._entries: dict[tuple[int, int], str] = {}  # (guild, number) -> indexed status
+
+    def rebuild(self, guild_id: int, motions: dict[str, Motion]):
+        by_status: dict[str, list[int]] = {}
+        by_proposer: dict[int, list[int]] = {}
+        numbers, created = [], []
+        for key in [key for key in self._entries if key[0] == guild_id]:
+            del self._entries[key]
+        for motion in sorted(motions.values(), key=lambda motion: motion.motion_number):
+            by_status.setdefault(motion.status, []).append(motion.motion_number)
+            by_proposer.setdefault(motion.proposer_id, []).append(motion.motion_number)
+            numbers.append(motion.motion_number)
+            created.append(motion.created_at)
+            self._entries[(guild_id, motion.motion_number)] = motion.status
+        self._by_status[guild_id] = by_status
+        self._by_proposer[guild_id] = by_proposer
+        self._created[guild_id] = (numbers, created)
+
+    def update(self, guild_id: int, motion: Motion):
+        number = motion.motion_number
+        previous_status = self._entries.get((guild_id, number))
+        if previous_status == motion.status:
+            return
+        by_status = self._by_status.setdefault(guild_id, {})
+        if previous_status is None:
+            bisect.insort(self._by_proposer.setdefault(guild_id, {}).setdefault(motion.proposer_id, []), number)
+            numbers, created = self._created.setdefault(guild_id, ([], []))
+            position = bisect.bisect_left(numbers, number)
+            numbers.insert(position, number)
+            created.insert(position, motion.created_at)
+        else:
+            previous = by_status[previous_status]
+            del previous[bisect.bisect_left(previous, number)]
+        bisect.insort(by_status.setdefault(motion.status, []), number)
+        self._entries[(guild_id, number)] = motion.status
+
+    def _number_range(self, guild_id: int, created_after: int | None, created_before: int | None) -> tuple[int, int]:
+        numbers, created = self._created.get(guild_id, ([], []))
+        low = bisect.bisect_left(created, created_after) if created_after is not None else 0
+        high = bisect.bisect_right(created, created_before) if created_before is not None else len(created)
+        if low >= high:
+            return 1, 0
+        return numbers[low], numbers[high - 1]
+
+    def query(
+        self,
+        guild_id: int,
+        statuses: tuple[str, ...] = (),
+        proposer_id: int | None = None,
+        created_after: int | None = None,
+        created_before: int | None = None,
+    ) -> list[int]:
+        """Matching motion numbers, newest first."""
+        first, last = self._number_range(guild_id, created_after, created_before)
+        if first > last:
+            return []
+
+        def in_range(numbers: list[int]) -> list[int]:
+            return numbers[bisect.bisect_left(numbers, first):bisect.bisect_right(numbers, last)]
+
+        if proposer_id is not None:
+            matches = in_range(self._by_proposer.get(guild_id, {}).get(proposer_id, []))
+            if statuses:
+                matches = [number for number in matches if self._entries.get((guild_id, number)) in statuses]
+        elif statuses:
+            by_status = self._by_status.get(guild_id, {})
+            matches = list(heapq.merge(*(in_range(by_status.get(status, [])) for status in statuses)))
+        else:
+            matches = in_range(self._created.get(guild_id, ([], []))[0])
+        matches.reverse()
+        return matches
 
-    motion_state["next_motion_number"] = max(motion_state["next_motion_number"], max_motion_number + 1)
+    def open_motions(self, guild_id: int) -> list[int]:
+        return self.query(guild_id, tuple(sorted(MOTION_OPEN_STATUSES)))
 
+
+motion_list_index = MotionListIndex()
+
+
+def index_motion(guild_id: int, motion: Motion):
+    """Keeps the list and search indexes in step after a motion is created or changes status."""
+    motion_list_index.update(guild_id, motion)
     try:
-        initialize_motion_counter_table(motion_state["next_motion_number"])
+        motion_search_index.index(guild_id, motion)
     except Exception as e:
-        print(f"Warning: motion counter DB sync failed, falling back to file counter. Error: {e}")
+        ERRORS_TOTAL.inc(source="database")
+        print(f"Warning: failed to index motion {motion.motion_number} for search. Error: {e}")
 
-    save_motion_state()
 
-
-def member_has_any_role(member: discord.Member, role_ids: list[int]) -> bool:
-    member_role_ids = {r.id for r in member.roles}
-    return any(role_id in member_role_ids for role_id in role_ids)
+def rebuild_motion_indexes(guild_id: int):
+    motions = get_motion_state(guild_id)["motions"]
+    motion_list_index.rebuild(guild_id, motions)
+    try:
+        motion_search_index.rebuild(guild_id, motions)
+    except Exception as e:
+        ERRORS_TOTAL.inc(source="database")
+        print(f"Warning: failed to rebuild the motion search index. Error: {e}")
 
 
-def can_manage_motions(member: discord.Member) -> bool:
-    return member_has_any_role(member, [COUNCIL_CHAIRMAN_ROLE_ID, ADMINISTRATOR_ROLE_ID])
+def can_manage_motions(member: discord.abc.User) -> bool:
+    return get_permission_profile(member).can_manage_motions
 
 
-def can_vote_stage(member: discord.Member, stage: str) -> bool:
+def can_vote_stage(member: discord.abc.User, stage: str) -> bool:
+    profile = get_permission_profile(member)
     if stage == "board":
-        return member_has_any_role(member, [BOARD_ROLE_ID, COUNCIL_CHAIRMAN_ROLE_ID, ADMINISTRATOR_ROLE_ID])
+        return profile.can_vote_board
     if stage == "o5":
-        return member_has_any_role(member, [O5_ROLE_ID, COUNCIL_CHAIRMAN_ROLE_ID, ADMINISTRATOR_ROLE_ID])
+        return profile.can_vote_o5
     return False
 
 
@@ -941,16 +4841,17 @@ def normalize_motion_content(content: str) -> str:
     return "\n".join(lines).strip()
 
 
-def get_motion_stage_ping(stage: str) -> str:
+def get_motion_stage_ping(guild_id: int, stage: str) -> str:
+    config = get_guild_config(guild_id)
     stage_role_map = {
-        "board": BOARD_ROLE_ID,
-        "o5": O5_ROLE_ID,
+        "board": config.board_role_id,
+        "o5": config.o5_role_id,
     }
     role_id = stage_role_map.get(stage)
     return f"<@&{role_id}>" if role_id else ""
 
 
-def build_motion_embed(motion: dict) -> discord.Embed:
+def build_motion_embed(motion: Motion) -> discord.Embed:
     status_map = {
         "board_voting": "Board of Directors Voting",
         "o5_voting": "O5 Council Voting",
@@ -968,25 +4869,25 @@ def build_motion_embed(motion: dict) -> discord.Embed:
         "vetoed": discord.Color.dark_red(),
     }
 
-    status_text = status_map.get(motion["status"], motion["status"])
+    status_text = status_map.get(motion.status, motion.status)
     description = (
         f"`{status_text}`\n\n"
-        f"{normalize_motion_content(motion['content'])}"
+        f"{normalize_motion_content(motion.content)}"
     )
 
     embed = discord.Embed(
-        title=f"Motion #{int(motion['motion_number']):03d} || {motion['title']}",
+        title=f"Motion #{int(motion.motion_number):03d} || {motion.title}",
         description=description,
-        color=color_map.get(motion["status"], discord.Color.blurple()),
+        color=color_map.get(motion.status, discord.Color.blurple()),
         timestamp=datetime.now(UTC),
     )
-    current_stage = "Board of Directors" if motion["status"] == "board_voting" else "Overseer Council"
-    embed.add_field(name="📩 Proposed by", value=f"<@{motion['proposer_id']}>", inline=True)
+    current_stage = "Board of Directors" if motion.status == "board_voting" else "Overseer Council"
+    embed.add_field(name="📩 Proposed by", value=f"<@{motion.proposer_id}>", inline=True)
     embed.add_field(name="🚩 Stage", value=current_stage, inline=True)
     embed.add_field(name="\u200b", value="\u200b", inline=False)
 
-    board_votes = motion["board_votes"]
-    o5_votes = motion["o5_votes"]
+    board_votes = motion.board_votes
+    o5_votes = motion.o5_votes
 
     board_summary = "\n\n".join([
         format_vote_block("Approvals", MOTION_EMOJIS["approve"]["text"], board_votes["approve"]),
@@ -994,9 +4895,9 @@ def build_motion_embed(motion: dict) -> discord.Embed:
         format_vote_block("Abstentions", MOTION_EMOJIS["abstain"]["text"], board_votes["abstain"]),
     ])
 
-    if motion["status"] == "board_voting":
+    if motion.status == "board_voting":
         board_summary += "\n\n**Awaiting Board decision.**"
-    elif motion["status"] == "passed":
+    elif motion.status == "passed":
         board_summary += "\n\nPassed **Board of Directors**."
     else:
         board_summary += "\n\nBoard stage complete."
@@ -1007,7 +4908,7 @@ def build_motion_embed(motion: dict) -> discord.Embed:
         inline=True,
     )
 
-    if motion["status"] == "board_voting":
+    if motion.status == "board_voting":
         o5_summary = "Overseer Council vote opens after Board approval."
     else:
         o5_summary = "\n\n".join([
@@ -1016,11 +4917,11 @@ def build_motion_embed(motion: dict) -> discord.Embed:
             format_vote_block("Abstentions", MOTION_EMOJIS["abstain"]["text"], o5_votes["abstain"]),
         ])
 
-        if motion["status"] == "o5_voting":
+        if motion.status == "o5_voting":
             o5_summary += "\n\nAwaiting **Overseer Council** decision."
-        elif motion["status"] == "passed":
+        elif motion.status == "passed":
             o5_summary += "\n\nPassed **Council**."
-        elif motion["status"] in {"failed_o5", "vetoed"}:
+        elif motion.status in {"failed_o5", "vetoed"}:
             o5_summary += "\n\nFailed at **Council** stage."
         else:
             o5_summary += "\n\nCouncil stage closed."
@@ -1031,233 +4932,937 @@ def build_motion_embed(motion: dict) -> discord.Embed:
         inline=True,
     )
 
-    if motion["status"] in {"board_voting", "o5_voting"}:
+    if motion.status in MOTION_OPEN_STATUSES:
         embed.set_footer(text="Vote buttons remain active only during the current stage.")
     return embed
 
 
-async def get_channel_by_id(channel_id: int):
-    channel = bot.get_channel(channel_id)
-    if channel:
-        return channel
-    try:
-        return await bot.fetch_channel(channel_id)
-    except (discord.NotFound, discord.Forbidden):
-        return None
+async def get_channel_by_id(channel_id: int):
+    if not channel_id:
+        return None
+    channel = bot.get_channel(channel_id)
+    if channel:
+        return channel
+    try:
+        return await bot.fetch_channel(channel_id)
+    except (discord.NotFound, discord.Forbidden):
+        return None
+
+
+async def update_motion_messages(guild_id: int, motion_id: str):
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
+    if not motion:
+        return
+
+    embed = build_motion_embed(motion)
+
+    board_channel = await get_channel_by_id(motion.board_channel_id)
+    if board_channel and motion.board_message_id:
+        try:
+            board_msg = await board_channel.fetch_message(motion.board_message_id)
+            board_view = MotionVoteView(motion_id, "board") if motion.status == "board_voting" else None
+            await board_msg.edit(embed=embed, view=board_view)
+        except (discord.NotFound, discord.Forbidden):
+            pass
+
+    if motion.o5_message_id and motion.o5_channel_id:
+        o5_channel = await get_channel_by_id(motion.o5_channel_id)
+        if o5_channel:
+            try:
+                o5_msg = await o5_channel.fetch_message(motion.o5_message_id)
+                o5_view = MotionVoteView(motion_id, "o5") if motion.status == "o5_voting" else None
+                await o5_msg.edit(embed=embed, view=o5_view)
+            except (discord.NotFound, discord.Forbidden):
+                pass
+
+
+def build_motion_update_embed(motion: Motion, headline: str) -> discord.Embed:
+    embed = build_motion_embed(motion)
+    embed.title = f"Motion {int(motion.motion_number):03d}"
+    embed.description = (
+        f"**{motion.title}**\n"
+        f"`{headline}`\n\n"
+        f"{normalize_motion_content(motion.content)}"
+    )
+    return embed
+
+
+async def send_bulletin_update(guild_id: int, motion: Motion, headline: str):
+    if not is_motion_leader():
+        await publish_replica_event("bulletin", guild_id=guild_id, motion_id=str(motion.motion_number), headline=headline)
+        return
+
+    channel_id = get_guild_config(guild_id).motion_updates_channel_id
+    if not channel_id:
+        return
+    # The outbox edits the motion's existing bulletin or posts one and records its id.
+    await enqueue_outbound_message(
+        channel_id,
+        "bulletin",
+        embeds=[build_motion_update_embed(motion, headline)],
+        guild_id=guild_id,
+        motion_id=str(motion.motion_number),
+    )
+
+
+async def move_motion_to_o5(
+    guild_id: int, motion_id: str, actor: discord.abc.User | None = None, decided_early: dict | None = None
+):
+    """`decided_early` is the extra for a `decided_early` audit entry written in the same state change."""
+    o5_started_at = epoch_now()
+
+    def advance(state: dict) -> bool:
+        motion = state["motions"].get(motion_id)
+        if not motion or motion.status != "board_voting":
+            return False
+        if decided_early is not None:
+            append_motion_audit_entry(motion, action="decided_early", extra=decided_early)
+        motion.status = "o5_voting"
+        motion.o5_started_at = o5_started_at
+        motion.o5_deadline = o5_started_at + MOTION_STAGE_DURATION_SECONDS
+        append_motion_audit_entry(
+            motion,
+            action="advanced_to_o5",
+            actor_id=actor.id if actor else None,
+            extra={"votes": _motion_vote_snapshot(motion)},
+        )
+        return True
+
+    if not await update_motion_state(guild_id, advance):
+        return
+
+    o5_channel = await get_channel_by_id(get_guild_config(guild_id).o5_motions_channel_id)
+    if o5_channel:
+        embed = build_motion_embed(get_motion_state(guild_id)["motions"][motion_id])
+        content = get_motion_stage_ping(guild_id, "o5")
+        o5_msg = await o5_channel.send(content=content, embed=embed, view=MotionVoteView(motion_id, "o5"))
+
+        def record_o5_message(state: dict):
+            motion = state["motions"][motion_id]
+            motion.o5_channel_id = o5_channel.id
+            motion.o5_message_id = o5_msg.id
+
+        await update_motion_state(guild_id, record_o5_message)
+
+    motion = get_motion_state(guild_id)["motions"][motion_id]
+    index_motion(guild_id, motion)
+    await update_motion_messages(guild_id, motion_id)
+    await send_bulletin_update(guild_id, motion, "Motion advanced to O5 Council")
+    schedule_motion_timer(guild_id, motion_id)
+
+
+async def finalize_motion(
+    guild_id: int,
+    motion_id: str,
+    result: str,
+    actor: discord.abc.User | None = None,
+    decided_early: dict | None = None,
+):
+    """`decided_early` is the extra for a `decided_early` audit entry written in the same state change."""
+    finalized_at = epoch_now()
+
+    def finalize(state: dict) -> bool:
+        motion = state["motions"].get(motion_id)
+        if not motion or motion.status not in MOTION_OPEN_STATUSES:
+            return False
+        if decided_early is not None:
+            append_motion_audit_entry(motion, action="decided_early", extra=decided_early)
+        motion.status = result
+        motion.finalized_at = finalized_at
+        if actor:
+            motion.finalized_by = actor.id
+        append_motion_audit_entry(
+            motion,
+            action="finalized",
+            actor_id=actor.id if actor else None,
+            extra={"result": result, "votes": _motion_vote_snapshot(motion)},
+        )
+        return True
+
+    if not await update_motion_state(guild_id, finalize):
+        return
+
+    motion = get_motion_state(guild_id)["motions"][motion_id]
+    index_motion(guild_id, motion)
+    await update_motion_messages(guild_id, motion_id)
+
+    if result == "passed":
+        await send_bulletin_update(guild_id, motion, "Motion passed")
+    elif result == "failed_board":
+        await send_bulletin_update(guild_id, motion, "Motion failed at Board")
+    elif result == "failed_o5":
+        await send_bulletin_update(guild_id, motion, "Motion failed at O5 Council")
+    elif result == "vetoed":
+        await send_bulletin_update(guild_id, motion, "Motion vetoed")
+
+    task = motion_timer_tasks.pop((guild_id, motion_id), None)
+    if task:
+        task.cancel()
+
+
+# --- EARLY RESOLUTION ---
+# Members who can vote in each stage, per guild, kept current from role-change
+# events so the decided check never scans the guild.
+motion_stage_voters: dict[int, dict[str, set[int]]] = {}
+motion_stage_voters_ready: set[int] = set()  # guilds whose member cache was complete when counted
+
+Gauge(
+    "scpfbot_motion_eligible_voters",
+    "Cached eligible voters per motion stage (early close only).",
+    lambda: {
+        (stage,): sum(len(motion_stage_voters[guild_id][stage]) for guild_id in motion_stage_voters_ready)
+        for stage in ("board", "o5")
+    } if motion_stage_voters_ready else {},
+    ("stage",),
+)
+
+
+def _update_stage_voter(member: discord.Member):
+    config = get_guild_config(member.guild.id)
+    guild_voters = motion_stage_voters.setdefault(member.guild.id, {"board": set(), "o5": set()})
+    role_ids = {role.id for role in member.roles}
+    for stage, stage_roles in (("board", config.board_voter_role_ids), ("o5", config.o5_voter_role_ids)):
+        if role_ids.isdisjoint(stage_roles) or member.bot:
+            guild_voters[stage].discard(member.id)
+        else:
+            guild_voters[stage].add(member.id)
+
+
+def rebuild_stage_voter_cache(guild: discord.Guild):
+    if not MOTION_EARLY_CLOSE:
+        return
+    motion_stage_voters[guild.id] = {"board": set(), "o5": set()}
+    for member in guild.members:
+        _update_stage_voter(member)
+    if guild.chunked:
+        motion_stage_voters_ready.add(guild.id)
+    else:
+        motion_stage_voters_ready.discard(guild.id)
+    guild_voters = motion_stage_voters[guild.id]
+    print(
+        f"Eligible motion voters in {guild.id}: {len(guild_voters['board'])} Board, {len(guild_voters['o5'])} O5"
+        + ("" if guild.chunked else " (member cache incomplete; early close disabled)")
+    )
+
+
+@bot.listen("on_member_update")
+async def update_stage_voters_on_role_change(before: discord.Member, after: discord.Member):
+    if MOTION_EARLY_CLOSE and before.roles != after.roles:
+        _update_stage_voter(after)
+
+
+@bot.listen("on_member_remove")
+async def update_stage_voters_on_leave(member: discord.Member):
+    if MOTION_EARLY_CLOSE:
+        for voters in motion_stage_voters.get(member.guild.id, {}).values():
+            voters.discard(member.id)
+
+
+def decided_stage_outcome(guild_id: int, motion: Motion, stage: str) -> str | None:
+    """
+    "approve" or "reject" once the eligible members who have not voted could no
+    longer change the stage result, else None. Mirrors handle_motion_timeout:
+    the stage passes only with more approvals than rejections.
+    """
+    if guild_id not in motion_stage_voters_ready:
+        return None
+    eligible = motion_stage_voters[guild_id][stage]
+    votes = motion.stage_votes(stage)
+    approvals, rejections = len(votes["approve"]), len(votes["reject"])
+    cast = sum(1 for option in MOTION_VOTE_OPTIONS for user_id in votes[option] if user_id in eligible)
+    remaining = max(len(eligible) - cast, 0)
+    if approvals > rejections + remaining:
+        return "approve"
+    if approvals + remaining <= rejections:
+        return "reject"
+    return None
+
+
+def _decided_open_stage(guild_id: int, motion_id: str, stage: str) -> tuple[Motion, str] | None:
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
+    if not motion or motion.status != ("board_voting" if stage == "board" else "o5_voting"):
+        return None
+    outcome = decided_stage_outcome(guild_id, motion, stage)
+    return (motion, outcome) if outcome else None
+
+
+motion_early_close_tasks: dict[tuple[int, str, str], asyncio.Task] = {}
+
+
+async def resolve_motion_stage_early(guild_id: int, motion_id: str, stage: str):
+    """
+    Starts the grace period once a stage looks decided. Votes can still be
+    switched meanwhile, so the stage is re-checked when the period ends.
+    """
+    if not MOTION_EARLY_CLOSE or not is_motion_leader():
+        return
+    key = (guild_id, motion_id, stage)
+    task = motion_early_close_tasks.get(key)
+    if (task and not task.done()) or _decided_open_stage(guild_id, motion_id, stage) is None:
+        return
+    motion_early_close_tasks[key] = create_background_task(close_motion_stage_early(guild_id, motion_id, stage))
+
+
+async def close_motion_stage_early(guild_id: int, motion_id: str, stage: str):
+    await asyncio.sleep(MOTION_EARLY_CLOSE_GRACE_SECONDS)
+    motion_early_close_tasks.pop((guild_id, motion_id, stage), None)
+    decided = _decided_open_stage(guild_id, motion_id, stage)
+    if decided is None or not is_motion_leader():
+        return
+    _, outcome = decided
+
+    # Recorded inside the stage change, so a retried save after a version conflict keeps it.
+    audit = {"stage": stage, "outcome": outcome, "eligible_voters": len(motion_stage_voters[guild_id][stage])}
+    if stage == "board":
+        if outcome == "approve":
+            await move_motion_to_o5(guild_id, motion_id, decided_early=audit)
+        else:
+            await finalize_motion(guild_id, motion_id, "failed_board", decided_early=audit)
+    else:
+        await finalize_motion(guild_id, motion_id, "passed" if outcome == "approve" else "failed_o5", decided_early=audit)
+
+
+async def handle_motion_timeout(guild_id: int, motion_id: str):
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
+    if not motion:
+        return
+
+    deadline = motion.board_deadline if motion.status == "board_voting" else motion.o5_deadline
+    wait_seconds = max((deadline or 0) - time.time(), 0)
+    await asyncio.sleep(wait_seconds)
+
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
+    if not motion or not is_motion_leader():
+        return
+
+    if motion.status == "board_voting":
+        board_votes = motion.board_votes
+        if len(board_votes["approve"]) > len(board_votes["reject"]):
+            await move_motion_to_o5(guild_id, motion_id)
+        else:
+            await finalize_motion(guild_id, motion_id, "failed_board")
+    elif motion.status == "o5_voting":
+        o5_votes = motion.o5_votes
+        if len(o5_votes["approve"]) > len(o5_votes["reject"]):
+            await finalize_motion(guild_id, motion_id, "passed")
+        else:
+            await finalize_motion(guild_id, motion_id, "failed_o5")
+
+
+def schedule_motion_timer(guild_id: int, motion_id: str):
+    task = motion_timer_tasks.get((guild_id, motion_id))
+    if task and not task.done():
+        task.cancel()
+
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
+    if not motion or motion.status not in MOTION_OPEN_STATUSES:
+        return
+    if not is_motion_leader():
+        return
+
+    motion_timer_tasks[(guild_id, motion_id)] = create_background_task(handle_motion_timeout(guild_id, motion_id))
+
+
+def restore_motion_timers(guild_id: int | None = None):
+    """Schedules deadlines for one guild's open motions, or every loaded guild's."""
+    guild_ids = list(motion_states) if guild_id is None else [guild_id]
+    for partition_id in guild_ids:
+        for motion_id, motion in get_motion_state(partition_id)["motions"].items():
+            if motion.status in MOTION_OPEN_STATUSES:
+                schedule_motion_timer(partition_id, motion_id)
+
+
+def register_motion_views(guild_id: int | None = None):
+    guild_ids = list(motion_states) if guild_id is None else [guild_id]
+    for partition_id in guild_ids:
+        for motion_id, motion in get_motion_state(partition_id)["motions"].items():
+            status = motion.status
+            if status == "board_voting" and motion.board_message_id:
+                bot.add_view(MotionVoteView(motion_id, "board"), message_id=motion.board_message_id)
+            if status == "o5_voting" and motion.o5_message_id:
+                bot.add_view(MotionVoteView(motion_id, "o5"), message_id=motion.o5_message_id)
+
+
+# ===================== REPLICA MODE =====================
+_replica_is_leader = False
+_replica_started = False
+_replica_lease_conn = None
+_replica_listen_conn = None
+_replica_claim_conn = None
+_replica_claim_lock = threading.Lock()
+_replica_events: asyncio.Queue | None = None
+
+
+def is_motion_leader() -> bool:
+    """
+    Motion deadlines and bulletin posts must only run once across replicas.
+    Outside replica mode the single process is always the leader.
+    """
+    return not REPLICA_MODE or _replica_is_leader
+
+
+def _connect_replica_database():
+    conn = psycopg2.connect(
+        DATABASE_URL,
+        connect_timeout=5,
+        keepalives=1,
+        keepalives_idle=5,
+        keepalives_interval=2,
+        keepalives_count=2,
+    )
+    conn.autocommit = True
+    return conn
+
+
+def _close_replica_connection(conn):
+    if conn is None:
+        return
+    try:
+        conn.close()
+    except psycopg2.Error:
+        pass
+
+
+def initialize_replica_tables():
+    with psycopg2.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS replica_interaction_claims (
+                    interaction_id BIGINT PRIMARY KEY,
+                    instance_id TEXT NOT NULL,
+                    claimed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+                """
+            )
+
+
+def _notify_replicas(message: str):
+    with psycopg2.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (REPLICA_NOTIFY_CHANNEL, message))
 
 
-async def update_motion_messages(motion_id: str):
-    motion = motion_state["motions"].get(motion_id)
-    if not motion:
+async def publish_replica_event(kind: str, **payload):
+    if not REPLICA_MODE:
         return
 
-    embed = build_motion_embed(motion)
+    message = json.dumps({"origin": INSTANCE_ID, "kind": kind, **payload})
+    try:
+        await asyncio.to_thread(_notify_replicas, message)
+    except Exception as e:
+        print(f"Warning: failed to publish replica event '{kind}'. Error: {e}")
+
 
-    board_channel = await get_channel_by_id(motion["board_channel_id"])
-    if board_channel and motion.get("board_message_id"):
+def _insert_interaction_claim(interaction_id: int) -> bool:
+    """Runs in a worker thread; the lock keeps claims on the one shared connection in turn."""
+    global _replica_claim_conn
+    with _replica_claim_lock:
         try:
-            board_msg = await board_channel.fetch_message(motion["board_message_id"])
-            board_view = MotionVoteView(motion_id, "board") if motion["status"] == "board_voting" else None
-            await board_msg.edit(embed=embed, view=board_view)
-        except (discord.NotFound, discord.Forbidden):
-            pass
+            if _replica_claim_conn is None or _replica_claim_conn.closed:
+                _replica_claim_conn = _connect_replica_database()
+            with _replica_claim_conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO replica_interaction_claims (interaction_id, instance_id)
+                    VALUES (%s, %s)
+                    ON CONFLICT (interaction_id) DO NOTHING
+                    RETURNING interaction_id
+                    """,
+                    (interaction_id, INSTANCE_ID),
+                )
+                return cur.fetchone() is not None
+        except Exception:
+            _close_replica_connection(_replica_claim_conn)
+            _replica_claim_conn = None
+            raise
 
-    if motion.get("o5_message_id") and motion.get("o5_channel_id"):
-        o5_channel = await get_channel_by_id(motion["o5_channel_id"])
-        if o5_channel:
-            try:
-                o5_msg = await o5_channel.fetch_message(motion["o5_message_id"])
-                o5_view = MotionVoteView(motion_id, "o5") if motion["status"] == "o5_voting" else None
-                await o5_msg.edit(embed=embed, view=o5_view)
-            except (discord.NotFound, discord.Forbidden):
-                pass
 
+async def claim_interaction(interaction: discord.Interaction) -> bool:
+    """
+    Every replica receives every interaction from the gateway; the first one to
+    insert the claim row answers it. Followers wait briefly so the leader wins
+    whenever it is alive, which keeps writes on a single process. Motion state
+    saves are conditional anyway, so a follower that wins cannot overwrite the
+    leader's changes.
+    """
+    if not REPLICA_MODE:
+        return True
 
-def build_motion_update_embed(motion: dict, headline: str) -> discord.Embed:
-    embed = build_motion_embed(motion)
-    embed.title = f"Motion {int(motion['motion_number']):03d}"
-    embed.description = (
-        f"**{motion['title']}**\n"
-        f"`{headline}`\n\n"
-        f"{normalize_motion_content(motion['content'])}"
-    )
-    return embed
+    if not _replica_is_leader:
+        await asyncio.sleep(REPLICA_FOLLOWER_CLAIM_DELAY_SECONDS)
 
+    try:
+        with trace_span("replica:claim"):
+            return await asyncio.to_thread(_insert_interaction_claim, interaction.id)
+    except Exception as e:
+        print(f"Warning: interaction claim failed, deferring to leader. Error: {e}")
+        return _replica_is_leader
 
-async def send_bulletin_update(motion: dict, headline: str):
-    updates_channel = await get_channel_by_id(MOTION_UPDATES_CHANNEL_ID)
-    if not updates_channel:
+
+def _check_leader_lease() -> bool:
+    """
+    Runs in a worker thread, since a reconnect can block for connect_timeout.
+    Session-level advisory locks are released by Postgres as soon as the holding
+    connection dies, so a crashed leader frees the lease for the next check. The
+    same goes for our own lease: after a reconnect the lock has to be taken again,
+    since a peer may have acquired it in the meantime.
+    """
+    global _replica_lease_conn
+    try:
+        reconnected = _replica_lease_conn is None or _replica_lease_conn.closed
+        if reconnected:
+            _replica_lease_conn = _connect_replica_database()
+        with _replica_lease_conn.cursor() as cur:
+            if _replica_is_leader and not reconnected:
+                cur.execute("SELECT 1")
+                return True
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (REPLICA_LEADER_LOCK_KEY,))
+            return bool(cur.fetchone()[0])
+    except Exception as e:
+        print(f"Warning: replica lease check failed. Error: {e}")
+        _close_replica_connection(_replica_lease_conn)
+        _replica_lease_conn = None
+        return False
+
+
+def _purge_interaction_claims():
+    with _replica_lease_conn.cursor() as cur:
+        cur.execute("DELETE FROM replica_interaction_claims WHERE claimed_at < NOW() - INTERVAL '1 hour'")
+
+
+async def _become_leader():
+    global _replica_is_leader
+    _replica_is_leader = True
+    print(f"Replica {INSTANCE_ID} acquired the motion leader lease.")
+    for guild_id in list(motion_states):
+        if not await apply_remote_motion_state(guild_id):
+            restore_motion_timers(guild_id)
+    start_scheduler()
+    start_outbox_dispatcher()
+
+
+def _step_down_as_leader():
+    global _replica_is_leader
+    _replica_is_leader = False
+    print(f"Replica {INSTANCE_ID} lost the motion leader lease.")
+    stop_scheduler()
+    stop_outbox_dispatcher()
+    for tasks in (motion_timer_tasks, motion_early_close_tasks):
+        for task in tasks.values():
+            task.cancel()
+        tasks.clear()
+
+
+def _drain_replica_notifications():
+    conn = _replica_listen_conn
+    if conn is None:
+        return
+    try:
+        conn.poll()
+    except psycopg2.Error as e:
+        print(f"Warning: replica listener connection failed. Error: {e}")
+        _stop_replica_listener()
         return
 
-    embed = build_motion_update_embed(motion, headline)
+    while conn.notifies:
+        notification = conn.notifies.pop(0)
+        _replica_events.put_nowait(notification.payload)
 
-    existing_message_id = motion.get("updates_message_id")
-    if existing_message_id:
-        try:
-            existing_message = await updates_channel.fetch_message(existing_message_id)
-            await existing_message.edit(embed=embed)
-            return
-        except (discord.NotFound, discord.Forbidden):
-            pass
 
-    sent_message = await updates_channel.send(embed=embed)
-    motion["updates_message_id"] = sent_message.id
-    save_motion_state()
+def _start_replica_listener():
+    global _replica_listen_conn
+    _replica_listen_conn = _connect_replica_database()
+    with _replica_listen_conn.cursor() as cur:
+        cur.execute(f"LISTEN {REPLICA_NOTIFY_CHANNEL}")
+    asyncio.get_running_loop().add_reader(_replica_listen_conn.fileno(), _drain_replica_notifications)
 
 
-async def move_motion_to_o5(motion_id: str, actor: discord.abc.User | None = None):
-    motion = motion_state["motions"].get(motion_id)
-    if not motion or motion["status"] != "board_voting":
+def _stop_replica_listener():
+    global _replica_listen_conn
+    conn = _replica_listen_conn
+    _replica_listen_conn = None
+    if conn is None:
         return
+    try:
+        asyncio.get_running_loop().remove_reader(conn.fileno())
+    except (ValueError, psycopg2.Error):
+        pass
+    _close_replica_connection(conn)
 
-    motion["status"] = "o5_voting"
-    motion["o5_started_at"] = datetime.now(UTC).isoformat()
-    motion["o5_deadline"] = (datetime.now(UTC) + timedelta(hours=24)).isoformat()
 
-    append_motion_audit_entry(
-        motion,
-        action="advanced_to_o5",
-        actor_id=actor.id if actor else None,
-        extra={"votes": _motion_vote_snapshot(motion)},
-    )
+async def apply_remote_motion_state(guild_id: int) -> bool:
+    """
+    Replace one guild's motion state with the copy in Postgres, re-register vote
+    views and (on the leader) reschedule only the motions whose deadline changed.
+    """
+    try:
+        loaded = _load_motion_state_from_database(guild_id)
+    except Exception as e:
+        print(f"Warning: failed to apply replicated motion state. Error: {e}")
+        return False
+    if not loaded:
+        return False
+    remote_state, motion_state_versions[guild_id] = loaded
+
+    previous_motions = motion_states.get(guild_id, {"motions": {}})["motions"]
+    motion_states[guild_id] = remote_state
+    _write_motion_state_file(guild_id)
+    register_motion_views(guild_id)
+
+    for motion_id, motion in remote_state["motions"].items():
+        previous = previous_motions.get(motion_id)
+        # Only new motions and status changes touch the indexes. Postgres search
+        # rows are shared and were already written by the replica that made the change.
+        if previous is None or previous.status != motion.status:
+            motion_list_index.update(guild_id, motion)
+            if not isinstance(motion_search_index, PostgresMotionSearchIndex):
+                motion_search_index.index(guild_id, motion)
+        if (
+            previous is None
+            or previous.status != motion.status
+            or previous.o5_deadline != motion.o5_deadline
+            or (guild_id, motion_id) not in motion_timer_tasks
+        ):
+            schedule_motion_timer(guild_id, motion_id)
+        # Votes claimed by a follower only reach the leader here.
+        if motion.status in MOTION_OPEN_STATUSES:
+            await resolve_motion_stage_early(guild_id, motion_id, "board" if motion.status == "board_voting" else "o5")
+    return True
+
+
+async def process_replica_events():
+    while not bot.is_closed():
+        raw_payload = await _replica_events.get()
+        try:
+            payload = json.loads(raw_payload)
+        except json.JSONDecodeError:
+            continue
+        if payload.get("origin") == INSTANCE_ID:
+            continue
 
-    o5_channel = await get_channel_by_id(O5_MOTIONS_CHANNEL_ID)
-    if o5_channel:
-        embed = build_motion_embed(motion)
-        content = get_motion_stage_ping("o5")
-        o5_msg = await o5_channel.send(content=content, embed=embed, view=MotionVoteView(motion_id, "o5"))
-        motion["o5_channel_id"] = o5_channel.id
-        motion["o5_message_id"] = o5_msg.id
+        try:
+            # Other shard sets share the channel; ignore guilds this process does not serve.
+            if "guild_id" in payload and int(payload["guild_id"]) not in motion_states:
+                continue
+            if payload.get("kind") == "state":
+                await apply_remote_motion_state(int(payload["guild_id"]))
+            elif payload.get("kind") == "link":
+                refresh_roblox_link(int(payload["discord_id"]))
+            elif payload.get("kind") == "outbox" and is_motion_leader():
+                _outbox_wakeup.set()
+            elif payload.get("kind") == "schedule" and is_motion_leader():
+                reload_scheduled_posts()
+            elif payload.get("kind") == "guild_config":
+                refresh_guild_config(int(payload["guild_id"]))
+            elif payload.get("kind") == "bulletin" and is_motion_leader():
+                guild_id = int(payload["guild_id"])
+                await apply_remote_motion_state(guild_id)
+                motion = get_motion_state(guild_id)["motions"].get(payload.get("motion_id"))
+                if motion:
+                    await send_bulletin_update(guild_id, motion, payload.get("headline", "Motion updated"))
+        except Exception as e:
+            print(f"Warning: failed to handle replica event {payload}. Error: {e}")
 
-    save_motion_state()
-    await update_motion_messages(motion_id)
-    await send_bulletin_update(motion, "Motion advanced to O5 Council")
-    schedule_motion_timer(motion_id)
 
+async def run_replica_leader_election():
+    purge_every = max(int(600 / REPLICA_LEASE_CHECK_SECONDS), 1)
+    ticks = 0
+    while not bot.is_closed():
+        holds_lease = await asyncio.to_thread(_check_leader_lease)
+        if holds_lease and not _replica_is_leader:
+            await _become_leader()
+        elif not holds_lease and _replica_is_leader:
+            _step_down_as_leader()
 
-async def finalize_motion(motion_id: str, result: str, actor: discord.abc.User | None = None):
-    motion = motion_state["motions"].get(motion_id)
-    if not motion:
-        return
+        if _replica_listen_conn is None:
+            try:
+                _start_replica_listener()
+                # Notifications sent while the listener was down are lost.
+                for guild_id in list(motion_states):
+                    await apply_remote_motion_state(guild_id)
+            except Exception as e:
+                print(f"Warning: failed to start replica listener. Error: {e}")
+                _stop_replica_listener()
+
+        ticks += 1
+        if _replica_is_leader and ticks % purge_every == 0:
+            try:
+                await asyncio.to_thread(_purge_interaction_claims)
+            except Exception as e:
+                print(f"Warning: failed to purge interaction claims. Error: {e}")
 
-    motion["status"] = result
-    motion["finalized_at"] = datetime.now(UTC).isoformat()
-    if actor:
-        motion["finalized_by"] = actor.id
+        await asyncio.sleep(REPLICA_LEASE_CHECK_SECONDS)
 
-    append_motion_audit_entry(
-        motion,
-        action="finalized",
-        actor_id=actor.id if actor else None,
-        extra={"result": result, "votes": _motion_vote_snapshot(motion)},
-    )
 
-    save_motion_state()
-    await update_motion_messages(motion_id)
+async def start_replica_mode():
+    global _replica_started, _replica_events
+    if _replica_started:
+        return
+    _replica_started = True
+    _replica_events = asyncio.Queue()
+
+    initialize_replica_tables()
+    asyncio.create_task(process_replica_events())
+    asyncio.create_task(run_replica_leader_election())
+    print(f"Replica mode enabled as {INSTANCE_ID}.")
+
+
+# ===================== EVENT LOOP WATCHDOG =====================
+_loop_heartbeat = 0.0
+_loop_thread_id: int | None = None
+_loop_watchdog_started = False
+loop_lag_seconds = 0.0
+loop_lag_max_seconds = 0.0
+blocking_sites: dict[str, dict] = {}
+_blocking_sites_lock = threading.Lock()
+_handler_code_names: dict = {}
+
+
+def _refresh_handler_code_names():
+    """Maps callback code objects to command names so a stack can be attributed."""
+    names = {}
+    for command in bot.tree.walk_commands():
+        if isinstance(command, app_commands.Command):
+            names[inspect.unwrap(command.callback).__code__] = f"/{command.qualified_name}"
+    for handler, label in (
+        (process_vote, "vote button"),
+        (EditAnnouncementModal.on_submit, "announce_edit modal"),
+        (MotionCreateModal.on_submit, "motion create modal"),
+    ):
+        names[inspect.unwrap(handler).__code__] = label
+    _handler_code_names.clear()
+    _handler_code_names.update(names)
 
-    if result == "passed":
-        await send_bulletin_update(motion, "Motion passed")
-    elif result == "failed_board":
-        await send_bulletin_update(motion, "Motion failed at Board")
-    elif result == "failed_o5":
-        await send_bulletin_update(motion, "Motion failed at O5 Council")
-    elif result == "vetoed":
-        await send_bulletin_update(motion, "Motion vetoed")
 
-    task = motion_timer_tasks.pop(motion_id, None)
-    if task:
-        task.cancel()
+def _describe_blocked_stack(frame) -> tuple[str, str, str]:
+    """
+    Returns (active handler, blocking site, formatted stack). The blocking site
+    is the innermost frame in this file: the line that made the blocking call.
+    """
+    active_handler = "unknown"
+    site = None
+    this_file = os.path.abspath(__file__)
+    walker = frame
+    while walker is not None:
+        code = walker.f_code
+        if site is None and os.path.abspath(code.co_filename) == this_file:
+            site = f"bot.py:{walker.f_lineno} ({code.co_name})"
+        if active_handler == "unknown" and code in _handler_code_names:
+            active_handler = _handler_code_names[code]
+        walker = walker.f_back
+
+    stack = "".join(traceback.format_stack(frame, limit=LOOP_WATCHDOG_STACK_DEPTH))
+    if site is None:
+        innermost = frame.f_code
+        site = f"{os.path.basename(innermost.co_filename)}:{frame.f_lineno} ({innermost.co_name})"
+    return active_handler, site, stack
+
+
+def _record_blocking_site(site: str, handler: str, blocked_seconds: float):
+    with _blocking_sites_lock:
+        entry = blocking_sites.setdefault(site, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "handler": handler})
+        entry["count"] += 1
+        entry["total_seconds"] += blocked_seconds
+        entry["max_seconds"] = max(entry["max_seconds"], blocked_seconds)
+        entry["handler"] = handler
+    EVENT_LOOP_BLOCKED_SECONDS.inc(blocked_seconds, site=site)
+
+
+def get_top_blocking_sites(limit: int = LOOP_BLOCKING_TOP_N) -> list[tuple[str, dict]]:
+    with _blocking_sites_lock:
+        ranked = sorted(blocking_sites.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+        return [(site, dict(entry)) for site, entry in ranked[:limit]]
+
+
+def _run_loop_watchdog():
+    """
+    Runs on its own thread: if the loop heartbeat stops advancing for longer
+    than the threshold, the loop thread is stuck in a synchronous call, so its
+    current stack points at the culprit.
+    """
+    stall = None
+    while True:
+        time.sleep(LOOP_WATCHDOG_INTERVAL_SECONDS / 2)
+        heartbeat = _loop_heartbeat
+        stalled_for = time.monotonic() - heartbeat
+
+        if stall and heartbeat != stall["heartbeat"]:
+            blocked_seconds = heartbeat - stall["heartbeat"]
+            _record_blocking_site(stall["site"], stall["handler"], blocked_seconds)
+            print(f"Event loop resumed after {blocked_seconds:.2f}s blocked at {stall['site']}.")
+            stall = None
+
+        if stall is None and stalled_for > LOOP_LAG_THRESHOLD_SECONDS:
+            frame = sys._current_frames().get(_loop_thread_id)
+            if frame is None:
+                continue
+            handler, site, stack = _describe_blocked_stack(frame)
+            stall = {"heartbeat": heartbeat, "site": site, "handler": handler}
+            print(
+                f"Warning: event loop blocked for {stalled_for:.2f}s in {handler} at {site}.\n"
+                f"{stack}"
+            )
 
 
-async def handle_motion_timeout(motion_id: str):
-    motion = motion_state["motions"].get(motion_id)
-    if not motion:
-        return
+async def _measure_loop_lag():
+    global _loop_heartbeat, loop_lag_seconds, loop_lag_max_seconds
+    while True:
+        expected = time.monotonic() + LOOP_WATCHDOG_INTERVAL_SECONDS
+        await asyncio.sleep(LOOP_WATCHDOG_INTERVAL_SECONDS)
+        now = time.monotonic()
+        _loop_heartbeat = now
+        loop_lag_seconds = max(now - expected, 0.0)
+        loop_lag_max_seconds = max(loop_lag_max_seconds, loop_lag_seconds)
+        EVENT_LOOP_LAG_SECONDS.observe(loop_lag_seconds)
 
-    now = datetime.now(UTC)
-    deadline_key = "board_deadline" if motion["status"] == "board_voting" else "o5_deadline"
-    deadline = datetime.fromisoformat(motion[deadline_key])
-    wait_seconds = max((deadline - now).total_seconds(), 0)
-    await asyncio.sleep(wait_seconds)
 
-    motion = motion_state["motions"].get(motion_id)
-    if not motion:
+def start_loop_watchdog():
+    global _loop_watchdog_started, _loop_thread_id, _loop_heartbeat
+    if _loop_watchdog_started or LOOP_LAG_THRESHOLD_SECONDS <= 0:
         return
+    _loop_watchdog_started = True
+    _loop_thread_id = threading.get_ident()
+    _loop_heartbeat = time.monotonic()
+    _refresh_handler_code_names()
 
-    if motion["status"] == "board_voting":
-        board_votes = motion["board_votes"]
-        if len(board_votes["approve"]) > len(board_votes["reject"]):
-            await move_motion_to_o5(motion_id)
-        else:
-            await finalize_motion(motion_id, "failed_board")
-    elif motion["status"] == "o5_voting":
-        o5_votes = motion["o5_votes"]
-        if len(o5_votes["approve"]) > len(o5_votes["reject"]):
-            await finalize_motion(motion_id, "passed")
-        else:
-            await finalize_motion(motion_id, "failed_o5")
+    asyncio.create_task(_measure_loop_lag())
+    threading.Thread(target=_run_loop_watchdog, name="loop-watchdog", daemon=True).start()
 
 
-def schedule_motion_timer(motion_id: str):
-    task = motion_timer_tasks.get(motion_id)
-    if task and not task.done():
-        task.cancel()
+# ===================== RUNTIME STATS =====================
+_audit_log_size = {"bytes": 0, "measured_at": 0.0}
 
-    motion = motion_state["motions"].get(motion_id)
-    if not motion or motion["status"] not in {"board_voting", "o5_voting"}:
-        return
 
-    motion_timer_tasks[motion_id] = asyncio.create_task(handle_motion_timeout(motion_id))
+def get_process_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def get_audit_log_bytes() -> int:
+    now = time.monotonic()
+    if _audit_log_size["measured_at"] and now - _audit_log_size["measured_at"] < STATS_AUDIT_SIZE_CACHE_SECONDS:
+        return _audit_log_size["bytes"]
+
+    if orjson is not None:
+        total = sum(len(orjson.dumps(motion.audit_log)) for motion in iter_all_motions())
+    else:
+        total = sum(len(json.dumps(motion.audit_log, separators=(",", ":"))) for motion in iter_all_motions())
+    _audit_log_size.update(bytes=total, measured_at=now)
+    return total
+
 
+def count_motions_by_status() -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for motion in iter_all_motions():
+        counts[motion.status] = counts.get(motion.status, 0) + 1
+    return counts
 
-def restore_motion_timers():
-    for motion_id, motion in motion_state["motions"].items():
-        if motion["status"] in {"board_voting", "o5_voting"}:
-            schedule_motion_timer(motion_id)
+
+def get_cache_stats() -> dict[str, dict]:
+    """Entry counts and ages for the in-process caches; age is None when empty."""
+    group_roles_age = time.time() - _group_roles_cache_time if _group_roles_cache else None
+    oldest_permission = min((built_at for _, built_at in _permission_cache.values()), default=None)
+    oldest_link = min((cached_at for _, cached_at in _message_link_cache.values()), default=None)
+    return {
+        "group_roles": {"entries": len(_group_roles_cache or []), "age_seconds": group_roles_age},
+        "permission_profile": {
+            "entries": len(_permission_cache),
+            "age_seconds": time.monotonic() - oldest_permission if oldest_permission is not None else None,
+        },
+        "message_link": {
+            "entries": len(_message_link_cache),
+            "age_seconds": time.monotonic() - oldest_link if oldest_link is not None else None,
+        },
+        "roblox_link": {"entries": len(roblox_links_by_discord), "age_seconds": None},
+    }
 
 
-def register_motion_views():
-    for motion_id, motion in motion_state["motions"].items():
-        status = motion.get("status")
-        if status == "board_voting" and motion.get("board_message_id"):
-            bot.add_view(MotionVoteView(motion_id, "board"), message_id=motion["board_message_id"])
-        if status == "o5_voting" and motion.get("o5_message_id"):
-            bot.add_view(MotionVoteView(motion_id, "o5"), message_id=motion["o5_message_id"])
+Gauge(
+    "scpfbot_motions",
+    "Stored motions by status.",
+    lambda: {(status,): count for status, count in count_motions_by_status().items()},
+    ("status",),
+)
+Gauge(
+    "scpfbot_motion_state_bytes",
+    "Serialized motion state size; audit_log is the part taken by audit logs.",
+    lambda: {("total",): sum(motion_state_serialized_bytes.values()), ("audit_log",): get_audit_log_bytes()},
+    ("part",),
+)
+Gauge("scpfbot_persistent_views", "Persistent views registered with the client.", lambda: len(bot.persistent_views))
+Gauge(
+    "scpfbot_cache_entries",
+    "Entries held by in-process caches.",
+    lambda: {(name,): stats["entries"] for name, stats in get_cache_stats().items()},
+    ("cache",),
+)
+Gauge(
+    "scpfbot_cache_age_seconds",
+    "Age of the oldest entry in each in-process cache.",
+    lambda: {(name,): stats["age_seconds"] for name, stats in get_cache_stats().items() if stats["age_seconds"] is not None},
+    ("cache",),
+)
+Gauge(
+    "scpfbot_rate_limiter_keys",
+    "Keys tracked by the in-memory rate limiter.",
+    lambda: rate_limiter.size() if isinstance(rate_limiter, InMemoryRateLimiter) else {},
+)
+Gauge("scpfbot_process_resident_bytes", "Resident set size of the bot process.", lambda: get_process_rss_bytes() or {})
+Gauge("scpfbot_event_loop_lag_current_seconds", "Most recent event loop lag sample.", lambda: loop_lag_seconds)
 
 
+@timed(INTERACTION_SECONDS, kind="button", name="process_vote")
+@traced("process_vote")
 async def process_vote(interaction: discord.Interaction, motion_id: str, stage: str, vote_type: str):
-    motion = motion_state["motions"].get(motion_id)
+    guild_id = interaction.guild_id
+    motion = get_motion_state(guild_id)["motions"].get(motion_id)
     if not motion:
         await interaction.response.send_message("Motion data not found.", ephemeral=True)
         return
 
     expected_status = "board_voting" if stage == "board" else "o5_voting"
-    if motion["status"] != expected_status:
+    if motion.status != expected_status:
         await interaction.response.send_message("That voting stage is no longer active.", ephemeral=True)
         return
 
-    if not isinstance(interaction.user, discord.Member) or not can_vote_stage(interaction.user, stage):
+    if not can_vote_stage(interaction.user, stage):
         await interaction.response.send_message("You do not have permission to vote in this stage.", ephemeral=True)
         return
 
-    stage_votes = motion["board_votes"] if stage == "board" else motion["o5_votes"]
-
     user_id = interaction.user.id
-    for vote_option in MOTION_VOTE_OPTIONS:
-        if user_id in stage_votes[vote_option]:
-            stage_votes[vote_option].remove(user_id)
-    stage_votes[vote_type].append(user_id)
 
-    append_motion_audit_entry(
-        motion,
-        action="vote_cast",
-        actor_id=user_id,
-        extra={"stage": stage, "vote": vote_type},
-    )
+    def cast_vote(state: dict) -> bool:
+        motion = state["motions"].get(motion_id)
+        if not motion or motion.status != expected_status:
+            return False
+        stage_votes = motion.stage_votes(stage)
+        for vote_option in MOTION_VOTE_OPTIONS:
+            if user_id in stage_votes[vote_option]:
+                stage_votes[vote_option].remove(user_id)
+        stage_votes[vote_type].append(user_id)
+        append_motion_audit_entry(
+            motion,
+            action="vote_cast",
+            actor_id=user_id,
+            extra={"stage": stage, "vote": vote_type},
+        )
+        return True
 
-    save_motion_state()
-    await update_motion_messages(motion_id)
+    if not await update_motion_state(guild_id, cast_vote):
+        motion = get_motion_state(guild_id)["motions"].get(motion_id)
+        if motion and motion.status == expected_status:
+            await interaction.response.send_message("Your vote could not be recorded; please try again.", ephemeral=True)
+        else:
+            await interaction.response.send_message("That voting stage is no longer active.", ephemeral=True)
+        return
+
+    await update_motion_messages(guild_id, motion_id)
     await interaction.response.send_message(f"Vote recorded: **{vote_type}**.", ephemeral=True)
+    await resolve_motion_stage_early(guild_id, motion_id, stage)
 
 
 class MotionVoteView(discord.ui.View):
@@ -1270,6 +5875,9 @@ class MotionVoteView(discord.ui.View):
                 vote_name = (child.label or "vote").lower()
                 child.custom_id = f"motion:{motion_id}:{stage}:{vote_name}"
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await claim_interaction(interaction)
+
     @discord.ui.button(label="Approve", style=discord.ButtonStyle.success, emoji=MOTION_EMOJIS["approve"]["button"])
     async def approve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await process_vote(interaction, self.motion_id, self.stage, "approve")
@@ -1283,13 +5891,15 @@ class MotionVoteView(discord.ui.View):
         await process_vote(interaction, self.motion_id, self.stage, "abstain")
 
 
+@traced("create_motion_post")
 async def create_motion_post(
     interaction: discord.Interaction,
     title: str,
     content: str,
 ):
+    guild_id = interaction.guild_id
     initial_status = "board_voting"
-    target_channel_id = BOARD_MOTIONS_CHANNEL_ID
+    target_channel_id = get_guild_config(guild_id).board_motions_channel_id
     target_channel_name = "Board motions"
 
     target_channel = await get_channel_by_id(target_channel_id)
@@ -1301,26 +5911,19 @@ async def create_motion_post(
             await interaction.response.send_message(error_message, ephemeral=True)
         return
 
-    motion_number = reserve_motion_number()
+    motion_number = reserve_motion_number(guild_id)
     motion_id = str(motion_number)
-    motion = {
-        "motion_number": motion_number,
-        "title": title,
-        "content": normalize_motion_content(content),
-        "proposer_id": interaction.user.id,
-        "status": initial_status,
-        "created_at": datetime.now(UTC).isoformat(),
-        "board_deadline": (datetime.now(UTC) + timedelta(hours=24)).isoformat() if initial_status == "board_voting" else None,
-        "board_channel_id": BOARD_MOTIONS_CHANNEL_ID,
-        "board_message_id": None,
-        "o5_started_at": None,
-        "o5_deadline": None,
-        "o5_channel_id": None,
-        "o5_message_id": None,
-        "board_votes": {"approve": [], "reject": [], "abstain": []},
-        "o5_votes": {"approve": [], "reject": [], "abstain": []},
-        "audit_log": [],
-    }
+    created_at = epoch_now()
+    motion = Motion(
+        motion_number=motion_number,
+        title=title,
+        content=normalize_motion_content(content),
+        proposer_id=interaction.user.id,
+        status=initial_status,
+        created_at=created_at,
+        board_deadline=created_at + MOTION_STAGE_DURATION_SECONDS if initial_status == "board_voting" else None,
+        board_channel_id=target_channel_id,
+    )
 
     append_motion_audit_entry(
         motion,
@@ -1330,7 +5933,7 @@ async def create_motion_post(
     )
 
     embed = build_motion_embed(motion)
-    opening_message = get_motion_stage_ping("board")
+    opening_message = get_motion_stage_ping(guild_id, "board")
 
     motion_msg = await target_channel.send(
         content=opening_message,
@@ -1338,10 +5941,14 @@ async def create_motion_post(
         view=MotionVoteView(motion_id, "board"),
     )
 
-    motion["board_message_id"] = motion_msg.id
-    motion_state["motions"][motion_id] = motion
-    save_motion_state()
-    schedule_motion_timer(motion_id)
+    motion.board_message_id = motion_msg.id
+
+    def add_motion(state: dict):
+        state["motions"][motion_id] = motion
+
+    await update_motion_state(guild_id, add_motion)
+    index_motion(guild_id, motion)
+    schedule_motion_timer(guild_id, motion_id)
 
     if interaction.response.is_done():
         await interaction.followup.send(
@@ -1368,11 +5975,15 @@ class MotionCreateModal(discord.ui.Modal, title="Create Motion"):
         super().__init__()
         self.motion_title = motion_title
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await claim_interaction(interaction)
+
+    @timed(INTERACTION_SECONDS, kind="modal", name="motion_create")
     async def on_submit(self, interaction: discord.Interaction):
         await create_motion_post(interaction, self.motion_title, str(self.motion_content))
 
 
-motion_group = app_commands.Group(name="motion", description="Motion lifecycle and voting commands")
+motion_group = app_commands.Group(name="motion", description="Motion lifecycle and voting commands", guild_only=True)
 
 
 @motion_group.command(name="create", description="Create a new motion for Board review.")
@@ -1381,9 +5992,7 @@ motion_group = app_commands.Group(name="motion", description="Motion lifecycle a
     content="Optional. If omitted, a popup opens for easier multi-line formatting.",
 )
 async def motion_create(interaction: discord.Interaction, title: str, content: str | None = None):
-    if not isinstance(interaction.user, discord.Member) or not member_has_any_role(
-        interaction.user, [BOARD_ROLE_ID, O5_ROLE_ID, COUNCIL_CHAIRMAN_ROLE_ID, ADMINISTRATOR_ROLE_ID]
-    ):
+    if not get_permission_profile(interaction.user).can_create_motions:
         await interaction.response.send_message("You do not have permission to create motions.", ephemeral=True)
         return
 
@@ -1394,24 +6003,57 @@ async def motion_create(interaction: discord.Interaction, title: str, content: s
     await create_motion_post(interaction, title, content)
 
 
+def motion_choice(motion: Motion) -> app_commands.Choice[int]:
+    return app_commands.Choice(
+        name=_clip(f"#{motion.motion_number:03d} {motion.title} ({motion.status})", 100), value=motion.motion_number
+    )
+
+
+def motion_number_autocomplete(open_only: bool = False):
+    """Suggests motions by number prefix (newest first) or, for text, through the search index."""
+    async def autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[int]]:
+        state = get_motion_state(interaction.guild_id)
+        current = current.strip().lstrip("#")
+        if current and not current.isdigit():
+            numbers = await search_motions(interaction.guild_id, current, limit=100 if open_only else 25)
+        else:
+            # Motion numbers are dense, so counting down from the counter never walks the motions dict.
+            candidates = (
+                motion_list_index.open_motions(interaction.guild_id) if open_only
+                else range(state["next_motion_number"] - 1, 0, -1)
+            )
+            numbers = (n for n in candidates if str(n).startswith(current) or f"{n:03d}".startswith(current))
+        choices = []
+        for number in numbers:
+            motion = state["motions"].get(str(number))
+            if motion is None or (open_only and motion.status not in MOTION_OPEN_STATUSES):
+                continue
+            choices.append(motion_choice(motion))
+            if len(choices) == 25:
+                break
+        return choices
+    return autocomplete
+
+
 @motion_group.command(name="pass", description="Manually pass a motion to next stage or final pass.")
 @app_commands.describe(motion_number="Motion number (e.g. 1 for #001)")
+@app_commands.autocomplete(motion_number=motion_number_autocomplete(open_only=True))
 async def motion_pass(interaction: discord.Interaction, motion_number: int):
-    if not isinstance(interaction.user, discord.Member) or not can_manage_motions(interaction.user):
+    if not can_manage_motions(interaction.user):
         await interaction.response.send_message("You do not have permission to pass motions.", ephemeral=True)
         return
 
     motion_id = str(motion_number)
-    motion = motion_state["motions"].get(motion_id)
+    motion = get_motion_state(interaction.guild_id)["motions"].get(motion_id)
     if not motion:
         await interaction.response.send_message("Motion not found.", ephemeral=True)
         return
 
-    if motion["status"] == "board_voting":
-        await move_motion_to_o5(motion_id, interaction.user)
+    if motion.status == "board_voting":
+        await move_motion_to_o5(interaction.guild_id, motion_id, interaction.user)
         await interaction.response.send_message("Motion passed Board and moved to O5 voting.", ephemeral=True)
-    elif motion["status"] == "o5_voting":
-        await finalize_motion(motion_id, "passed", interaction.user)
+    elif motion.status == "o5_voting":
+        await finalize_motion(interaction.guild_id, motion_id, "passed", interaction.user)
         await interaction.response.send_message("Motion marked as passed.", ephemeral=True)
     else:
         await interaction.response.send_message("This motion is already finalized.", ephemeral=True)
@@ -1419,22 +6061,23 @@ async def motion_pass(interaction: discord.Interaction, motion_number: int):
 
 @motion_group.command(name="reject", description="Manually reject a motion in its current stage.")
 @app_commands.describe(motion_number="Motion number (e.g. 1 for #001)")
+@app_commands.autocomplete(motion_number=motion_number_autocomplete(open_only=True))
 async def motion_reject(interaction: discord.Interaction, motion_number: int):
-    if not isinstance(interaction.user, discord.Member) or not can_manage_motions(interaction.user):
+    if not can_manage_motions(interaction.user):
         await interaction.response.send_message("You do not have permission to reject motions.", ephemeral=True)
         return
 
     motion_id = str(motion_number)
-    motion = motion_state["motions"].get(motion_id)
+    motion = get_motion_state(interaction.guild_id)["motions"].get(motion_id)
     if not motion:
         await interaction.response.send_message("Motion not found.", ephemeral=True)
         return
 
-    if motion["status"] == "board_voting":
-        await finalize_motion(motion_id, "failed_board", interaction.user)
+    if motion.status == "board_voting":
+        await finalize_motion(interaction.guild_id, motion_id, "failed_board", interaction.user)
         await interaction.response.send_message("Motion rejected at Board stage.", ephemeral=True)
-    elif motion["status"] == "o5_voting":
-        await finalize_motion(motion_id, "failed_o5", interaction.user)
+    elif motion.status == "o5_voting":
+        await finalize_motion(interaction.guild_id, motion_id, "failed_o5", interaction.user)
         await interaction.response.send_message("Motion rejected at O5 stage.", ephemeral=True)
     else:
         await interaction.response.send_message("This motion is already finalized.", ephemeral=True)
@@ -1442,43 +6085,650 @@ async def motion_reject(interaction: discord.Interaction, motion_number: int):
 
 @motion_group.command(name="veto", description="Veto a motion and stop it immediately.")
 @app_commands.describe(motion_number="Motion number (e.g. 1 for #001)")
+@app_commands.autocomplete(motion_number=motion_number_autocomplete(open_only=True))
 async def motion_veto(interaction: discord.Interaction, motion_number: int):
-    if not isinstance(interaction.user, discord.Member) or not can_manage_motions(interaction.user):
+    if not can_manage_motions(interaction.user):
         await interaction.response.send_message("You do not have permission to veto motions.", ephemeral=True)
         return
 
     motion_id = str(motion_number)
-    motion = motion_state["motions"].get(motion_id)
+    motion = get_motion_state(interaction.guild_id)["motions"].get(motion_id)
     if not motion:
         await interaction.response.send_message("Motion not found.", ephemeral=True)
         return
 
-    if motion["status"] in {"passed", "failed_board", "failed_o5", "vetoed"}:
+    if motion.status in MOTION_FINAL_STATUSES:
         await interaction.response.send_message("This motion is already finalized.", ephemeral=True)
         return
 
-    await finalize_motion(motion_id, "vetoed", interaction.user)
+    await finalize_motion(interaction.guild_id, motion_id, "vetoed", interaction.user)
     await interaction.response.send_message("Motion vetoed.", ephemeral=True)
 
 
 @motion_group.command(name="status", description="View motion status and vote breakdown.")
 @app_commands.describe(motion_number="Motion number (e.g. 1 for #001)")
+@app_commands.autocomplete(motion_number=motion_number_autocomplete())
 async def motion_status(interaction: discord.Interaction, motion_number: int):
-    motion = motion_state["motions"].get(str(motion_number))
+    motion = get_motion_state(interaction.guild_id)["motions"].get(str(motion_number))
     if not motion:
         await interaction.response.send_message("Motion not found.", ephemeral=True)
         return
 
     await interaction.response.send_message(embed=build_motion_embed(motion), ephemeral=True)
 
+@motion_group.command(name="search", description="Find motions by title, text, proposer or status.")
+@app_commands.describe(
+    query="Words to look for (prefixes match); mention a member to find their proposals",
+    limit="How many motions to show (max 25)",
+)
+async def motion_search(interaction: discord.Interaction, query: str, limit: app_commands.Range[int, 1, 25] = 10):
+    motions = get_motion_state(interaction.guild_id)["motions"]
+    numbers = await search_motions(interaction.guild_id, query, limit)
+    results = [motions[str(number)] for number in numbers if str(number) in motions]
+    if not results:
+        await interaction.response.send_message("No motions match that search.", ephemeral=True)
+        return
+
+    embed = discord.Embed(title=_clip(f"Motion Search: {query}", 256), color=discord.Color.blurple())
+    for motion in results:
+        embed.add_field(
+            name=_clip(f"#{motion.motion_number:03d} || {motion.title}", 256),
+            value=f"`{motion.status}` · proposed by <@{motion.proposer_id}> · <t:{motion.created_at}:D>",
+            inline=False,
+        )
+    embed.set_footer(text="Best matches first · /motion status <number> for details")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+MOTION_LIST_PAGE_SIZE = 10
+MOTION_LIST_STATUS_FILTERS = {
+    "open": ("board_voting", "o5_voting"),
+    "board_voting": ("board_voting",),
+    "o5_voting": ("o5_voting",),
+    "passed": ("passed",),
+    "failed": ("failed_board", "failed_o5"),
+    "failed_board": ("failed_board",),
+    "failed_o5": ("failed_o5",),
+    "vetoed": ("vetoed",),
+}
+MOTION_LIST_STATUS_CHOICES = [
+    app_commands.Choice(name="Open (any voting stage)", value="open"),
+    app_commands.Choice(name="Board voting", value="board_voting"),
+    app_commands.Choice(name="O5 voting", value="o5_voting"),
+    app_commands.Choice(name="Passed", value="passed"),
+    app_commands.Choice(name="Failed (either stage)", value="failed"),
+    app_commands.Choice(name="Failed at Board", value="failed_board"),
+    app_commands.Choice(name="Failed at O5", value="failed_o5"),
+    app_commands.Choice(name="Vetoed", value="vetoed"),
+]
+
+
+def parse_motion_list_date(text: str, end_of_day: bool = False) -> int:
+    """`YYYY-MM-DD` (a whole UTC day), a Discord timestamp or a unix time."""
+    text = text.strip()
+    if match := re.fullmatch(r"<t:(\d+)(?::[tTdDfFR])?>|(\d{9,11})", text):
+        return int(match.group(1) or match.group(2))
+    try:
+        day = datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=UTC)
+    except ValueError:
+        raise ValueError("Use `YYYY-MM-DD` (UTC), a Discord timestamp or a unix time.") from None
+    return int((day + timedelta(days=1)).timestamp()) - 1 if end_of_day else int(day.timestamp())
+
+
+class MotionListView(discord.ui.View):
+    """Pages through a fixed list of motion numbers; page clicks never re-query."""
+
+    def __init__(self, guild_id: int, numbers: list[int], filters: str):
+        super().__init__(timeout=600)
+        self.guild_id = guild_id
+        self.numbers = numbers
+        self.filters = filters
+        self.page = 0
+        self.page_count = max((len(numbers) + MOTION_LIST_PAGE_SIZE - 1) // MOTION_LIST_PAGE_SIZE, 1)
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    def build_embed(self) -> discord.Embed:
+        motions = get_motion_state(self.guild_id)["motions"]
+        start = self.page * MOTION_LIST_PAGE_SIZE
+        embed = discord.Embed(title="Motions", description=self.filters or None, color=discord.Color.blurple())
+        for number in self.numbers[start:start + MOTION_LIST_PAGE_SIZE]:
+            motion = motions.get(str(number))
+            if motion is None:
+                continue
+            embed.add_field(
+                name=_clip(f"#{motion.motion_number:03d} || {motion.title}", 256),
+                value=f"`{motion.status}` · proposed by <@{motion.proposer_id}> · <t:{motion.created_at}:D>",
+                inline=False,
+            )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.page_count} · {len(self.numbers)} motions")
+        return embed
+
+    async def _show_page(self, interaction: discord.Interaction, page: int):
+        self.page = min(max(page, 0), self.page_count - 1)
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page + 1)
+
+
+@motion_group.command(name="list", description="List motions, newest first, filtered by status, proposer or date.")
+@app_commands.choices(status=MOTION_LIST_STATUS_CHOICES)
+@app_commands.describe(
+    status="Only motions in this state",
+    proposer="Only motions proposed by this member",
+    after="Created on or after (YYYY-MM-DD, UTC)",
+    before="Created on or before (YYYY-MM-DD, UTC)",
+)
+async def motion_list(
+    interaction: discord.Interaction,
+    status: app_commands.Choice[str] | None = None,
+    proposer: discord.Member | None = None,
+    after: str | None = None,
+    before: str | None = None,
+):
+    try:
+        created_after = parse_motion_list_date(after) if after else None
+        created_before = parse_motion_list_date(before, end_of_day=True) if before else None
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+
+    numbers = motion_list_index.query(
+        interaction.guild_id,
+        statuses=MOTION_LIST_STATUS_FILTERS[status.value] if status else (),
+        proposer_id=proposer.id if proposer else None,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    if not numbers:
+        await interaction.response.send_message("No motions match those filters.", ephemeral=True)
+        return
+
+    filters = [
+        f"Status: **{status.name}**" if status else "",
+        f"Proposer: {proposer.mention}" if proposer else "",
+        f"After: <t:{created_after}:D>" if created_after is not None else "",
+        f"Before: <t:{created_before}:D>" if created_before is not None else "",
+    ]
+    view = MotionListView(interaction.guild_id, numbers, " · ".join(filter(None, filters)))
+    await interaction.response.send_message(
+        embed=view.build_embed(),
+        view=view if view.page_count > 1 else discord.utils.MISSING,
+        ephemeral=True,
+    )
+
+# --- MOTION EXPORT ---
+MOTION_EXPORT_CSV_COLUMNS = (
+    "record", "motion_number", "title", "status", "proposer_id", "created_at", "finalized_at",
+    "stage", "vote", "user_id", "action", "actor_id", "timestamp", "details",
+)
+
+
+def _export_time(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, UTC).isoformat()
+    return str(value)
+
+
+def motion_export_csv_rows(motion: Motion):
+    """One `motion` row, then a `vote` row per ballot and an `audit` row per audit entry."""
+    number = motion.motion_number
+    yield {
+        "record": "motion",
+        "motion_number": number,
+        "title": motion.title,
+        "status": motion.status,
+        "proposer_id": motion.proposer_id,
+        "created_at": _export_time(motion.created_at),
+        "finalized_at": _export_time(motion.finalized_at),
+    }
+    for stage in ("board", "o5"):
+        votes = motion.stage_votes(stage)
+        for option in MOTION_VOTE_OPTIONS:
+            for user_id in votes[option]:
+                yield {"record": "vote", "motion_number": number, "stage": stage, "vote": option, "user_id": user_id}
+    for entry in motion.audit_log:
+        details = {key: value for key, value in entry.items() if key not in {"timestamp", "action", "actor_id"}}
+        yield {
+            "record": "audit",
+            "motion_number": number,
+            "action": entry.get("action"),
+            "actor_id": entry.get("actor_id"),
+            "timestamp": _export_time(entry.get("timestamp")),
+            "details": json.dumps(details, separators=(",", ":")) if details else "",
+        }
+
+
+def _iter_motions_from_database(guild_id: int, statuses: tuple[str, ...]):
+    """
+    Streams one motion at a time through a server-side cursor over jsonb_each,
+    so the client never holds more than MOTION_EXPORT_FETCH_SIZE motions.
+    """
+    with psycopg2.connect(DATABASE_URL) as conn:
+        with conn.cursor(name="motion_export") as cur:
+            cur.itersize = MOTION_EXPORT_FETCH_SIZE
+            cur.execute(
+                """
+                SELECT motion.key, motion.value::text
+                FROM bot_state, jsonb_each(bot_state.state_value->'motions') AS motion
+                WHERE bot_state.state_key = %s
+                  AND (%s OR motion.value->>'status' = ANY(%s))
+                ORDER BY motion.key::int
+                """,
+                (motion_partition_keys(guild_id)[0], not statuses, list(statuses)),
+            )
+            for motion_id, raw in cur:
+                yield Motion.from_dict(json.loads(raw), motion_id)
+
+
+def iter_exported_motions(
+    guild_id: int,
+    statuses: tuple[str, ...] = (),
+    created_after: int | None = None,
+    created_before: int | None = None,
+    snapshot: list[Motion] | None = None,
+):
+    """`snapshot` is the in-memory partition, listed on the event loop before the export moves to a thread."""
+    if DATABASE_URL:
+        motions = _iter_motions_from_database(guild_id, statuses)
+    elif snapshot is not None:
+        motions = sorted(snapshot, key=lambda motion: motion.motion_number)
+    else:
+        state_file = motion_partition_keys(guild_id)[1]
+        if not os.path.exists(state_file):
+            return
+        with open(state_file, "rb") as f:
+            motions = sorted(decode_motion_state(f.read())["motions"].values(), key=lambda motion: motion.motion_number)
+
+    for motion in motions:
+        if statuses and motion.status not in statuses:
+            continue
+        if created_after is not None and motion.created_at < created_after:
+            continue
+        if created_before is not None and motion.created_at > created_before:
+            continue
+        yield motion
+
+
+def export_motions(
+    fileobj,
+    guild_id: int,
+    file_format: str = "ndjson",
+    statuses: tuple[str, ...] = (),
+    created_after: int | None = None,
+    created_before: int | None = None,
+    snapshot: list[Motion] | None = None,
+) -> int:
+    """Writes gzip-compressed NDJSON (one motion per line) or CSV to `fileobj`; returns the motion count."""
+    count = 0
+    motions = iter_exported_motions(guild_id, statuses, created_after, created_before, snapshot)
+    with io.TextIOWrapper(gzip.GzipFile(fileobj=fileobj, mode="wb"), encoding="utf-8", newline="") as out:
+        if file_format == "csv":
+            writer = csv.DictWriter(out, fieldnames=MOTION_EXPORT_CSV_COLUMNS)
+            writer.writeheader()
+            for motion in motions:
+                writer.writerows(motion_export_csv_rows(motion))
+                count += 1
+        else:
+            for motion in motions:
+                out.write(json.dumps({"guild_id": guild_id, **motion.to_dict()}, separators=(",", ":")) + "\n")
+                count += 1
+    return count
+
+
+def run_motion_export_cli(argv: list[str]) -> int:
+    """`python bot.py export-motions ...`: writes the same file as /motion export, without Discord."""
+    global HOME_GUILD_ID
+    parser = argparse.ArgumentParser(prog="bot.py export-motions", description=run_motion_export_cli.__doc__)
+    parser.add_argument("--guild", type=int, default=HOME_GUILD_ID or None, help="guild ID; omit for the home guild")
+    parser.add_argument(
+        "--home", action="store_true", help="--guild is the home guild (reads the original motion state without HOME_GUILD_ID)"
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--status", choices=sorted(MOTION_LIST_STATUS_FILTERS), help="only motions in this state")
+    parser.add_argument("--after", help="created on or after (YYYY-MM-DD, UTC)")
+    parser.add_argument("--before", help="created on or before (YYYY-MM-DD, UTC)")
+    parser.add_argument("--output", help="output path (default: motions-<guild>.<format>.gz)")
+    args = parser.parse_args(argv)
+
+    try:
+        created_after = parse_motion_list_date(args.after) if args.after else None
+        created_before = parse_motion_list_date(args.before, end_of_day=True) if args.before else None
+    except ValueError as e:
+        parser.error(str(e))
+    if args.guild is None:
+        parser.error("HOME_GUILD_ID is not set; pass --guild (with --home for the home guild).")
+    if args.home:
+        if HOME_GUILD_ID and HOME_GUILD_ID != args.guild:
+            parser.error(f"--home conflicts with HOME_GUILD_ID={HOME_GUILD_ID}.")
+        HOME_GUILD_ID = args.guild
+
+    # Closed right away: on the database path the generator holds a server-side cursor open.
+    with contextlib.closing(iter_exported_motions(args.guild)) as probe:
+        partition_empty = next(probe, None) is None
+    if partition_empty:
+        state_key, state_file, _ = motion_partition_keys(args.guild)
+        print(
+            f"Warning: guild {args.guild} has no motions in {state_key if DATABASE_URL else state_file}. "
+            "For the home guild, set HOME_GUILD_ID or pass --home."
+        )
+    output = args.output or f"motions-{args.guild}.{args.format}.gz"
+    statuses = MOTION_LIST_STATUS_FILTERS[args.status] if args.status else ()
+    with open(output, "wb") as f:
+        count = export_motions(f, args.guild, args.format, statuses, created_after, created_before)
+    print(f"Exported {count} motion(s) to {output}.")
+    return 0
+
+
+@motion_group.command(name="export", description="Download motions, votes and audit history as a compressed file.")
+@has_permission("is_administrator")
+@app_commands.rename(file_format="format")
+@app_commands.choices(
+    file_format=[app_commands.Choice(name="NDJSON", value="ndjson"), app_commands.Choice(name="CSV", value="csv")],
+    status=MOTION_LIST_STATUS_CHOICES,
+)
+@app_commands.describe(
+    file_format="NDJSON (one motion per line) or CSV (motion, vote and audit rows)",
+    status="Only motions in this state",
+    after="Created on or after (YYYY-MM-DD, UTC)",
+    before="Created on or before (YYYY-MM-DD, UTC)",
+)
+async def motion_export(
+    interaction: discord.Interaction,
+    file_format: app_commands.Choice[str] | None = None,
+    status: app_commands.Choice[str] | None = None,
+    after: str | None = None,
+    before: str | None = None,
+):
+    try:
+        created_after = parse_motion_list_date(after) if after else None
+        created_before = parse_motion_list_date(before, end_of_day=True) if before else None
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    extension = file_format.value if file_format else "ndjson"
+    statuses = MOTION_LIST_STATUS_FILTERS[status.value] if status else ()
+    # Listed here, on the loop: the export thread must not iterate a dict the loop may be adding motions to.
+    snapshot = None if DATABASE_URL else list(get_motion_state(interaction.guild_id)["motions"].values())
+    # Spooled to disk and compressed as it is written, so memory stays flat however large the history is.
+    with tempfile.TemporaryFile() as export_file:
+        count = await asyncio.to_thread(
+            export_motions,
+            export_file,
+            interaction.guild_id,
+            extension,
+            statuses,
+            created_after,
+            created_before,
+            snapshot,
+        )
+        size = export_file.tell()
+        if size > MOTION_EXPORT_MAX_UPLOAD_BYTES:
+            await interaction.followup.send(
+                f"The export is {size / 1024 / 1024:.1f} MiB, over the upload limit. "
+                "Narrow the filters or run `python bot.py export-motions` on the host.",
+                ephemeral=True,
+            )
+            return
+        export_file.seek(0)
+        filename = f"motions-{interaction.guild_id}-{datetime.now(UTC):%Y%m%d}.{extension}.gz"
+        await interaction.followup.send(
+            f"Exported **{count}** motion(s).", file=discord.File(export_file, filename=filename), ephemeral=True
+        )
+
+# --- CONFIG COMMANDS ---
+GUILD_CONFIG_CHOICES = [app_commands.Choice(name=name, value=name) for name in GUILD_CONFIG_SETTINGS]
+
+
+def parse_guild_config_value(setting: str, raw: str):
+    """
+    Parses /config input. IDs may be given raw or as mentions; sets take several,
+    rank_limits takes `role:value` pairs and role_sync_roles `Rank Name=role role; ...`.
+    """
+    if setting == "rank_limits":
+        pairs = re.findall(r"(\d{15,20})>?\s*[:=]\s*(\d+)", raw)
+        if not pairs:
+            raise ValueError("Use `role:rank value` pairs, e.g. `<@&123>:9, <@&456>:10`.")
+        return {int(role_id): int(limit) for role_id, limit in pairs}
+    if setting == "role_sync_roles":
+        mapping = {}
+        for part in filter(str.strip, raw.split(";")):
+            rank_name, _, role_text = part.partition("=")
+            rank_name = rank_name.strip()
+            if rank_name not in ROBLOX_ROLE_VALUES:
+                raise ValueError(f"Unknown rank `{rank_name}`.")
+            mapping[rank_name] = tuple(int(role_id) for role_id in re.findall(r"\d{15,20}", role_text))
+        return mapping
+
+    ids = [int(snowflake) for snowflake in re.findall(r"\d{15,20}", raw)]
+    if setting.endswith("_role_ids"):
+        return frozenset(ids)
+    if len(ids) != 1:
+        raise ValueError("Give exactly one channel or role (mention or ID).")
+    return ids[0]
+
+
+def validate_guild_config_value(guild: discord.Guild, setting: str, value):
+    """Every channel and role in a setting must belong to the guild being configured."""
+    if setting in HOME_GUILD_ONLY_SETTINGS and guild.id != HOME_GUILD_ID:
+        raise ValueError(f"`{setting}` can only be changed in the home server.")
+    if setting.endswith("_channel_id"):
+        if guild.get_channel(value) is None:
+            raise ValueError(f"`{value}` is not a channel in this server.")
+        return
+    if setting.endswith("_role_id"):
+        role_ids = [value]
+    elif setting.endswith("_role_ids") or setting == "rank_limits":
+        role_ids = list(value)
+    else:
+        role_ids = [role_id for rank_role_ids in value.values() for role_id in rank_role_ids]
+    missing = [str(role_id) for role_id in role_ids if guild.get_role(role_id) is None]
+    if missing:
+        raise ValueError(f"Not a role in this server: {', '.join(missing)}.")
+
+
+def format_guild_config_value(setting: str, value) -> str:
+    if setting.endswith("_channel_id"):
+        return f"<#{value}>"
+    if setting.endswith("_role_id"):
+        return f"<@&{value}>"
+    if setting.endswith("_role_ids"):
+        return " ".join(f"<@&{role_id}>" for role_id in sorted(value)) or "None"
+    if setting == "rank_limits":
+        return "\n".join(f"<@&{role_id}>: {limit}" for role_id, limit in value.items()) or "None"
+    return "\n".join(
+        f"{rank_name}: {' '.join(f'<@&{role_id}>' for role_id in role_ids) or 'None'}" for rank_name, role_ids in value.items()
+    ) or "None"
+
+
+async def can_configure_guild(interaction: discord.Interaction) -> bool:
+    """Discord's Manage Server permission, or the configured Administrator role."""
+    user = interaction.user
+    if not isinstance(user, discord.Member):
+        return False
+    return get_permission_profile(user).is_administrator or user.guild_permissions.manage_guild
+
+
+config_group = app_commands.Group(
+    name="config",
+    description="Per-server channels and roles.",
+    guild_only=True,
+    default_permissions=discord.Permissions(manage_guild=True),
+)
+
+
+@config_group.command(name="show", description="Show this server's channel and role settings.")
+@app_commands.check(can_configure_guild)
+async def config_show(interaction: discord.Interaction):
+    config = get_guild_config(interaction.guild_id)
+    overridden = config.to_overrides()
+    embed = discord.Embed(title="Server Config", color=discord.Color.blurple())
+    for setting in GUILD_CONFIG_SETTINGS:
+        name = f"{setting}{'' if setting in overridden else ' (default)'}"
+        embed.add_field(name=name, value=_clip(format_guild_config_value(setting, getattr(config, setting)), 1024), inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@config_group.command(name="set", description="Change one channel or role setting for this server.")
+@app_commands.check(can_configure_guild)
+@app_commands.choices(setting=GUILD_CONFIG_CHOICES)
+@app_commands.describe(setting="Setting to change", value="Channel/role mention or ID; see /config show for the format")
+async def config_set(interaction: discord.Interaction, setting: app_commands.Choice[str], value: str):
+    try:
+        parsed = parse_guild_config_value(setting.value, value)
+        validate_guild_config_value(interaction.guild, setting.value, parsed)
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+
+    config = replace(get_guild_config(interaction.guild_id), **{setting.value: parsed})
+    await save_guild_config(config)
+    await interaction.response.send_message(
+        f"`{setting.value}` is now {format_guild_config_value(setting.value, parsed)}.",
+        ephemeral=True,
+        allowed_mentions=discord.AllowedMentions.none(),
+    )
+
+
+@config_group.command(name="reset", description="Restore one setting to its default.")
+@app_commands.check(can_configure_guild)
+@app_commands.choices(setting=GUILD_CONFIG_CHOICES)
+async def config_reset(interaction: discord.Interaction, setting: app_commands.Choice[str]):
+    default = getattr(default_guild_config(interaction.guild_id), setting.value)
+    await save_guild_config(replace(get_guild_config(interaction.guild_id), **{setting.value: default}))
+    await interaction.response.send_message(f"`{setting.value}` reset to its default.", ephemeral=True)
+
+# --- DEBUG COMMANDS ---
+debug_group = app_commands.Group(name="debug", description="Staff diagnostics.")
+
+
+@debug_group.command(name="slow", description="Show the most recent slow interactions and where their time went.")
+@has_permission("can_view_diagnostics")
+@app_commands.describe(limit="How many traces to show (1-10).")
+async def debug_slow(interaction: discord.Interaction, limit: app_commands.Range[int, 1, 10] = 5):
+    traces = list(recent_slow_traces)[-limit:][::-1]
+    if not traces:
+        await interaction.response.send_message(
+            f"No interactions slower than {SLOW_INTERACTION_THRESHOLD_SECONDS:g}s have been recorded.",
+            ephemeral=True,
+        )
+        return
+
+    embed = discord.Embed(
+        title="Slow Interactions",
+        description=f"Threshold: {SLOW_INTERACTION_THRESHOLD_SECONDS:g}s. Slowest spans first.",
+        color=discord.Color.orange(),
+        timestamp=datetime.now(UTC),
+    )
+    for trace in traces:
+        summary = format_trace_summary(trace)
+        if len(summary) > 1024:
+            summary = summary[:1023] + "…"
+        embed.add_field(name=trace.name, value=summary, inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@debug_group.command(name="stats", description="Show state sizes, caches and resource usage.")
+@has_permission("is_administrator")
+async def debug_stats(interaction: discord.Interaction):
+    try:
+        # The Postgres limiter counts rows with a query, so keep it off the loop.
+        rate_limiter_keys = str(await asyncio.to_thread(rate_limiter.size))
+    except Exception as e:
+        print(f"Warning: failed to read rate limiter size. Error: {e}")
+        rate_limiter_keys = "unavailable"
+
+    motions_by_status = count_motions_by_status()
+    total_bytes = sum(motion_state_serialized_bytes.values())
+    audit_bytes = get_audit_log_bytes()
+    audit_share = f" ({audit_bytes / total_bytes:.0%})" if total_bytes else ""
+    rss_bytes = get_process_rss_bytes()
+
+    embed = discord.Embed(title="Runtime Stats", color=discord.Color.blurple(), timestamp=datetime.now(UTC))
+    embed.add_field(
+        name=f"Motions ({sum(motions_by_status.values())})",
+        value="\n".join(f"`{status}`: {count}" for status, count in sorted(motions_by_status.items())) or "None",
+        inline=True,
+    )
+    embed.add_field(
+        name="Motion state",
+        value=f"Serialized: **{total_bytes / 1024:.1f} KiB**\nAudit logs: **{audit_bytes / 1024:.1f} KiB**{audit_share}",
+        inline=True,
+    )
+    embed.add_field(
+        name="Tasks & views",
+        value=(
+            f"Motion timers: **{sum(1 for t in motion_timer_tasks.values() if not t.done())}**\n"
+            f"Persistent views: **{len(bot.persistent_views)}**"
+        ),
+        inline=True,
+    )
+    cache_lines = [
+        f"`{name}`: {stats['entries']} entries"
+        + (f", oldest {stats['age_seconds']:.0f}s" if stats["age_seconds"] is not None else "")
+        for name, stats in get_cache_stats().items()
+    ]
+    cache_lines.append(f"`rate_limiter` ({type(rate_limiter).__name__}): {rate_limiter_keys} keys")
+    embed.add_field(name="Caches", value="\n".join(cache_lines), inline=False)
+    embed.add_field(name="Roblox API", value=describe_roblox_breakers() or "All endpoint families healthy.", inline=False)
+    embed.add_field(
+        name="Process",
+        value=(
+            f"RSS: **{rss_bytes / 1048576:.1f} MiB**\n" if rss_bytes is not None else "RSS: unavailable\n"
+        ) + f"Loop lag: **{loop_lag_seconds * 1000:.1f} ms** (max {loop_lag_max_seconds * 1000:.1f} ms)",
+        inline=False,
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 # --- REGISTER GROUP COMMANDS ---
 bot.tree.add_command(applications_group)
 bot.tree.add_command(motion_group)
+bot.tree.add_command(debug_group)
+bot.tree.add_command(schedule_group)
+bot.tree.add_command(link_group)
+bot.tree.add_command(config_group)
 
 # --- ERROR HANDLING ---
+def observe_command_latency(interaction: discord.Interaction, outcome: str):
+    started_at = interaction.extras.get("started_at")
+    if started_at is None or interaction.command is None:
+        return
+    INTERACTION_SECONDS.observe(
+        time.perf_counter() - started_at,
+        kind="command",
+        name=interaction.command.qualified_name,
+        outcome=outcome,
+    )
+
+
+@bot.listen("on_app_command_completion")
+async def record_command_completion(interaction: discord.Interaction, command):
+    observe_command_latency(interaction, "ok")
+    finish_trace(interaction.extras.get("trace"))
+
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    if isinstance(error, InteractionClaimedElsewhere):
+        return
+    outcome = "rejected" if isinstance(error, app_commands.CheckFailure) else "error"
+    observe_command_latency(interaction, outcome)
+    finish_trace(interaction.extras.get("trace"), outcome)
     if isinstance(error, app_commands.CommandOnCooldown):
+        COOLDOWN_REJECTIONS_TOTAL.inc(command=interaction.command.qualified_name if interaction.command else "unknown")
         time_left = str(timedelta(seconds=int(error.retry_after)))  # fine for display
         await interaction.response.send_message(
             f"This command is on cooldown for everyone. Please try again in **{time_left}**.",
@@ -1487,6 +6737,7 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
     elif isinstance(error, app_commands.CheckFailure):
         await interaction.response.send_message("You do not have the required permissions to use this command.", ephemeral=True)
     else:
+        ERRORS_TOTAL.inc(source="command")
         print(f"An unhandled error occurred in the command tree: {error}")
         if not interaction.response.is_done():
             await interaction.response.send_message("An unexpected error occurred.", ephemeral=True)
@@ -1495,6 +6746,8 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
 
 # --- RUN THE BOT ---
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["export-motions"]:
+        sys.exit(run_motion_export_cli(sys.argv[2:]))
     if not BOT_TOKEN:
         print("Error: BOT_TOKEN is not set in the environment variables.")
     else: